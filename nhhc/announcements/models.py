@@ -34,6 +34,7 @@ from django_prometheus.models import ExportModelOperationsMixin
 from employee.models import Employee
 from loguru import logger
 
+
 NOW: str = str(arrow.now().format("YYYY-MM-DD"))
 
 
@@ -1,11 +1,10 @@
-from announcements.models import Announcements
 from django import template
 
+from nhhc.utils.feed import recent_announcements as announcement_feed
+
 register = template.Library()
 
 
 @register.inclusion_tag("_announcements.html")
 def recent_announcements():
-    announcements = Announcements.objects.all().filter(status="A").order_by("-date_posted")[:5]
-    logger.debug(announcements)
-    return {"recent_announcements": announcements}
+    return {"recent_announcements": announcement_feed()}
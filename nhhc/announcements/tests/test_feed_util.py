@@ -0,0 +1,43 @@
+from announcements.models import Announcements
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from employee.models import Employee
+from model_bakery import baker
+
+from nhhc.utils.envelope import is_sealed
+from nhhc.utils.feed import FEED_CACHE_KEY, recent_announcements
+from nhhc.utils.managers import generation
+from nhhc.utils.testing import LOCMEM_CACHES
+
+
+@override_settings(CACHES=LOCMEM_CACHES, CACHE_TTL=60)
+class TestAnnouncementFeed(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.poster = baker.make(Employee, username="poster", first_name="Jane", last_name="Doe")
+        self.announcement = baker.make(Announcements, announcement_title="Welcome", message="Hello", posted_by=self.poster, status="A")
+
+    def test_feed_resolves_posters_and_is_served_from_cache(self):
+        feed = recent_announcements()
+        self.assertEqual([(item["announcement_title"], item["posted_by"]) for item in feed], [("Welcome", "Jane")])
+        with self.assertNumQueries(0):
+            self.assertEqual(recent_announcements(), feed)
+
+    def test_archive_invalidates_the_feed(self):
+        recent_announcements()
+        self.announcement.archive()
+        self.assertEqual(recent_announcements(), [])
+
+    def test_announcements_of_deleted_posters_are_still_listed(self):
+        recent_announcements()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.poster.delete()
+        self.assertEqual([(item["announcement_title"], item["posted_by"]) for item in recent_announcements()], [("Welcome", "")])
+
+    @override_settings(DISPLAY_PROJECTION_ENCRYPT=True)
+    def test_cached_feed_is_sealed(self):
+        feed = recent_announcements()
+        stored = cache.get(FEED_CACHE_KEY.format(generation=generation(Announcements), limit=5))
+        self.assertTrue(is_sealed(stored))
+        self.assertNotIn(b"Jane", stored)
+        self.assertEqual(recent_announcements(), feed)
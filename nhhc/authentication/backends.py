@@ -0,0 +1,62 @@
+"""
+Module: authentication.backends
+Description: This module contains the authentication backends used for username/email logins. The allauth backend is extended so logins by email resolve the account through the `email_bidx` blind index instead of decrypting every employee's email; secondary addresses registered in allauth's `EmailAddress` table are still accepted, as in allauth. Both backends load the user behind each authenticated request through the two-tier object cache (`Employee.objects.get_cached`).
+Dependencies: allauth, employee
+"""
+
+from typing import Optional
+
+from allauth.account.auth_backends import AuthenticationBackend
+from allauth.account.models import EmailAddress
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from employee.models import Employee
+
+
+class CachedUserMixin:
+    def get_user(self, user_id) -> Optional[Employee]:
+        """
+        Loads the user of an authenticated session through the two-tier object cache.
+
+        Args:
+            user_id: The primary key stored in the session.
+
+        Returns:
+            Optional[Employee]: The user, or None if it no longer exists or cannot authenticate.
+        """
+        try:
+            user = get_user_model()._default_manager.get_cached(user_id)
+        except get_user_model().DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+
+class CachedModelBackend(CachedUserMixin, ModelBackend):
+    pass
+
+
+class BlindIndexAuthenticationBackend(CachedUserMixin, AuthenticationBackend):
+    def _authenticate_by_email(self, **credentials) -> Optional[Employee]:
+        """
+        Authenticates a user by email address using an index seek on `Employee.email_bidx`, then on allauth's `EmailAddress` table.
+
+        Args:
+            **credentials: The submitted credentials. The email is read from `email`, falling back to `username`.
+
+        Returns:
+            Optional[Employee]: The authenticated employee, or None if no active account matches.
+        """
+        email = credentials.get("email", credentials.get("username"))
+        if not email or "@" not in email:
+            return None
+        users = list(get_user_model().objects.filter(email_bidx__matches=email))
+        seen = {user.pk for user in users}
+        # Verified addresses first, as allauth's `filter_users_by_email(prefer_verified=True)` does.
+        for address in EmailAddress.objects.filter(email__iexact=email).exclude(user_id__in=seen).select_related("user").order_by("-verified"):
+            if address.user_id not in seen:
+                seen.add(address.user_id)
+                users.append(address.user)
+        for user in users:
+            if self._check_password(user, credentials["password"]):
+                return user
+        return None
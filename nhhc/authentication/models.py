@@ -9,8 +9,11 @@ from django_extensions.db.models import TimeStampedModel
 from employee.models import Employee
 from loguru import logger
 
+from nhhc.utils.tiered_cache import TieredCacheManager
+
 
 class UserProfile(TimeStampedModel, models.Model):
+    objects = TieredCacheManager(cache_lookups=("pk", "user_id"))
     user = models.OneToOneField(Employee, unique=True, on_delete=models.CASCADE)
     force_password_change = models.BooleanField(default=True)
     last_password_change = models.DateTimeField(null=True, blank=True)
@@ -126,6 +126,9 @@ class ComplianceForm(forms.ModelForm):
         self.helper.form_action = "/employee"
         self.helper.form_id = "profile"
         self.helper.form_method = "post"
+        # The contract choices are read through the queryset cache; the submitted contract is still validated against the database.
+        contract_field = self.fields["contract_code"]
+        contract_field.choices = [("", contract_field.empty_label), *((contract.pk, contract_field.label_from_instance(contract)) for contract in Contract.objects.from_cache())]
         self.fields["initial_idph_background_check_completion_date"].widget = forms.widgets.DateInput(
             attrs={"type": "date", "class": "form-control"},
         )
@@ -11,6 +11,7 @@ from django_prometheus.models import ExportModelOperationsMixin
 from employee.models import Employee
 
 from nhhc.utils.managers import CachedQuerySet
+from nhhc.utils.tiered_cache import TieredCacheManager
 from nhhc.utils.upload import UploadHandler
 
 
@@ -104,6 +105,7 @@ class Compliance(TimeStampedModel, models.Model, ExportModelOperationsMixin("com
         CC_SUPERVISOR = "CARE_COORDINATOR_SUPERVISOR", _("Care Coordinator Supervisor")
         HC_SUPERVISOR = "HOMECARE_SUPERVISOR", _("Homecare Supervisor")
 
+    objects = TieredCacheManager()
     employee = models.OneToOneField(
         Employee,
         on_delete=models.CASCADE,
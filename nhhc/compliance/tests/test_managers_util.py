@@ -0,0 +1,43 @@
+from compliance.models import Contract
+from django.core.cache import cache
+from django.db.models import Value
+from django.test import TestCase, override_settings
+
+from nhhc.utils.testing import LOCMEM_CACHES
+
+
+@override_settings(CACHES=LOCMEM_CACHES, QUERYSET_TTL=60)
+class TestCachedQuerySet(TestCase):
+    def setUp(self):
+        cache.clear()
+        Contract.objects.create(code="A1", name="Alpha")
+        Contract.objects.create(code="B2", name="Beta")
+
+    def test_hit_does_not_query_the_database(self):
+        first = Contract.objects.queryset_from_cache({"code": "A1"})
+        with self.assertNumQueries(0):
+            second = Contract.objects.queryset_from_cache({"code": "A1"})
+        self.assertEqual([contract.name for contract in first], [contract.name for contract in second])
+        self.assertEqual(second[0].pk, first[0].pk)
+
+    def test_filters_have_their_own_keys(self):
+        self.assertEqual([contract.code for contract in Contract.objects.queryset_from_cache({"code": "A1"})], ["A1"])
+        self.assertEqual([contract.code for contract in Contract.objects.queryset_from_cache({"code": "B2"})], ["B2"])
+
+    def test_save_invalidates_cached_results(self):
+        Contract.objects.order_by("code").from_cache()
+        Contract.objects.create(code="C3", name="Gamma")
+        self.assertEqual([contract.code for contract in Contract.objects.order_by("code").from_cache()], ["A1", "B2", "C3"])
+
+    def test_update_invalidates_cached_results(self):
+        Contract.objects.filter(code="A1").from_cache()
+        Contract.objects.filter(code="A1").update(name="Renamed")
+        self.assertEqual(Contract.objects.filter(code="A1").from_cache()[0].name, "Renamed")
+
+    def test_deferred_columns_and_annotations_are_rebuilt(self):
+        queryset = Contract.objects.filter(code="A1").defer("description").annotate(label=Value("cached"))
+        queryset.from_cache()
+        with self.assertNumQueries(0):
+            contract = queryset.from_cache()[0]
+        self.assertEqual((contract.code, contract.label), ("A1", "cached"))
+        self.assertEqual(contract.get_deferred_fields(), {"description"})
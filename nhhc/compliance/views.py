@@ -83,7 +83,7 @@ class ComplianceProfileDetailView(DetailView):
         Returns:
         Compliance object: The Compliance object for the current user.
         """
-        return Compliance.objects.get(employee=self.request.user)
+        return Compliance.objects.get_cached(self.request.user.pk)
 
 
 class ComplianceProfileFormView(UpdateView, FileUploadMixin):
@@ -189,7 +189,7 @@ class DocusealCompliaceDocsSigning_IDOA(TemplateView):
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
-        context["employee"] = Employee.objects.get(employee_id=self.request.user.employee_id)
+        context["employee"] = Employee.objects.get_cached(self.request.user.employee_id)
         context["doc_url"] = "https://docuseal.co/d/r5UbQeVsQgkwUp"
         context['title'] = "Nett Hands & Illinois Department of Aging General Policies"
         return context
@@ -215,7 +215,7 @@ class DocusealCompliaceDocsSigning_HCA(TemplateView):
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
-        context["employee"] = Employee.objects.get(employee_id=self.request.user.employee_id)
+        context["employee"] = Employee.objects.get_cached(self.request.user.employee_id)
         context["doc_url"] = "https://docuseal.co/d/3KA4PP4CEjpy4r"
         context['title'] = "US Department of Homeland Security - Employment Eligibility Verification"
         return context
@@ -239,7 +239,7 @@ class DocusealCompliaceDocsSigning_DoNotDrive(TemplateView):
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
-        context["employee"] = Employee.objects.get(employee_id=self.request.user.employee_id)
+        context["employee"] = Employee.objects.get_cached(self.request.user.employee_id)
         context["doc_url"] = "https://docuseal.co/d/v1FPgz9xgBJVgH"
         context['title'] = "Nett Hands - Do Not Drive Agreement"
         return context
@@ -264,7 +264,7 @@ class DocusealCompliaceDocsSigning_JobDesc(TemplateView):
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
-        context["employee"] = Employee.objects.get(employee_id=self.request.user.employee_id)
+        context["employee"] = Employee.objects.get_cached(self.request.user.employee_id)
         context["doc_url"] = "https://docuseal.co/d/KQUEkomQZr1ddD"
         context['title'] = "Nett Hands Homehealth Care Aide (HCA) Job Desc"
         return context
@@ -288,7 +288,7 @@ class DocusealCompliaceDocsSigning_i9(TemplateView):
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
-        context["employee"] = Employee.objects.get(employee_id=self.request.user.employee_id)
+        context["employee"] = Employee.objects.get_cached(self.request.user.employee_id)
         context["doc_url"] = "https://docuseal.co/d/ovQk6ACHqajQvC"
         context['title'] = "US Department of Homeland Security - Employment Eligibility Verification"
         return context
@@ -312,7 +312,7 @@ class DocusealCompliaceDocsSigning_irs_w4(TemplateView):
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
-        context["employee"] = Employee.objects.get(employee_id=self.request.user.employee_id)
+        context["employee"] = Employee.objects.get_cached(self.request.user.employee_id)
         context["doc_url"] = "https://docuseal.co/d/wmJGUH3wU2GrUJ"
         context['title'] = "US Internal Revenue Services - Withholding Certificate"
         return context
@@ -337,7 +337,7 @@ class DocusealCompliaceDocsSigning_il_w4(TemplateView):
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
-        context["employee"] = Employee.objects.get(employee_id=self.request.user.employee_id)
+        context["employee"] = Employee.objects.get_cached(self.request.user.employee_id)
         context["doc_url"] = "https://docuseal.co/d/M6o9cZ4528yk4L"
         context['title'] = "State of Illinois - Department of Revenue - Withholding Worksheet"
         return context
@@ -361,7 +361,7 @@ class DocusealCompliaceDocsSigning_idph_bg_auth(TemplateView):
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
-        context["employee"] = Employee.objects.get(employee_id=self.request.user.employee_id)
+        context["employee"] = Employee.objects.get_cached(self.request.user.employee_id)
         context["doc_url"] = "https://docuseal.co/d/RiVYseBYUpvrxD"
         context['title'] = "Health Care Worker Background Check Authorization"
         return context
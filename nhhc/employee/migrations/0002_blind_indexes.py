@@ -0,0 +1,79 @@
+# Generated by Django 5.0.6 on 2026-10-17 09:12
+
+import nhhc.utils.fields
+import sage_encrypt.fields.asymmetric
+from django.db import IntegrityError, migrations
+from django.db.models import Count
+
+
+def populate_employee_blind_indexes(apps, schema_editor):
+    nhhc.utils.fields.populate_blind_indexes(apps.get_model("employee", "Employee"))
+
+
+def check_unique_blind_indexes(apps, schema_editor):
+    # The encrypted columns were declared unique, but their ciphertext is randomized, so employees may share an email that
+    # differs only by case or an SSN that differs only by formatting. Report them by ID instead of failing on the constraint.
+    Employee = apps.get_model("employee", "Employee")
+    collisions = []
+    for field_name, label in (("email_bidx", "email address"), ("social_security_bidx", "social security number")):
+        shared = Employee.objects.exclude(**{f"{field_name}__isnull": True}).values(field_name).annotate(accounts=Count("employee_id")).filter(accounts__gt=1)
+        for bidx in shared.values_list(field_name, flat=True):
+            employee_ids = list(Employee.objects.filter(**{field_name: bidx}).order_by("employee_id").values_list("employee_id", flat=True))
+            collisions.append(f"Employees {employee_ids} share one {label}")
+    if collisions:
+        raise IntegrityError("Resolve these duplicates before migrating again:\n" + "\n".join(collisions))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("employee", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="employee",
+            name="first_name_idx",
+        ),
+        migrations.AlterField(
+            model_name="employee",
+            name="email",
+            field=sage_encrypt.fields.asymmetric.EncryptedEmailField(blank=True, max_length=254, null=True),
+        ),
+        migrations.AlterField(
+            model_name="employee",
+            name="social_security",
+            field=sage_encrypt.fields.asymmetric.EncryptedCharField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="employee",
+            name="email_bidx",
+            field=nhhc.utils.fields.BlindIndexField(blank=True, db_index=True, editable=False, max_length=64, normalizer="email", null=True, source="email"),
+        ),
+        migrations.AddField(
+            model_name="employee",
+            name="social_security_bidx",
+            field=nhhc.utils.fields.BlindIndexField(blank=True, db_index=True, editable=False, max_length=64, normalizer="digits", null=True, source="social_security"),
+        ),
+        migrations.AddField(
+            model_name="employee",
+            name="first_name_bidx",
+            field=nhhc.utils.fields.BlindIndexField(blank=True, db_index=True, editable=False, max_length=64, null=True, source="first_name"),
+        ),
+        migrations.AddField(
+            model_name="employee",
+            name="last_name_bidx",
+            field=nhhc.utils.fields.BlindIndexField(blank=True, db_index=True, editable=False, max_length=64, null=True, source="last_name"),
+        ),
+        migrations.RunPython(populate_employee_blind_indexes, migrations.RunPython.noop),
+        migrations.RunPython(check_unique_blind_indexes, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="employee",
+            name="email_bidx",
+            field=nhhc.utils.fields.BlindIndexField(blank=True, editable=False, max_length=64, normalizer="email", null=True, source="email", unique=True),
+        ),
+        migrations.AlterField(
+            model_name="employee",
+            name="social_security_bidx",
+            field=nhhc.utils.fields.BlindIndexField(blank=True, editable=False, max_length=64, normalizer="digits", null=True, source="social_security", unique=True),
+        ),
+    ]
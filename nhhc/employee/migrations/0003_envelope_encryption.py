@@ -0,0 +1,90 @@
+# Generated by Django 5.0.6 on 2026-10-17 11:40
+
+import nhhc.utils.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Switches the encrypted columns to the envelope storage mode. The columns stay `bytea`, so no data is rewritten:
+    existing `sage_encrypt` ciphertext keeps loading and each row is re-sealed under its own data key when next saved.
+    """
+
+    dependencies = [
+        ("employee", "0002_blind_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="employee",
+            name="data_key",
+            field=nhhc.utils.fields.EnvelopeKeyField(null=True),
+        ),
+        migrations.AlterField(
+            model_name="employee",
+            name="gender",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(
+                blank=True, choices=[("M", "Male"), ("F", "Female"), ("X", "Non-Gendered"), ("B", "Binary")], default="X", max_length=10485760, null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="employee",
+            name="email",
+            field=nhhc.utils.fields.EnvelopeEncryptedEmailField(blank=True, max_length=254, null=True),
+        ),
+        migrations.AlterField(
+            model_name="employee",
+            name="social_security",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="employee",
+            name="date_of_birth",
+            field=nhhc.utils.fields.EnvelopeEncryptedDateField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="employee",
+            name="first_name",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(blank=True, max_length=10485760, null=True),
+        ),
+        migrations.AlterField(
+            model_name="employee",
+            name="middle_name",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(blank=True, max_length=10485760, null=True),
+        ),
+        migrations.AlterField(
+            model_name="employee",
+            name="last_name",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(blank=True, max_length=10485760, null=True),
+        ),
+        migrations.AlterField(
+            model_name="employee",
+            name="street_address1",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(blank=True, max_length=10485760, null=True),
+        ),
+        migrations.AlterField(
+            model_name="employee",
+            name="street_address2",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(blank=True, max_length=10485760, null=True),
+        ),
+        migrations.AlterField(
+            model_name="employee",
+            name="emergency_contact_first_name",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(blank=True, max_length=10485760, null=True),
+        ),
+        migrations.AlterField(
+            model_name="employee",
+            name="emergency_contact_last_name",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(blank=True, max_length=10485760, null=True),
+        ),
+        migrations.AlterField(
+            model_name="employee",
+            name="emergency_contact_relationship",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(blank=True, max_length=10485760, null=True),
+        ),
+        migrations.AlterField(
+            model_name="employee",
+            name="city",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(blank=True, max_length=10485760, null=True),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.6 on 2026-10-17 14:05
+
+import nhhc.utils.fields
+from django.db import migrations, models
+
+
+def populate_employee_sort_keys(apps, schema_editor):
+    nhhc.utils.fields.populate_sort_keys(apps.get_model("employee", "Employee"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("employee", "0003_envelope_encryption"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="employee",
+            name="first_name_sort",
+            field=nhhc.utils.fields.SortKeyField(blank=True, editable=False, null=True, source="first_name"),
+        ),
+        migrations.AddField(
+            model_name="employee",
+            name="last_name_sort",
+            field=nhhc.utils.fields.SortKeyField(blank=True, editable=False, null=True, source="last_name"),
+        ),
+        migrations.RunPython(populate_employee_sort_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="employee",
+            index=models.Index(fields=["last_name_sort", "first_name_sort"], name="employee_name_sort_idx"),
+        ),
+        migrations.AlterModelOptions(
+            name="employee",
+            options={"get_latest_by": "-hire_date", "ordering": ["last_name_sort", "first_name_sort", "-hire_date"], "verbose_name": "Agency Employee", "verbose_name_plural": "Agency Employees"},
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.6 on 2026-10-17 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("employee", "0004_name_sort_keys"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="employee",
+            name="employee_name_sort_idx",
+        ),
+        migrations.AddIndex(
+            model_name="employee",
+            index=models.Index(fields=["last_name_sort", "first_name_sort", "employee_id"], name="employee_name_seek_idx"),
+        ),
+    ]
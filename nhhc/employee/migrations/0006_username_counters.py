@@ -0,0 +1,31 @@
+# Generated by Django 5.0.6 on 2026-10-17 18:05
+
+from django.db import migrations, models
+
+from nhhc.utils.usernames import reconcile_counters
+
+
+def seed_username_counters(apps, schema_editor):
+    reconcile_counters(apps.get_model("employee", "Employee"), apps.get_model("employee", "UsernameCounter"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("employee", "0005_name_seek_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UsernameCounter",
+            fields=[
+                ("base", models.CharField(max_length=150, primary_key=True, serialize=False)),
+                ("allocated", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Username Counter",
+                "verbose_name_plural": "Username Counters",
+                "db_table": "username_counters",
+            },
+        ),
+        migrations.RunPython(seed_username_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.6 on 2026-10-17 21:40
+
+from django.db import migrations, models
+from django.db.models import Count
+from loguru import logger
+
+
+def rename_duplicate_usernames(apps, schema_editor):
+    # Hires racing through the old allocator could share a username; the first account keeps it, later ones are suffixed with their ID.
+    Employee = apps.get_model("employee", "Employee")
+    duplicated = Employee.objects.values("username").annotate(accounts=Count("employee_id")).filter(accounts__gt=1).values_list("username", flat=True)
+    for username in list(duplicated):
+        for employee in Employee.objects.filter(username=username).order_by("employee_id")[1:]:
+            Employee.objects.filter(pk=employee.pk).update(username=f"{username}_{employee.pk}")
+            logger.warning(f"Renamed Duplicate Username {username} of Employee {employee.pk} to {username}_{employee.pk}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("employee", "0007_sort_keys_not_null"),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_duplicate_usernames, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="employee",
+            name="username",
+            field=models.CharField(max_length=150, unique=True),
+        ),
+    ]
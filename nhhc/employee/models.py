@@ -1,21 +1,23 @@
 import arrow
-from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AbstractUser, BaseUserManager, User
-from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django_extensions.db.models import CreationDateTimeField, ModificationDateTimeField
 from django_prometheus.models import ExportModelOperationsMixin
 from localflavor.us.models import USStateField, USZipCodeField
-from loguru import logger
 from phonenumber_field.modelfields import PhoneNumberField
-from sage_encrypt.fields.asymmetric import (
-    EncryptedCharField,
-    EncryptedDateField,
-    EncryptedEmailField,
-)
 
+from nhhc.utils.fields import (
+    BlindIndexField,
+    SortKeyField,
+    EnvelopeEncryptedCharField,
+    EnvelopeEncryptedDateField,
+    EnvelopeEncryptedEmailField,
+    EnvelopeKeyField,
+)
+from nhhc.utils.tiered_cache import TieredCacheManager
 from nhhc.utils.upload import UploadHandler
+from nhhc.utils.usernames import allocate_username
 
 NOW = str(arrow.now().format("YYYY-MM-DD"))
 
@@ -24,7 +26,10 @@ class EmployeeMethodUtility:
     @staticmethod
     def create_unique_username(first_name: str, last_name: str) -> str:
         """
-        Create a unique username by adding a number to the end of the username if it's already taken.
+        Allocate the next unused username of a name: `last.first`, then `last.first1`, `last.first2`, ...
+
+        The number comes from the name's row in the username counter table in one atomic statement (see `nhhc.utils.usernames`),
+        so concurrent hires never receive the same username and no table scan is needed.
 
         Args:
             first_name (str): The first name of the user.
@@ -32,39 +37,11 @@ class EmployeeMethodUtility:
 
         Returns:
             str: The unique username for the user.
-
-        Raises:
-            IntegrityError: If the username is already taken and no available unique username can be generated.
-
         """
-        last_name = last_name.lower()
-        first_name = first_name.lower()
-        username = f"{last_name}.{first_name}"
-        logger.debug(f"Inital Username: {username}")
+        return allocate_username(first_name, last_name)
 
-        try:
-            # Try to create a new user with the given username
-            user = get_user_model().objects.get(username=username)  # pylint: disable=unused-argument
-            max_num = get_user_model().objects.filter(username__startswith=username).count()
 
-            # If no number is currently appended, set the max_num to 0
-            if max_num == 1:
-                max_num = 0
-
-            # Append the next number to the username and try to create a new user again
-            next_username = username + str(max_num)
-
-            # Return the next available username
-            logger.debug(f"Inital Username Unavailable. Next Available Username: {next_username}")
-            return next_username
-
-        except ObjectDoesNotExist:
-            # If no IntegrityError is raised, return the original username
-            logger.debug("Inital Username Available")
-            return username
-
-
-class EmployeeManager(EmployeeMethodUtility, BaseUserManager, ExportModelOperationsMixin("employee-manager")):
+class EmployeeManager(EmployeeMethodUtility, TieredCacheManager, BaseUserManager, ExportModelOperationsMixin("employee-manager")):
     """
     Custom user manager
     """
@@ -143,6 +120,9 @@ class Employee(EmployeeMethodUtility, AbstractUser, ExportModelOperationsMixin("
         gender (str): The gender of the employee.
         language (str): The language spoken by the employee.
         social_security (str): The encrypted social security number of the employee.
+        email_bidx, social_security_bidx, first_name_bidx, last_name_bidx (str): Blind indexes for exact-match lookups on the encrypted fields.
+        first_name_sort, last_name_sort (int): Keyed name buckets the default ordering is indexed on.
+        data_key (bytes): The row's envelope data key, wrapped by the GPG key pair. Every encrypted field is sealed under it.
         date_of_birth (date): The date of birth of the employee.
         marital_status (str): The marital status of the employee.
         ...
@@ -155,7 +135,7 @@ class Employee(EmployeeMethodUtility, AbstractUser, ExportModelOperationsMixin("
 
     Meta:
         db_table (str): The database table name for the Employee model.
-        ordering (list): The default ordering of Employee instances.
+        ordering (list): The default ordering of Employee instances, by name sort key. Finish with `sort_within_buckets`.
         verbose_name (str): The singular name for the Employee model.
         verbose_name_plural (str): The plural name for the Employee model.
         unique_together (list): The unique constraints for the Employee model.
@@ -287,8 +267,9 @@ class Employee(EmployeeMethodUtility, AbstractUser, ExportModelOperationsMixin("
         VIETNAMESE = "VIETNAMESE", _("Vietnamese")
 
     employee_id = models.BigAutoField(primary_key=True)
-    username = models.CharField(max_length=150, unique=False, db_index=True)
-    gender = EncryptedCharField(
+    data_key = EnvelopeKeyField()
+    username = models.CharField(max_length=150, unique=True)
+    gender = EnvelopeEncryptedCharField(
         max_length=10485760,
         choices=GENDER.choices,
         default=GENDER.NON_GENDERED,
@@ -303,14 +284,20 @@ class Employee(EmployeeMethodUtility, AbstractUser, ExportModelOperationsMixin("
         null=True,
         default=LANGUAGE.ENGLISH,
     )
-    email = EncryptedEmailField(unique=True, null=True, blank=True)
-    social_security = EncryptedCharField(unique=True, null=True, blank=True)
-    date_of_birth = EncryptedDateField(null=True, blank=True)
-    first_name = EncryptedCharField(max_length=10485760, null=True, blank=True)
-    middle_name = EncryptedCharField(max_length=10485760, null=True, blank=True)
-    last_name = EncryptedCharField(max_length=10485760, null=True, blank=True)
-    street_address1 = EncryptedCharField(max_length=10485760, null=True, blank=True)
-    street_address2 = EncryptedCharField(max_length=10485760, null=True, blank=True)
+    email = EnvelopeEncryptedEmailField(null=True, blank=True)
+    email_bidx = BlindIndexField(source="email", normalizer="email", unique=True)
+    social_security = EnvelopeEncryptedCharField(null=True, blank=True)
+    social_security_bidx = BlindIndexField(source="social_security", normalizer="digits", unique=True)
+    date_of_birth = EnvelopeEncryptedDateField(null=True, blank=True)
+    first_name = EnvelopeEncryptedCharField(max_length=10485760, null=True, blank=True)
+    first_name_bidx = BlindIndexField(source="first_name")
+    first_name_sort = SortKeyField(source="first_name")
+    middle_name = EnvelopeEncryptedCharField(max_length=10485760, null=True, blank=True)
+    last_name = EnvelopeEncryptedCharField(max_length=10485760, null=True, blank=True)
+    last_name_bidx = BlindIndexField(source="last_name")
+    last_name_sort = SortKeyField(source="last_name")
+    street_address1 = EnvelopeEncryptedCharField(max_length=10485760, null=True, blank=True)
+    street_address2 = EnvelopeEncryptedCharField(max_length=10485760, null=True, blank=True)
     marital_status = models.CharField(
         max_length=10485760,
         null=True,
@@ -318,7 +305,7 @@ class Employee(EmployeeMethodUtility, AbstractUser, ExportModelOperationsMixin("
         choices=MaritalStatus.choices,
         default=MaritalStatus.NEVER_MARRIED,
     )
-    emergency_contact_first_name = EncryptedCharField(
+    emergency_contact_first_name = EnvelopeEncryptedCharField(
         max_length=10485760,
         null=True,
         blank=True,
@@ -330,7 +317,7 @@ class Employee(EmployeeMethodUtility, AbstractUser, ExportModelOperationsMixin("
         default=ETHNICITY.UNKNOWN,
         null=True,
     )
-    emergency_contact_last_name = EncryptedCharField(
+    emergency_contact_last_name = EnvelopeEncryptedCharField(
         max_length=10485760,
         null=True,
         blank=True,
@@ -342,13 +329,13 @@ class Employee(EmployeeMethodUtility, AbstractUser, ExportModelOperationsMixin("
         default=RACE.UNKNOWN,
         null=True,
     )
-    emergency_contact_relationship = EncryptedCharField(
+    emergency_contact_relationship = EnvelopeEncryptedCharField(
         max_length=10485760,
         null=True,
         blank=True,
     )
     emergency_contact_phone = PhoneNumberField(region="US", null=True, blank=True)
-    city = EncryptedCharField(max_length=10485760, null=True, blank=True)
+    city = EnvelopeEncryptedCharField(max_length=10485760, null=True, blank=True)
     idoa_agency_policies_attestation = models.FileField(
         upload_to="idoa_agency_policies",
         blank=True,
@@ -405,10 +392,25 @@ class Employee(EmployeeMethodUtility, AbstractUser, ExportModelOperationsMixin("
     def __str__(self) -> str:
         return f"(Employee Id:{self.pk}), Name: {self.last_name}, {self.first_name} | Username: {self.username}"
 
+    def save(self, *args, **kwargs) -> None:
+        # Instances served by `Employee.objects.get_cached` leave the blind indexes deferred, and deferred columns are not saved, so derive them from their loaded sources.
+        for field in self._meta.concrete_fields:
+            if isinstance(field, BlindIndexField) and field.attname not in self.__dict__ and field.source in self.__dict__:
+                self.__dict__[field.attname] = field.digest(getattr(self, field.source))
+        super().save(*args, **kwargs)
+
+    def get_session_auth_hash(self) -> str:
+        # Instances served by `Employee.objects.get_cached` carry the hash instead of the password, which is never cached.
+        cached = self.__dict__.get("_cached_session_auth_hash")
+        if cached is not None and "password" in self.get_deferred_fields():
+            return cached
+        return super().get_session_auth_hash()
+
     def terminate_employment(self) -> None:
         self.termination_date = NOW
         self.username = f"{self.username}_TERMINATED"
-        self.email = f"{self.email}_TERMINATED"
+        if self.email:
+            self.email = f"{self.email}_TERMINATED"
         self.is_active = False
         self.save()
 
@@ -432,11 +434,32 @@ class Employee(EmployeeMethodUtility, AbstractUser, ExportModelOperationsMixin("
 
     class Meta:
         db_table = "employee"
-        ordering = ["last_name", "first_name", "-hire_date"]
+        ordering = ["last_name_sort", "first_name_sort", "-hire_date"]
         verbose_name = "Agency Employee"
         verbose_name_plural = "Agency Employees"
         get_latest_by = "-hire_date"
         indexes = [
             models.Index(fields=["username"], name="username_idx"),
-            models.Index(fields=["first_name"], name="first_name_idx"),
+            models.Index(fields=["last_name_sort", "first_name_sort", "employee_id"], name="employee_name_seek_idx"),
         ]
+
+
+class UsernameCounter(models.Model):
+    """
+    The number of usernames handed out per base name (`last.first`), incremented atomically by `nhhc.utils.usernames`.
+
+    Attributes:
+        base (str): The base username.
+        allocated (int): The usernames of the base allocated so far.
+    """
+
+    base = models.CharField(max_length=150, primary_key=True)
+    allocated = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.base} ({self.allocated})"
+
+    class Meta:
+        db_table = "username_counters"
+        verbose_name = "Username Counter"
+        verbose_name_plural = "Username Counters"
@@ -6,4 +6,4 @@ from rest_framework.serializers import ModelSerializer, Serializer
 class EmployeeSerializer(ModelSerializer):
     class Meta:
         model = Employee
-        fields = "__all__"
+        exclude = ["data_key"]
@@ -1,3 +1,5 @@
+from typing import List
+
 from celery import shared_task
 from celery.utils.log import get_task_logger
 from loguru import logger
@@ -35,3 +37,45 @@ def send_async_termination_email(applicant: dict) -> int:
         return task
     except Exception as e:
         logger.error(f"Async Rejection Email Failed - {e}")
+
+
+@shared_task(bind=True, ignore_result=True, max_retries=5, default_retry_delay=300)
+def send_rejection_emails(self, applicants: List[dict]) -> int:
+    """
+    Celery task that sends the rejection emails of a batch of applicants over one connection to the mail server,
+    retrying the ones that failed.
+
+    Args:
+        applicants (List[dict]): Each applicant's `first_name` and `email`.
+
+    Returns:
+        int: The number of emails sent.
+    """
+    messages = [hr_mailroom.rejection_message(applicant) for applicant in applicants]
+    failed = hr_mailroom.send_batch(messages)
+    if failed:
+        logger.error(f"Async Batch Rejection Emails Failed for {len(failed)} of {len(applicants)} Applicants - Retrying")
+        raise self.retry(args=[[applicant for applicant, msg in zip(applicants, messages) if msg in failed]])
+    return len(messages)
+
+
+@shared_task(bind=True, ignore_result=True, max_retries=5, default_retry_delay=300)
+def reissue_onboarding_credentials(self, employee_ids: List[int]) -> int:
+    """
+    Celery task that gives new hires whose onboarding email failed a new temporary password and emails it, retrying
+    the ones that fail again. The password is generated here, so it never passes through the broker.
+
+    Args:
+        employee_ids (List[int]): The employees whose credentials were not delivered.
+
+    Returns:
+        int: The number of credentials delivered.
+    """
+    # Imported here: nhhc.utils.onboarding queues this task.
+    from nhhc.utils.onboarding import reissue_credentials
+
+    failed = reissue_credentials(employee_ids)
+    if failed:
+        logger.error(f"Onboarding Credentials Not Delivered to Employees {failed} - Retrying")
+        raise self.retry(args=[failed])
+    return len(employee_ids)
@@ -0,0 +1,105 @@
+from unittest.mock import patch
+
+from cryptography.exceptions import InvalidTag
+from django.db.models import BinaryField, Value
+from django.test import SimpleTestCase, TestCase, override_settings
+from employee.models import Employee
+from model_bakery import baker
+
+from nhhc.utils import decryption
+from nhhc.utils.decryption import DecryptionEngine, PlaintextLRU, _reset_export_pool
+from nhhc.utils.envelope import generate_data_key, is_sealed, seal, unseal
+from nhhc.utils.fields import StoredValue, WrappedKey
+
+
+class TestPlaintextLRU(SimpleTestCase):
+    def test_evicts_least_recently_used(self):
+        cache = PlaintextLRU(maxsize=2)
+        cache.set(b"a", "first")
+        cache.set(b"b", "second")
+        cache.get(b"a")
+        cache.set(b"c", "third")
+        self.assertIn(b"a", cache)
+        self.assertNotIn(b"b", cache)
+        self.assertEqual(len(cache), 2)
+
+
+class TestDecryptionEngine(TestCase):
+    def setUp(self):
+        baker.make(Employee, first_name="Jane", last_name="Doe", _quantity=3)
+
+    def test_decrypt_queryset_matches_orm(self):
+        engine = DecryptionEngine(chunk_size=2)
+        decrypted = engine.decrypt_queryset(Employee.objects.order_by("pk"), fields=["first_name", "last_name"])
+        self.assertEqual([(e.first_name, e.last_name) for e in decrypted], [("Jane", "Doe")] * 3)
+
+    def test_repeated_ciphertext_is_served_from_cache(self):
+        engine = DecryptionEngine()
+        engine.decrypt_queryset(Employee.objects.all(), fields=["first_name"])
+        engine.decrypt_queryset(Employee.objects.all(), fields=["first_name"])
+        self.assertEqual(engine.cache.hits, 3)
+
+
+class TestEnvelopeEncryption(TestCase):
+    def test_fields_are_sealed_under_the_row_data_key(self):
+        employee = baker.make(Employee, first_name="Jane", last_name="Doe")
+        stored = Employee.objects.filter(pk=employee.pk).values_list("first_name", flat=True).get()
+        self.assertTrue(is_sealed(stored))
+        self.assertNotIn(b"Jane", bytes(stored))
+        self.assertEqual(Employee.objects.get(pk=employee.pk).first_name, "Jane")
+
+    def test_sealed_value_is_bound_to_its_column(self):
+        data_key = generate_data_key()
+        sealed = seal(data_key, "Jane", b"employee_employee.first_name")
+        with self.assertRaises(InvalidTag):
+            unseal(data_key, sealed, b"employee_employee.last_name")
+
+    def test_fields_are_decrypted_on_first_access_only(self):
+        employee = baker.make(Employee, username="jdoe", first_name="Jane", last_name="Doe")
+        with self.assertNumQueries(1):
+            loaded = Employee.objects.get(pk=employee.pk)
+            self.assertEqual(loaded.username, "jdoe")
+        self.assertIsInstance(loaded.__dict__["data_key"], WrappedKey)
+        self.assertIsInstance(loaded.__dict__["first_name"], StoredValue)
+        with self.assertNumQueries(1):
+            self.assertEqual(loaded.first_name, "Jane")
+            self.assertEqual(loaded.last_name, "Doe")
+        self.assertEqual(loaded.__dict__["last_name"], "Doe")
+
+    def test_compressed_seal_roundtrip_is_smaller(self):
+        data_key = generate_data_key()
+        plaintext = "1234 North Lake Shore Drive, Apartment 56, Chicago " * 8
+        compressed = seal(data_key, plaintext, b"employee.street_address1", compress=True)
+        self.assertLess(len(compressed), len(seal(data_key, plaintext, b"employee.street_address1")))
+        self.assertTrue(is_sealed(compressed))
+        self.assertEqual(unseal(data_key, compressed, b"employee.street_address1"), plaintext)
+
+    @override_settings(EXPORT_DECRYPTION_PROCESSES=0, EXPORT_DECRYPTION_CHUNK_SIZE=3)
+    def test_open_parallel_opens_every_field_in_order(self):
+        for index in range(4):
+            baker.make(Employee, username=f"user{index}", first_name=f"Jane{index}", last_name="Doe")
+        engine = DecryptionEngine()
+        employees = engine.open_parallel(engine.decrypt_queryset(Employee.objects.order_by("pk")))
+        self.assertEqual([employee.__dict__["first_name"] for employee in employees], [f"Jane{index}" for index in range(4)])
+        self.assertEqual(employees[0].__dict__["last_name"], "Doe")
+
+    @override_settings(EXPORT_DECRYPTION_PROCESSES=2, EXPORT_DECRYPTION_CHUNK_SIZE=3)
+    def test_open_parallel_through_the_process_pool(self):
+        self.addCleanup(_reset_export_pool)
+        for index in range(4):
+            baker.make(Employee, username=f"user{index}", first_name=f"Jane{index}", last_name="Doe")
+        engine = DecryptionEngine()
+        with patch("nhhc.utils.decryption._reset_export_pool") as reset:
+            employees = engine.open_parallel(engine.decrypt_queryset(Employee.objects.order_by("pk")))
+        reset.assert_not_called()
+        self.assertIsNotNone(decryption._export_pool)
+        self.assertEqual([employee.__dict__["first_name"] for employee in employees], [f"Jane{index}" for index in range(4)])
+        self.assertEqual([employee.__dict__["last_name"] for employee in employees], ["Doe"] * 4)
+
+    def test_saving_a_key_never_unwrapped_keeps_the_stored_wrap(self):
+        employee = baker.make(Employee, username="jdoe", first_name="Jane", last_name="Doe")
+        loaded = Employee.objects.get(pk=employee.pk)
+        Employee.objects.filter(pk=employee.pk).update(data_key=Value(b"rewrapped", output_field=BinaryField()))
+        loaded.username = "jdoe2"
+        loaded.save()
+        self.assertEqual(bytes(Employee.objects.filter(pk=employee.pk).values_list("data_key", flat=True).get()), b"rewrapped")
@@ -0,0 +1,55 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from employee.models import Employee
+from model_bakery import baker
+
+from nhhc.utils.fields import SORT_KEY_LAST
+from nhhc.utils.keyset import KeysetPaginator
+from nhhc.utils.testing import register_encrypted_field_generators
+
+register_encrypted_field_generators()
+
+KEYSET = ("last_name_sort", "first_name_sort", "employee_id")
+
+
+class TestKeysetPagination(TestCase):
+    def setUp(self):
+        # Repeated names share sort keys, and names without letters sort last.
+        for index, (first, last) in enumerate([("Ann", "Zimmer"), ("Bob", "Adams"), ("Bob", "Adams"), ("Cy", "123"), ("Dee", "Moss"), ("Eve", "Adams"), ("Fay", "Ng")]):
+            baker.make(Employee, username=f"user{index}", first_name=first, last_name=last)
+        self.queryset = Employee.objects.values(*KEYSET)
+        self.expected = list(self.queryset.order_by(*KEYSET).values_list("employee_id", flat=True))
+
+    def test_pages_walk_every_row_once_in_order(self):
+        paginator = KeysetPaginator(self.queryset, KEYSET, per_page=3)
+        page, seen = paginator.page(), []
+        self.assertFalse(page.has_previous)
+        while True:
+            seen.extend(row["employee_id"] for row in page)
+            if not page.has_next:
+                break
+            page = paginator.page(after=page.next_cursor)
+        self.assertEqual(seen, self.expected)
+
+    def test_previous_cursor_returns_the_preceding_page(self):
+        paginator = KeysetPaginator(self.queryset, KEYSET, per_page=3)
+        second = paginator.page(after=paginator.page().next_cursor)
+        first = paginator.page(before=second.previous_cursor)
+        self.assertEqual([row["employee_id"] for row in first], self.expected[:3])
+        self.assertFalse(first.has_previous)
+
+    def test_tampered_cursor_serves_the_first_page(self):
+        paginator = KeysetPaginator(self.queryset, KEYSET, per_page=3)
+        self.assertEqual([row["employee_id"] for row in paginator.page(after="forged:cursor")], self.expected[:3])
+
+    def test_sort_keys_are_never_null(self):
+        self.assertFalse(Employee.objects.filter(last_name_sort__isnull=True).exists())
+        self.assertEqual(Employee.objects.get(last_name="123").last_name_sort, SORT_KEY_LAST)
+
+    def test_seek_is_one_row_value_comparison(self):
+        paginator = KeysetPaginator(self.queryset, KEYSET, per_page=3)
+        cursor = paginator.page().next_cursor
+        with CaptureQueriesContext(connection) as queries:
+            paginator.page(after=cursor)
+        self.assertRegex(queries[0]["sql"], r'\("employee"\."last_name_sort", "employee"\."first_name_sort", "employee"\."employee_id"\) > \(')
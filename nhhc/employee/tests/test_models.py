@@ -3,6 +3,8 @@ from django.test import TestCase
 from employee.models import Employee
 from model_bakery import baker
 
+from nhhc.utils.fields import sort_within_buckets
+
 User = get_user_model()
 
 
@@ -71,3 +73,34 @@ class EmployeeModelTests(TestCase):
         self.assertIsNotNone(user.termination_date)
         self.assertEqual(user.username, "doe.johnX")
         self.assertFalse(user.is_active)
+
+    def test_terminate_employment_without_email(self):
+        """
+        Test that terminating an employee without an email address leaves it empty.
+        """
+        user = Employee.objects.create_user(password="testpassword", first_name="John", last_name="Doe")
+        user.terminate_employment()
+        self.assertIsNone(Employee.objects.get(pk=user.pk).email)
+
+    def test_email_blind_index_lookup(self):
+        """
+        Test that the email blind index is maintained on save and matches case-insensitively.
+        """
+        user = Employee.objects.create_user(
+            password="testpassword",
+            first_name="John",
+            last_name="Doe",
+        )
+        user.email = "John.Doe@Example.com"
+        user.save()
+        self.assertIsNotNone(user.email_bidx)
+        self.assertEqual(Employee.objects.get(email_bidx__matches=" john.doe@example.com"), user)
+
+    def test_default_ordering_by_name_sort_keys(self):
+        """
+        Test that the default ordering, finished within buckets in Python, is alphabetical by last then first name.
+        """
+        for first_name, last_name in [("Sam", "Zimmer"), ("Ann", "Adams"), ("Bob", "Abbott"), ("Al", "Adams"), ("Cy", "Baker")]:
+            baker.make(Employee, username=f"{last_name}.{first_name}", first_name=first_name, last_name=last_name)
+        ordered = sort_within_buckets(Employee.objects.all(), ["last_name", "first_name"])
+        self.assertEqual([(e.last_name, e.first_name) for e in ordered], [("Abbott", "Bob"), ("Adams", "Al"), ("Adams", "Ann"), ("Baker", "Cy"), ("Zimmer", "Sam")])
@@ -0,0 +1,80 @@
+from unittest.mock import patch
+
+from authentication.models import UserProfile
+from compliance.models import Compliance
+from django.contrib.auth.hashers import check_password
+from django.core import mail
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from employee.models import Employee
+from model_bakery import baker
+from web.models import EmploymentApplicationModel
+
+from nhhc.utils.onboarding import bulk_hire, bulk_reject, hash_passwords, reissue_credentials
+from nhhc.utils.testing import LOCMEM_CACHES, register_encrypted_field_generators
+
+register_encrypted_field_generators()
+
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+@override_settings(CACHES=LOCMEM_CACHES, PASSWORD_HASHERS=FAST_HASHERS, EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+class TestBulkOnboarding(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.manager = baker.make(Employee, username="admin", is_superuser=True)
+        self.applications = [baker.make(EmploymentApplicationModel, first_name="Jane", last_name="Doe", reviewed=False, hired=None) for _ in range(2)]
+        self.already_hired = baker.make(EmploymentApplicationModel, first_name="John", last_name="Roe", reviewed=True, hired=True)
+
+    def test_passwords_are_hashed_in_order(self):
+        hashes = hash_passwords(["first", "second", "third"], workers=3)
+        self.assertEqual([check_password(password, hashed) for password, hashed in zip(["first", "second", "third"], hashes)], [True, True, True])
+
+    def test_bulk_hire_creates_accounts_and_profiles(self):
+        pks = [application.pk for application in self.applications]
+        with self.captureOnCommitCallbacks(execute=True):
+            result = bulk_hire([*pks, self.already_hired.pk, 999999], hired_by=self.manager)
+
+        self.assertEqual([hire["application"] for hire in result["hired"]], pks)
+        self.assertEqual(result["skipped"], [self.already_hired.pk])
+        self.assertEqual(result["missing"], [999999])
+        usernames = [hire["username"] for hire in result["hired"]]
+        self.assertEqual(len(set(usernames)), 2)
+        employee_ids = [hire["employee_id"] for hire in result["hired"]]
+        self.assertEqual(UserProfile.objects.filter(user_id__in=employee_ids).count(), 2)
+        self.assertEqual(Compliance.objects.filter(employee_id__in=employee_ids).count(), 2)
+        self.assertTrue(all(application.hired and application.reviewed for application in EmploymentApplicationModel.objects.filter(pk__in=pks)))
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_bulk_reject_queues_one_batch_of_emails(self):
+        pks = [application.pk for application in self.applications]
+        with patch("nhhc.utils.onboarding.send_rejection_emails.delay") as delay, self.captureOnCommitCallbacks(execute=True):
+            result = bulk_reject([*pks, self.already_hired.pk], rejected_by=self.manager)
+
+        self.assertEqual(result["rejected"], pks)
+        self.assertEqual(result["skipped"], [self.already_hired.pk])
+        self.assertEqual(EmploymentApplicationModel.objects.filter(pk__in=pks, hired=False, reviewed=True).count(), 2)
+        delay.assert_called_once()
+        self.assertEqual(len(delay.call_args.args[0]), 2)
+
+    def test_bulk_routes_require_a_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.manager)
+        for route in ("bulk-hire-employees", "bulk-reject-applications"):
+            response = client.post(reverse(route), {"pks": [application.pk for application in self.applications]})
+            self.assertEqual(response.status_code, 403)
+        self.assertFalse(EmploymentApplicationModel.objects.filter(reviewed=True, pk__in=[application.pk for application in self.applications]).exists())
+
+    def test_undelivered_credentials_are_reissued(self):
+        pks = [application.pk for application in self.applications]
+        with patch("nhhc.utils.onboarding.HR_MAILROOM.send_batch", side_effect=lambda messages: list(messages)), patch(
+            "nhhc.utils.onboarding.reissue_onboarding_credentials.delay"
+        ) as delay, self.captureOnCommitCallbacks(execute=True):
+            result = bulk_hire(pks, hired_by=self.manager)
+        delay.assert_called_once_with([hire["employee_id"] for hire in result["hired"]])
+
+        employee = Employee.objects.get(pk=result["hired"][0]["employee_id"])
+        self.assertEqual(reissue_credentials([employee.pk]), [])
+        self.assertNotEqual(Employee.objects.get(pk=employee.pk).password, employee.password)
+        self.assertEqual(len(mail.outbox), 1)
@@ -0,0 +1,36 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from employee.models import Employee
+from model_bakery import baker
+
+from nhhc.utils.envelope import is_sealed
+from nhhc.utils.projection import EMPLOYEE_DISPLAY
+from nhhc.utils.testing import LOCMEM_CACHES
+
+
+@override_settings(CACHES=LOCMEM_CACHES, DISPLAY_PROJECTION_ENCRYPT=True)
+class TestDisplayProjection(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_records_are_sealed_at_rest(self):
+        employee = baker.make(Employee, username="jdoe", first_name="Jane", last_name="Doe")
+        EMPLOYEE_DISPLAY.write(employee)
+        stored = cache.get(EMPLOYEE_DISPLAY.key(employee.pk))
+        self.assertTrue(is_sealed(stored))
+        self.assertNotIn(b"Jane", stored)
+        self.assertEqual(EMPLOYEE_DISPLAY.get(employee.pk).first_name, "Jane")
+
+    def test_get_many_fills_misses_in_order_and_then_skips_the_database(self):
+        employees = [baker.make(Employee, username=f"user{index}", first_name=f"Jane{index}", last_name="Doe") for index in range(3)]
+        pks = [employee.pk for employee in reversed(employees)]
+        cache.clear()
+        self.assertEqual([record.username for record in EMPLOYEE_DISPLAY.get_many(pks)], ["user2", "user1", "user0"])
+        with self.assertNumQueries(0):
+            self.assertEqual([record.first_name for record in EMPLOYEE_DISPLAY.get_many(pks)], ["Jane2", "Jane1", "Jane0"])
+
+    def test_evict_removes_the_record(self):
+        employee = baker.make(Employee, username="jdoe", first_name="Jane", last_name="Doe")
+        EMPLOYEE_DISPLAY.write(employee)
+        EMPLOYEE_DISPLAY.evict(employee.pk)
+        self.assertIsNone(cache.get(EMPLOYEE_DISPLAY.key(employee.pk)))
@@ -0,0 +1,33 @@
+from django.db import connection
+from django.test import TestCase
+from employee.models import Employee
+from model_bakery import baker
+
+from nhhc.utils.rotation import KeyRotationJob, rotatable_models
+
+
+class TestKeyRotationJob(TestCase):
+    def setUp(self):
+        self.employees = baker.make(Employee, first_name="Jane", last_name="Doe", _quantity=5)
+
+    def test_plan_splits_primary_keys_across_workers(self):
+        job = KeyRotationJob(Employee, workers=2)
+        job.plan(reset=True)
+        pks = sorted(employee.pk for employee in self.employees)
+        self.assertEqual(len(job.checkpoint.ranges), 2)
+        self.assertEqual(job.checkpoint.ranges[0][0], pks[0])
+        self.assertEqual(job.checkpoint.ranges[-1][1], pks[-1])
+
+    def test_run_scans_every_row_and_keeps_them_readable(self):
+        self.assertIn(Employee, rotatable_models())
+        report = KeyRotationJob(Employee, batch_size=2).run(reset=True)
+        self.assertEqual(report["rows"], 5)
+        self.assertFalse(KeyRotationJob(Employee).checkpoint.load())
+        self.assertEqual({employee.first_name for employee in Employee.objects.all()}, {"Jane"})
+
+    def test_a_single_range_keeps_the_callers_connection_open(self):
+        Employee.objects.exclude(pk=self.employees[0].pk).delete()
+        report = KeyRotationJob(Employee, workers=2).run(reset=True)
+        self.assertEqual(report["rows"], 1)
+        self.assertFalse(connection.closed_in_transaction)
+        self.assertEqual(Employee.objects.count(), 1)
@@ -0,0 +1,73 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from employee.models import Employee
+from model_bakery import baker
+
+from nhhc.utils.testing import LOCMEM_CACHES
+from nhhc.utils.tiered_cache import LocalTTLCache, invalidate_many, local_cache
+
+
+class TestLocalTTLCache(SimpleTestCase):
+    def test_evicts_least_recently_used(self):
+        local = LocalTTLCache(maxsize=2, ttl=60)
+        local.set("a", 1)
+        local.set("b", 2)
+        local.get("a")
+        local.set("c", 3)
+        self.assertEqual(local.get("a"), 1)
+        self.assertIsNot(local.get("b"), 2)
+
+    def test_entries_expire(self):
+        local = LocalTTLCache(maxsize=2, ttl=-1)
+        local.set("a", 1)
+        self.assertIsNot(local.get("a"), 1)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestTieredCacheManager(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+
+    def test_get_cached_serves_fresh_instances_without_queries(self):
+        employee = baker.make(Employee, username="jdoe", first_name="Jane", last_name="Doe")
+        first = Employee.objects.get_cached(employee.pk)
+        with self.assertNumQueries(0):
+            second = Employee.objects.get_cached(employee.pk)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.username, "jdoe")
+
+    def test_save_invalidates_both_tiers(self):
+        employee = baker.make(Employee, username="jdoe", first_name="Jane", last_name="Doe")
+        Employee.objects.get_cached(employee.pk)
+        employee.username = "jane.doe"
+        employee.save()
+        self.assertEqual(Employee.objects.get_cached(employee.pk).username, "jane.doe")
+
+    def test_password_and_blind_indexes_are_not_cached(self):
+        employee = baker.make(Employee, username="jdoe", first_name="Jane", last_name="Doe", email="jane@example.com")
+        Employee.objects.get_cached(employee.pk)
+        values, session_auth_hash = cache.get(f"object:employee.employee:pk:{employee.pk}")
+        self.assertNotIn(employee.password, values)
+        self.assertNotIn(employee.email_bidx, values)
+        cached = Employee.objects.get_cached(employee.pk)
+        self.assertTrue({"password", "email_bidx", "first_name_bidx"} <= cached.get_deferred_fields())
+        with self.assertNumQueries(0):
+            self.assertEqual(cached.get_session_auth_hash(), employee.get_session_auth_hash())
+        self.assertEqual(session_auth_hash, employee.get_session_auth_hash())
+
+    def test_saving_a_cached_instance_refreshes_its_blind_indexes(self):
+        employee = baker.make(Employee, username="jdoe", first_name="Jane", last_name="Doe", email="jane@example.com")
+        cached = Employee.objects.get_cached(employee.pk)
+        cached.email = "jane.doe@example.com"
+        cached.save()
+        self.assertEqual(Employee.objects.get(email_bidx__matches="jane.doe@example.com").pk, employee.pk)
+
+    def test_invalidate_many_evicts_bulk_updated_rows(self):
+        employees = [baker.make(Employee, username=f"jdoe{index}", first_name="Jane", last_name="Doe") for index in range(2)]
+        for employee in employees:
+            Employee.objects.get_cached(employee.pk)
+            employee.username = f"{employee.username}.x"
+        Employee.objects.bulk_update(employees, ["username"])
+        invalidate_many(employees)
+        self.assertEqual([Employee.objects.get_cached(employee.pk).username for employee in employees], ["jdoe0.x", "jdoe1.x"])
@@ -0,0 +1,33 @@
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from employee.models import Employee, UsernameCounter
+from model_bakery import baker
+
+from nhhc.utils.usernames import allocate_username, allocate_usernames, number_of, reconcile_counters, username_of
+
+
+class TestUsernameAllocator(TestCase):
+    def test_usernames_are_numbered_per_name(self):
+        self.assertEqual([allocate_username("Jane", "Doe") for _ in range(3)], ["doe.jane", "doe.jane1", "doe.jane2"])
+        self.assertEqual(allocate_username("John", "Doe"), "doe.john")
+
+    def test_a_batch_is_reserved_in_one_statement(self):
+        allocate_username("Jane", "Doe")
+        with self.assertNumQueries(1):
+            self.assertEqual(allocate_usernames("Jane", "Doe", count=3), ["doe.jane1", "doe.jane2", "doe.jane3"])
+        self.assertEqual(UsernameCounter.objects.get(base="doe.jane").allocated, 4)
+
+    def test_numbers_round_trip(self):
+        self.assertEqual([number_of(username_of("doe.jane", number)) for number in (1, 2, 11)], [("doe.jane", 1), ("doe.jane", 2), ("doe.jane", 11)])
+
+    def test_reconcile_skips_usernames_created_without_the_allocator(self):
+        baker.make(Employee, username="doe.jane4")
+        UsernameCounter.objects.create(base="roe.john", allocated=7)
+        reconcile_counters()
+        self.assertEqual(allocate_username("Jane", "Doe"), "doe.jane5")
+        self.assertEqual(UsernameCounter.objects.get(base="roe.john").allocated, 7)
+
+    def test_usernames_are_unique(self):
+        baker.make(Employee, username="doe.jane")
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            baker.make(Employee, username="doe.jane")
@@ -8,6 +8,7 @@ The URL patterns include:
 - reject-application: Allows for the rejection of an application with CSRF exemption
 - employee_roster: Displays the roster of employees
 - hire-employee: Handles the hiring of new employees
+- bulk-hire-employees / bulk-reject-applications: Hire or reject a batch of applicants in one request
 
 These URL patterns are used to define the routing for the views in the application.
 
@@ -24,7 +25,7 @@ from rest_framework import routers, serializers, viewsets
 class EmployeeSerializer(serializers.HyperlinkedModelSerializer):
     class Meta:
         model = Employee
-        fields = "__all__"
+        exclude = ["data_key"]
 
 
 # ViewSets define the view behavior.
@@ -46,6 +47,9 @@ urlpatterns = [
     path("applicant/reject/", csrf_exempt(views.reject), name="reject-application"),
     path("roster/", login_required(views.EmployeeRoster.as_view()), name="roster"),
     path("applicant/hire/", csrf_exempt(views.hire), name="hire-employee"),
+    # The bulk routes are CSRF-protected: AJAX callers send the `X-CSRFToken` header.
+    path("applicant/hire/bulk/", views.bulk_hire, name="bulk-hire-employees"),
+    path("applicant/reject/bulk/", views.bulk_reject, name="bulk-reject-applications"),
     # re_path(r"^accounts/login/$", views.force_pwd_login),
     path("employee/terminate/", csrf_exempt(views.terminate), name="terminate_employee"),
     path("employee/promote/", csrf_exempt(views.promote), name="promote_employee"),
@@ -7,6 +7,8 @@ This module contains views and functions for managing employee information, incl
 Functions:
 - hire(request): Handles the hiring of applicants and sends new user credentials.
 - reject(request): Handles the rejection of applicants.
+- bulk_hire(request): Hires a batch of applicants in one transaction.
+- bulk_reject(request): Rejects a batch of applicants in one transaction.
 - employee_roster(request): Renders the employee listing page.
 - employee_details(request, pk): Renders the employee details page and allows for editing employee information.
 
@@ -15,12 +17,16 @@ To use the functions in this module, import the module and call the desired func
 """
 
 
-from typing import Any
+import json
+from typing import Any, Iterator, List
 
 from compliance.models import Compliance
+from django.conf import settings
 from django.contrib.auth import authenticate, login
-from django.http import HttpRequest, HttpResponse
+from django.db.models import F
+from django.http import HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect
+from django.template.loader import render_to_string
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import never_cache
 from django.views.decorators.http import require_POST
@@ -35,15 +41,21 @@ from rest_framework.generics import ListCreateAPIView
 from rest_framework.permissions import IsAuthenticated
 from web.models import EmploymentApplicationModel
 
+from nhhc.utils import onboarding
+from nhhc.utils.decryption import for_request
+from nhhc.utils.fields import sort_within_buckets
 from nhhc.utils.helpers import (
     get_content_for_unauthorized_or_forbidden,
     get_status_code_for_unauthorized_or_forbidden,
 )
+from nhhc.utils.keyset import KeysetPaginator
 from nhhc.utils.mailer import PostOffice
+from nhhc.utils.projection import EMPLOYEE_DISPLAY
 
 # from  employee.tasks import send_async_onboarding_email, send_async_rejection_email
 # SECTION - Template - Rendering & API Class-Based Views
 HR_MAILROOM = PostOffice("HR@netthandshome.care")
+ROSTER_ROWS_MARKER = "<!-- roster-rows -->"
 
 
 # SECTION - Templates
@@ -51,19 +63,60 @@ class EmployeeRoster(ListView):
     """
     A class-based template view that displays a list of employees in a paginated format.
 
+    Only the ordering keys come from the database; the rows rendered are the employees' cached display records (see
+    `nhhc.utils.projection`), so a warm roster renders without decrypting anything. Pages are keyset-paginated on the
+    indexed name sort keys (see `nhhc.utils.keyset`), so every page costs the same however large the roster grows.
+    With `?stream=1` the whole roster is streamed instead: the table body is rendered chunk by chunk from a
+    server-side cursor, so memory and time to first byte stay flat.
+
     Attributes:
     - model: The model used for retrieving the list of employees.
-    - queryset: The query set used to fetch all employees ordered by last name.
+    - queryset: The primary keys and sort keys of all employees.
     - template_name: The HTML template used for rendering the employee listing.
+    - rows_template_name: The template rendering a chunk of table rows.
     - context_object_name: The name used to refer to the list of employees in the template.
-    - paginate_by: The number of employees to display per page.
+    - keyset: The indexed ordering the roster is paginated on, ending with the primary key.
+    - bucket_ordering: The names the page is alphabetized by within each sort-key bucket.
     """
 
     model = Employee
-    queryset = Employee.objects.all().order_by("last_name")
+    queryset = Employee.objects.values("employee_id", "last_name_sort", "first_name_sort")
     template_name = "employee-listing.html"
+    rows_template_name = "employee-roster-rows.html"
     context_object_name = "employees"
-    # paginate_by = 25
+    keyset = ("last_name_sort", "first_name_sort", "employee_id")
+    bucket_ordering = ("last_name", "first_name")
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        if request.GET.get("stream") or settings.ROSTER_STREAMING:
+            return StreamingHttpResponse(self.stream(), content_type="text/html; charset=utf-8")
+        return super().get(request, *args, **kwargs)
+
+    def records(self, pks: List[int]) -> List[Any]:
+        return sort_within_buckets(EMPLOYEE_DISPLAY.get_many(pks, engine=for_request(self.request)), self.bucket_ordering, model=Employee)
+
+    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        page = KeysetPaginator(self.get_queryset(), self.keyset, settings.ROSTER_PAGE_SIZE).page(after=self.request.GET.get("after"), before=self.request.GET.get("before"))
+        context = super().get_context_data(object_list=self.records([row["employee_id"] for row in page]), **kwargs)
+        context.update({"page_obj": page, "is_paginated": page.has_next or page.has_previous})
+        return context
+
+    def stream(self) -> Iterator[str]:
+        """
+        Yields the roster page: the markup before the table body, the rows in chunks, then the rest of the page.
+        """
+        head, tail = render_to_string(self.template_name, {"streaming": True, "rows_marker": ROSTER_ROWS_MARKER}, request=self.request).split(ROSTER_ROWS_MARKER)
+        yield head
+        ordering = [F(name).asc(nulls_last=True) for name in self.keyset]
+        chunk: List[int] = []
+        for row in self.get_queryset().order_by(*ordering).iterator(chunk_size=settings.ROSTER_STREAM_CHUNK_SIZE):
+            chunk.append(row["employee_id"])
+            if len(chunk) == settings.ROSTER_STREAM_CHUNK_SIZE:
+                yield render_to_string(self.rows_template_name, {"employees": self.records(chunk)}, request=self.request)
+                chunk = []
+        if chunk:
+            yield render_to_string(self.rows_template_name, {"employees": self.records(chunk)}, request=self.request)
+        yield tail
 
 
 @method_decorator(never_cache, name="dispatch")
@@ -245,6 +298,82 @@ def hire(request: HttpRequest) -> HttpResponse:
         )
 
 
+def _requested_pks(request: HttpRequest) -> List[int]:
+    """
+    Returns the application PKs of a bulk request: a JSON body `{"pks": [...]}`, or repeated `pks` form fields.
+
+    Raises:
+        ValueError: If no PK, a non-integer PK or more than `settings.BULK_ONBOARDING_MAX_BATCH` PKs were sent.
+    """
+    if request.content_type == "application/json":
+        try:
+            pks = json.loads(request.body or b"{}").get("pks") or []
+        except (AttributeError, json.JSONDecodeError) as e:
+            raise ValueError(f"Malformed JSON Body - {e}") from e
+    else:
+        pks = request.POST.getlist("pks")
+    if not isinstance(pks, list) or not pks:
+        raise ValueError("No Application PKs Submitted")
+    if len(pks) > settings.BULK_ONBOARDING_MAX_BATCH:
+        raise ValueError(f"More Than {settings.BULK_ONBOARDING_MAX_BATCH} Application PKs Submitted")
+    return [int(pk) for pk in pks]
+
+
+def _bulk_onboarding(request: HttpRequest, process, success_status: int) -> HttpResponse:
+    # Condition Checked: Requesting User is Logged in and An Admin
+    if not request.user.is_authenticated or not request.user.is_superuser:
+        logger.warning("No Authenticated or Non-Admin Bulk Onboarding Request Recieved - Denying Request")
+        return HttpResponse(
+            status=get_status_code_for_unauthorized_or_forbidden(request),
+            content=get_content_for_unauthorized_or_forbidden(request),
+        )
+    try:
+        pks = _requested_pks(request)
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Bad Bulk Onboarding Request - {e}")
+        return JsonResponse({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        result = process(pks, request.user)
+    except Exception as e:
+        logger.exception(f"Bulk Onboarding Failed - Nothing Was Changed - {e}")
+        return JsonResponse({"error": f"Failed to process applicants. Error: {e}."}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    return JsonResponse(result, status=success_status)
+
+
+@require_POST
+def bulk_hire(request: HttpRequest) -> HttpResponse:
+    """
+    Hires a batch of applicants in one transaction (see `nhhc.utils.onboarding.bulk_hire`) and emails each their credentials.
+
+    Args:
+        request (HttpRequest): A CSRF-protected POST with a JSON body `{"pks": [...]}` or repeated `pks` form fields.
+
+    Returns:
+        JsonResponse: The hired, skipped and missing applications.
+                400 - If no PK, an invalid PK or too many PKs were submitted \n
+                422 - If the batch could not be hired; no applicant was hired \n
+                201 - On success, with the `hired`, `skipped` and `missing` lists \n
+    """
+    return _bulk_onboarding(request, lambda pks, user: onboarding.bulk_hire(pks, hired_by=user), status.HTTP_201_CREATED)
+
+
+@require_POST
+def bulk_reject(request: HttpRequest) -> HttpResponse:
+    """
+    Rejects a batch of applicants in one transaction (see `nhhc.utils.onboarding.bulk_reject`) and queues their rejection emails.
+
+    Args:
+        request (HttpRequest): A CSRF-protected POST with a JSON body `{"pks": [...]}` or repeated `pks` form fields.
+
+    Returns:
+        JsonResponse: The rejected, skipped and missing applications.
+                400 - If no PK, an invalid PK or too many PKs were submitted \n
+                422 - If the batch could not be rejected; no applicant was rejected \n
+                200 - On success, with the `rejected`, `skipped` and `missing` lists \n
+    """
+    return _bulk_onboarding(request, lambda pks, user: onboarding.bulk_reject(pks, rejected_by=user), status.HTTP_200_OK)
+
+
 @require_POST
 def terminate(request: HttpRequest) -> HttpResponse:
     """
@@ -1,4 +1,5 @@
 import os
+from datetime import timedelta
 
 from celery import Celery
 from celery.schedules import crontab
@@ -22,6 +23,22 @@ def config_loggers(*args, **kwargs):
 
 backend_workers.autodiscover_tasks()
 
+backend_workers.conf.beat_schedule = {
+    "refresh-health-snapshot": {
+        "task": "portal.tasks.refresh_health_snapshot",
+        "schedule": timedelta(seconds=settings.HEALTH_CHECK_REFRESH_SECONDS),
+        "options": {"expires": settings.HEALTH_CHECK_REFRESH_SECONDS},
+    },
+    "prune-stale-cache-versions": {
+        "task": "portal.tasks.prune_stale_cache_versions",
+        "schedule": crontab(minute=30, hour=4),
+    },
+    "reconcile-username-counters": {
+        "task": "portal.tasks.reconcile_username_counters",
+        "schedule": crontab(minute=45, hour=4),
+    },
+}
+
 
 @backend_workers.task(bind=True, ignore_result=True)
 def debug_task(self):
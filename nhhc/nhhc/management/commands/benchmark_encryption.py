@@ -0,0 +1,61 @@
+"""
+Management command: benchmark_encryption
+
+Runs the encryption benchmark suite (see `nhhc.utils.benchmarks`) in a throwaway test database against a freshly
+generated GPG key pair, and writes the results as JSON.
+
+Usage:
+    python manage.py benchmark_encryption --rows 200 --repeat 5 --output encryption-benchmark.json
+    python manage.py benchmark_encryption --baseline encryption-benchmark-main.json
+"""
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_databases, teardown_databases
+
+from nhhc.utils.benchmarks import EncryptionBenchmark, compare, generate_key_pair
+
+
+class Command(BaseCommand):
+    help = "Benchmarks per-field encryption throughput and end-to-end encrypted operations, and writes the results as JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=200, help="Rows seeded per model, and values per micro benchmark.")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark.")
+        parser.add_argument("--key-length", type=int, default=2048, help="RSA modulus size of the generated key pair.")
+        parser.add_argument("--output", default="encryption-benchmark.json", help="Where the JSON report is written.")
+        parser.add_argument("--baseline", help="A previous report to compare throughput against.")
+        parser.add_argument("--keepdb", action="store_true", help="Keep the test database between runs.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("The Encryption Benchmarks Require PostgreSQL With the pgcrypto Extension")
+
+        public_key, private_key = generate_key_pair(options["key_length"])
+        old_config = setup_databases(verbosity=0, interactive=False, keepdb=options["keepdb"])
+        saved_keys = {name: connection.settings_dict.get(name) for name in ("ENCRYPT_PUBLIC_KEY", "ENCRYPT_PRIVATE_KEY")}
+        try:
+            # Keys on the connection take precedence over settings for every pgcrypto call.
+            connection.settings_dict.update(ENCRYPT_PUBLIC_KEY=public_key, ENCRYPT_PRIVATE_KEY=private_key)
+            report = EncryptionBenchmark(rows=options["rows"], repeat=options["repeat"]).run()
+        finally:
+            for name, value in saved_keys.items():
+                if value is None:
+                    connection.settings_dict.pop(name, None)
+                else:
+                    connection.settings_dict[name] = value
+            teardown_databases(old_config, verbosity=0, keepdb=options["keepdb"])
+
+        Path(options["output"]).write_text(json.dumps(report, indent=2))
+        for result in report["results"]:
+            self.stdout.write(f"{result['name']:<70} {result['ops_per_second']:>12,.2f} ops/s")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(report['results'])} Results to {options['output']}"))
+
+        if options["baseline"]:
+            baseline = json.loads(Path(options["baseline"]).read_text())
+            for change in compare(report, baseline):
+                style = self.style.ERROR if change["ratio"] < 0.9 else self.style.SUCCESS
+                self.stdout.write(style(f"{change['name']:<70} {change['ratio']:>6.3f}x"))
@@ -0,0 +1,51 @@
+"""
+Management command: rotate_encryption_keys
+
+Re-encrypts every envelope-encrypted row under the key pair currently configured in DB_GPG_PRIVATE_KEY / DB_GPG_PUBLIC_KEY.
+See `nhhc.utils.rotation` for the procedure.
+
+Usage:
+    python manage.py rotate_encryption_keys --workers 4 --batch-size 500 --pause 0.25
+    python manage.py rotate_encryption_keys --model employee.Employee --reset
+    python manage.py rotate_encryption_keys --reseal
+"""
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from prometheus_client import start_http_server
+
+from nhhc.utils.rotation import KeyRotationJob, rotatable_models
+
+
+class Command(BaseCommand):
+    help = "Re-wraps envelope data keys (and re-seals legacy ciphertext) under the current encryption key pair, in resumable batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", action="append", dest="models", metavar="APP_LABEL.MODEL", help="Rotate only this model. Repeatable. Defaults to every envelope-encrypted model.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Rows per batch and per transaction.")
+        parser.add_argument("--workers", type=int, default=1, help="Primary-key ranges processed in parallel, each on its own connection.")
+        parser.add_argument("--pause", type=float, default=0.0, help="Seconds each worker sleeps after every batch, to throttle the load on the database.")
+        parser.add_argument("--database", default="default", help="The database alias to rotate.")
+        parser.add_argument("--reseal", action="store_true", help="Seal every value again, e.g. after enabling compression on a field.")
+        parser.add_argument("--reset", action="store_true", help="Ignore saved checkpoints and start over.")
+        parser.add_argument("--metrics-port", type=int, help="Expose the key_rotation_* Prometheus metrics on this port while the command runs.")
+
+    def handle(self, *args, **options):
+        if options["models"]:
+            try:
+                targets = [apps.get_model(label) for label in options["models"]]
+            except LookupError as error:
+                raise CommandError(str(error))
+            unsupported = [model._meta.label for model in targets if model not in rotatable_models()]
+            if unsupported:
+                raise CommandError(f"Not Envelope Encrypted: {', '.join(unsupported)}")
+        else:
+            targets = rotatable_models()
+
+        if options["metrics_port"]:
+            start_http_server(options["metrics_port"])
+
+        for model in targets:
+            job = KeyRotationJob(model, batch_size=options["batch_size"], workers=options["workers"], pause=options["pause"], reseal=options["reseal"], using=options["database"])
+            report = job.run(reset=options["reset"])
+            self.stdout.write(self.style.SUCCESS(f"{model._meta.label}: {report['rows']} rows in {report['seconds']}s"))
@@ -0,0 +1,42 @@
+"""
+Management command: warm_caches
+
+Fills the page, review stats, queryset, announcement and employee display caches after a deploy and reports how long each took.
+See `nhhc.utils.warmup` for what is warmed.
+
+Usage:
+    python manage.py warm_caches
+    python manage.py warm_caches --workers 8 --only pages --only stats
+    python manage.py warm_caches --async
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from nhhc.utils.warmup import WARMERS, warm_caches
+
+
+class Command(BaseCommand):
+    help = "Pre-renders the cached public pages and sitemap and fills the review stats, queryset, announcement and employee display caches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, help="Caches warmed concurrently. Defaults to CACHE_WARMUP_WORKERS.")
+        parser.add_argument("--only", action="append", choices=["pages", *WARMERS], help="Warm only this cache. Repeatable. Defaults to every cache.")
+        parser.add_argument("--async", action="store_true", dest="run_async", help="Queue the warm-up on the Celery workers instead of running it here.")
+
+    def handle(self, *args, **options):
+        if options["run_async"]:
+            from portal.tasks import warm_caches_task
+
+            result = warm_caches_task.delay(workers=options["workers"], only=options["only"])
+            self.stdout.write(self.style.SUCCESS(f"Queued Cache Warm-Up as Task {result.id}"))
+            return
+
+        report = warm_caches(workers=options["workers"], only=options["only"])
+        for name, outcome in report.items():
+            if outcome["ok"]:
+                self.stdout.write(self.style.SUCCESS(f"{name}: warmed in {outcome['seconds']}s"))
+            else:
+                self.stdout.write(self.style.ERROR(f"{name}: failed after {outcome['seconds']}s - {outcome['error']}"))
+        failed = [name for name, outcome in report.items() if not outcome["ok"]]
+        if failed:
+            raise CommandError(f"Unable to Warm: {', '.join(failed)}")
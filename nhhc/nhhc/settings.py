@@ -222,22 +222,44 @@ DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
 ENCRYPT_KEY = os.environ["ENCRYPT_KEY"]
 ENCRYPT_PRIVATE_KEY = os.environ["DB_GPG_PRIVATE_KEY"]
 ENCRYPT_PUBLIC_KEY = os.environ["DB_GPG_PUBLIC_KEY"]
+# The private key being rotated out. Rows still wrapped for it stay readable until `rotate_encryption_keys` has run.
+ENCRYPT_PREVIOUS_PRIVATE_KEY = os.getenv("DB_GPG_PREVIOUS_PRIVATE_KEY", "")
+BLIND_INDEX_KEY = os.getenv("BLIND_INDEX_KEY", ENCRYPT_KEY)
+DECRYPTION_WORKERS: int = int(os.getenv("DECRYPTION_WORKERS", 1))
+DECRYPTION_CHUNK_SIZE: int = int(os.getenv("DECRYPTION_CHUNK_SIZE", 500))
+DECRYPTION_CACHE_SIZE: int = int(os.getenv("DECRYPTION_CACHE_SIZE", 4096))
+# Bulk exports open sealed fields across this many processes. 0 or 1 keeps it in the request's process.
+EXPORT_DECRYPTION_PROCESSES: int = int(os.getenv("EXPORT_DECRYPTION_PROCESSES", 0))
+EXPORT_DECRYPTION_CHUNK_SIZE: int = int(os.getenv("EXPORT_DECRYPTION_CHUNK_SIZE", 2000))
+# Streamed JSON / NDJSON exports (see nhhc.utils.streaming): rows fetched, decrypted and encoded per chunk; gzip when accepted.
+EXPORT_STREAM_CHUNK_SIZE: int = int(os.getenv("EXPORT_STREAM_CHUNK_SIZE", 500))
+EXPORT_STREAM_GZIP: bool = os.getenv("EXPORT_STREAM_GZIP", "true").lower() not in ("0", "false", "no")
 # !SECTION
 
 # Section - Caching
 REDIS_URL = os.environ["REDIS_CACHE_URI_TOKEN"]
 HEALTHCHECK_CACHE_KEY = "healthcheck_key"
+# Cached /status/ snapshot (see nhhc.status): refreshed by Celery beat, re-run inline once older than HEALTH_CHECK_MAX_AGE.
+HEALTH_CHECK_REFRESH_SECONDS: int = int(os.getenv("HEALTH_CHECK_REFRESH_SECONDS", 30))
+HEALTH_CHECK_MAX_AGE: int = int(os.getenv("HEALTH_CHECK_MAX_AGE", 90))
+HEALTH_CHECK_BYPASS_PARAM = "deep"
+# Shared token allowing uptime probes to request a deep check (X-Health-Check-Token header); staff may always. Unset: staff only.
+HEALTH_CHECK_DEEP_TOKEN: str = os.getenv("HEALTH_CHECK_DEEP_TOKEN", "")
 
 CACHES = {
     "default": {
-        "BACKEND": os.environ["CACHE_ENGINE"],
+        # Wraps CACHE_ENGINE to export hit / miss / latency / payload metrics per key family (see nhhc.utils.cache_metrics).
+        "BACKEND": "nhhc.utils.cache_metrics.InstrumentedCache",
+        "WRAPPED_BACKEND": os.environ["CACHE_ENGINE"],
+        "ALIAS": "default",
         "LOCATION": os.environ["CACHE_DB_REDIS"],
         "OPTIONS": {
             "PARSER_CLASS": os.environ["CACHE_PARSER"],
             "CONNECTION_POOL_CLASS": "redis.BlockingConnectionPool",
             "CONNECTION_POOL_CLASS_KWARGS": {"max_connections": 50, "timeout": 200},
-            "KEY_PREFIX": "NHHC-NATIVE",
         },
+        "KEY_PREFIX": "NHHC-NATIVE",
+        "KEY_FUNCTION": "nhhc.utils.cache_versions.make_key",
     },
     "celery": {
         "BACKEND": os.environ["CACHE_ENGINE"],
@@ -249,6 +271,51 @@ CACHES = {
     },
 }
 ROBOTS_CACHE_TIMEOUT = 60 * 60 * 24
+# Deploy-versioned cache keys (see nhhc.utils.cache_versions). Bump a family's schema when the shape of what it caches changes;
+# families in CACHE_BUILD_FAMILIES hold rendered templates and are also keyed by the build, so every deploy re-renders them.
+CACHE_BUILD_ID: str = os.getenv("CACHE_BUILD_ID", "local")
+CACHE_BUILD_FAMILIES = ("page", "fragment")
+CACHE_SCHEMA_VERSIONS = {
+    "page": 1,
+    "queryset": 1,
+    "session": 1,
+    "object": 2,
+    "fragment": 1,
+    "feed": 2,
+    "display": 1,
+    "stats": 1,
+    "healthcheck": 1,
+    "lock": 1,
+    "other": 1,
+}
+# Fraction of cache writes whose pickled size is recorded in cache_payload_bytes (see nhhc.utils.cache_metrics)
+CACHE_METRICS_PAYLOAD_SAMPLE_RATE: float = float(os.getenv("CACHE_METRICS_PAYLOAD_SAMPLE_RATE", 0.1))
+# Stampede protection (see nhhc.utils.stampede)
+STAMPEDE_BETA: float = float(os.getenv("STAMPEDE_BETA", 1.0))
+STAMPEDE_STALE_TTL: int = int(os.getenv("STAMPEDE_STALE_TTL", 120))
+STAMPEDE_LOCK_TIMEOUT: int = int(os.getenv("STAMPEDE_LOCK_TIMEOUT", 30))
+# Portal template fragments (see nhhc.utils.fragments) and the models whose changes invalidate them
+FRAGMENT_CACHE_TTL: int = int(os.getenv("FRAGMENT_CACHE_TTL", 300))
+FRAGMENT_CACHE_MODELS = ["announcements.Announcements", "web.EmploymentApplicationModel", "web.ClientInterestSubmission"]
+# Two-tier object cache (see nhhc.utils.tiered_cache): per-worker LRU in front of Redis.
+OBJECT_CACHE_TTL: int = int(os.getenv("OBJECT_CACHE_TTL", 300))
+OBJECT_CACHE_LOCAL_TTL: int = int(os.getenv("OBJECT_CACHE_LOCAL_TTL", 30))
+OBJECT_CACHE_LOCAL_SIZE: int = int(os.getenv("OBJECT_CACHE_LOCAL_SIZE", 1024))
+# Post-deploy cache warm-up (see nhhc.utils.warmup). Pages are requested as this host so their keys match real requests.
+CACHE_WARMUP_HOST: str = os.getenv("CACHE_WARMUP_HOST", ALLOWED_HOSTS[0])
+CACHE_WARMUP_WORKERS: int = int(os.getenv("CACHE_WARMUP_WORKERS", 4))
+# Decrypted employee display records (see nhhc.utils.projection). Sealed in Redis unless DISPLAY_PROJECTION_ENCRYPT is "false".
+DISPLAY_PROJECTION_TTL: int = int(os.getenv("DISPLAY_PROJECTION_TTL", 300))
+DISPLAY_PROJECTION_ENCRYPT: bool = os.getenv("DISPLAY_PROJECTION_ENCRYPT", "true").lower() not in ("0", "false", "no")
+# Aggregate stats of the submission list views (see nhhc.utils.stats), cached per data generation.
+STATS_CACHE_TTL: int = int(os.getenv("STATS_CACHE_TTL", 3600))
+# Employee roster (see employee.views.EmployeeRoster): keyset page size, and the chunk size when streaming the whole roster.
+ROSTER_PAGE_SIZE: int = int(os.getenv("ROSTER_PAGE_SIZE", 50))
+ROSTER_STREAM_CHUNK_SIZE: int = int(os.getenv("ROSTER_STREAM_CHUNK_SIZE", 200))
+ROSTER_STREAMING: bool = os.getenv("ROSTER_STREAMING", "false").lower() in ("1", "true", "yes")
+# Bulk hire / reject (see nhhc.utils.onboarding): applications per request, and temporary passwords hashed concurrently.
+BULK_ONBOARDING_MAX_BATCH: int = int(os.getenv("BULK_ONBOARDING_MAX_BATCH", 200))
+ONBOARDING_HASH_WORKERS: int = int(os.getenv("ONBOARDING_HASH_WORKERS", 4))
 
 
 # !SECTION
@@ -280,8 +347,12 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 AUTHENTICATION_BACKENDS = [
     # Needed to login by username in Django admin, regardless of `allauth`
+    "authentication.backends.CachedModelBackend",
+    # Kept so sessions started before CachedModelBackend still resolve their user
     "django.contrib.auth.backends.ModelBackend",
-    # `allauth` specific authentication methods, such as login by email
+    # `allauth` specific authentication methods, such as login by email (resolved through the email blind index)
+    "authentication.backends.BlindIndexAuthenticationBackend",
+    # Kept so sessions started through allauth before BlindIndexAuthenticationBackend still resolve their user
     "allauth.account.auth_backends.AuthenticationBackend",
     "guardian.backends.ObjectPermissionBackend",
 ]
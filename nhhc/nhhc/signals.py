@@ -7,6 +7,10 @@ Signal Handlers:
     - create_ancillary_profiles_signal
     - password_change_signal
     - employee_terminated_signal
+    - refresh_display_projection_signal
+    - evict_display_projection_signal
+    - queryset_cache_invalidation_signal
+    - object_cache_invalidation_signal
 
 """
 
@@ -15,13 +19,19 @@ from uuid import uuid4
 
 from authentication.models import UserProfile
 from compliance.models import Compliance
+from django.db import transaction
 from django.db.models import signals
 from django.forms.models import model_to_dict
 from employee.models import Employee
 from loguru import logger
 from web.models import EmploymentApplicationModel
 
+from nhhc.utils.feed import invalidate_feed
+from nhhc.utils.fragments import fragment_models
 from nhhc.utils.mailer import PostOffice
+from nhhc.utils.managers import bump_generation, cached_models
+from nhhc.utils.projection import EMPLOYEE_DISPLAY
+from nhhc.utils.tiered_cache import invalidate, tiered_models
 
 
 # SECTION - User Management Signals
@@ -94,6 +104,112 @@ def employee_terminated_signal(sender, instance, **kwargs) -> None:
         pass
 
 
+# SECTION - Cache Invalidation Signals
+def refresh_display_projection_signal(sender, instance, **kwargs) -> None:
+    """
+    Writes the saved employee's display record through to the cache once the transaction commits.
+
+    Args:
+        sender (object): The model class that sent the signal.
+        instance (object): The saved Employee.
+        **kwargs: Additional keyword arguments.
+    """
+
+    def refresh() -> None:
+        try:
+            EMPLOYEE_DISPLAY.write(instance)
+        except Exception as e:
+            # The record expires on its own; a cache outage must not fail the save.
+            logger.warning(f"Unable to Refresh Display Record for Employee {instance.pk} - {e}")
+
+    transaction.on_commit(refresh)
+
+
+def evict_display_projection_signal(sender, instance, **kwargs) -> None:
+    """
+    Removes the deleted employee's display record from the cache once the transaction commits.
+
+    Args:
+        sender (object): The model class that sent the signal.
+        instance (object): The deleted Employee.
+        **kwargs: Additional keyword arguments.
+    """
+    pk = instance.pk
+
+    def evict() -> None:
+        try:
+            EMPLOYEE_DISPLAY.evict(pk)
+        except Exception as e:
+            logger.warning(f"Unable to Evict Display Record for Employee {pk} - {e}")
+
+    transaction.on_commit(evict)
+
+
+def retire_feed_signal(sender, instance, **kwargs) -> None:
+    """
+    Retires the cached announcements feed when an employee is deleted, since their announcements lose their poster
+    through an `on_delete` update that sends no signal (see `nhhc.utils.feed`).
+
+    Args:
+        sender (object): The model class that sent the signal.
+        instance (object): The deleted Employee.
+        **kwargs: Additional keyword arguments.
+    """
+
+    def retire() -> None:
+        try:
+            invalidate_feed()
+        except Exception as e:
+            logger.warning(f"Unable to Retire Announcement Feed After Deleting Employee {instance.pk} - {e}")
+
+    retire()
+    transaction.on_commit(retire)
+
+
+def queryset_cache_invalidation_signal(sender, instance, **kwargs) -> None:
+    """
+    Retires every cached queryset result and template fragment built from the saved or deleted instance's model (see `nhhc.utils.managers` and `nhhc.utils.fragments`).
+
+    Args:
+        sender (object): The model class that sent the signal.
+        instance (object): The saved or deleted instance.
+        **kwargs: Additional keyword arguments.
+    """
+
+    def invalidate() -> None:
+        try:
+            bump_generation(sender)
+        except Exception as e:
+            logger.warning(f"Unable to Invalidate Cached Querysets for {sender._meta.label} - {e}")
+
+    # Bumped now for readers inside this transaction, and again on commit so results cached meanwhile from the old rows are retired too.
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+def object_cache_invalidation_signal(sender, instance, **kwargs) -> None:
+    """
+    Removes the saved or deleted instance from the two-tier object cache of every worker (see `nhhc.utils.tiered_cache`).
+
+    Args:
+        sender (object): The model class that sent the signal.
+        instance (object): The saved or deleted instance.
+        **kwargs: Additional keyword arguments.
+    """
+
+    def evict() -> None:
+        try:
+            invalidate(instance)
+        except Exception as e:
+            logger.warning(f"Unable to Invalidate Cached {sender._meta.label} {instance.pk} - {e}")
+
+    evict()
+    transaction.on_commit(evict)
+
+
+# !SECTION
+
+
 signals.pre_save.connect(employee_terminated_signal, sender=Employee, dispatch_uid="employee.models")
 
 
@@ -108,3 +224,17 @@ signals.post_save.connect(
     sender=Employee,
     dispatch_uid=f"employee.models + {str(uuid4())}",
 )
+
+signals.post_save.connect(refresh_display_projection_signal, sender=Employee, dispatch_uid="employee.display_projection.refresh")
+
+signals.post_delete.connect(evict_display_projection_signal, sender=Employee, dispatch_uid="employee.display_projection.evict")
+
+signals.post_delete.connect(retire_feed_signal, sender=Employee, dispatch_uid="employee.announcement_feed.retire")
+
+for cached_model in dict.fromkeys([*cached_models(), *fragment_models()]):
+    signals.post_save.connect(queryset_cache_invalidation_signal, sender=cached_model, dispatch_uid=f"{cached_model._meta.label_lower}.queryset_cache.save")
+    signals.post_delete.connect(queryset_cache_invalidation_signal, sender=cached_model, dispatch_uid=f"{cached_model._meta.label_lower}.queryset_cache.delete")
+
+for tiered_model in tiered_models():
+    signals.post_save.connect(object_cache_invalidation_signal, sender=tiered_model, dispatch_uid=f"{tiered_model._meta.label_lower}.object_cache.save")
+    signals.post_delete.connect(object_cache_invalidation_signal, sender=tiered_model, dispatch_uid=f"{tiered_model._meta.label_lower}.object_cache.delete")
@@ -1,4 +1,48 @@
+"""
+Module: nhhc.status
+
+This module contains the health check aggregation behind `/status/`.
+
+The database, cache and storage probes of `health_check` are run on an interval by Celery beat
+(`portal.tasks.refresh_health_snapshot`) and their results are cached as a snapshot, so the endpoint that uptime
+checks and the load balancer hit serves the last result in O(1) instead of probing every backend on every scrape.
+The response carries its freshness in the `Age`, `X-Health-Checked-At` and `X-Health-Source` headers and, for JSON,
+under the body's `freshness` key.
+
+If the snapshot is missing or older than `HEALTH_CHECK_MAX_AGE` (e.g. beat is down), one request re-runs the probes
+while the others keep serving the old snapshot. `?deep=1` (`HEALTH_CHECK_BYPASS_PARAM`) always runs the probes
+synchronously; since every deep check hits each backend, it is only served to staff or to requests carrying
+`HEALTH_CHECK_DEEP_TOKEN` in the `X-Health-Check-Token` header, and refused with a 403 otherwise. Subsets
+(`/status/<subset>/`) are not cached.
+
+Classes:
+- MyHealthCheckBackend: Placeholder for a custom probe.
+- CachedHealthCheckView: The `/status/` view.
+
+Functions:
+- run_probes: Runs every probe and returns the snapshot.
+- refresh_snapshot: Runs every probe and caches the snapshot.
+- current_snapshot: Returns the cached snapshot, refreshing it when missing or too old.
+- may_run_deep_check: Returns True if a request may bypass the snapshot.
+"""
+
+import hmac
+import time
+from typing import Any, Dict, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse, HttpResponseForbidden, JsonResponse
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date
+from django.views.decorators.cache import never_cache
 from health_check.backends import BaseHealthCheckBackend
+from health_check.mixins import CheckMixin
+from health_check.views import MainView
+from loguru import logger
+
+HEALTH_SNAPSHOT_KEY = "healthcheck:snapshot"
+HEALTH_REFRESH_LOCK_KEY = "healthcheck:snapshot:lock"
 
 
 class MyHealthCheckBackend(BaseHealthCheckBackend):
@@ -15,3 +59,116 @@ class MyHealthCheckBackend(BaseHealthCheckBackend):
 
     def identifier(self):
         return self.__class__.__name__
+
+
+def run_probes() -> Dict[str, Any]:
+    """
+    Runs every registered health check probe.
+
+    Returns:
+        Dict[str, Any]: Whether every critical probe passed, when the probes ran, how long they took and each probe's result.
+    """
+    checker = CheckMixin()
+    checked_at = time.time()
+    errors = checker.check()
+    return {
+        "healthy": not errors,
+        "checked_at": checked_at,
+        "duration": round(time.time() - checked_at, 4),
+        "plugins": [
+            {"identifier": identifier, "status": plugin.status, "pretty_status": str(plugin.pretty_status()), "time_taken": plugin.time_taken, "critical": plugin.critical_service}
+            for identifier, plugin in checker.plugins.items()
+        ],
+    }
+
+
+def refresh_snapshot() -> Dict[str, Any]:
+    """
+    Runs every probe and caches the result as the current snapshot.
+
+    Returns:
+        Dict[str, Any]: The snapshot.
+    """
+    snapshot = run_probes()
+    try:
+        cache.set(HEALTH_SNAPSHOT_KEY, snapshot, settings.HEALTH_CHECK_MAX_AGE * 10)
+    except Exception as e:
+        # The cache is one of the probed services; its outage is already part of the snapshot.
+        logger.warning(f"Unable to Cache Health Check Snapshot - {e}")
+    return snapshot
+
+
+def current_snapshot() -> Tuple[Dict[str, Any], str]:
+    """
+    Returns the cached snapshot, re-running the probes when it is missing or older than `HEALTH_CHECK_MAX_AGE`.
+
+    Returns:
+        Tuple[Dict[str, Any], str]: The snapshot and its source, "cache" or "live".
+    """
+    try:
+        snapshot = cache.get(HEALTH_SNAPSHOT_KEY)
+    except Exception as e:
+        logger.warning(f"Unable to Read Health Check Snapshot - {e}")
+        return run_probes(), "live"
+    if snapshot is not None and time.time() - snapshot["checked_at"] <= settings.HEALTH_CHECK_MAX_AGE:
+        return snapshot, "cache"
+    try:
+        locked = cache.add(HEALTH_REFRESH_LOCK_KEY, 1, settings.HEALTH_CHECK_MAX_AGE)
+    except Exception:
+        locked = False
+    if not locked and snapshot is not None:
+        # Another request is refreshing; the old snapshot is the best answer meanwhile.
+        return snapshot, "cache"
+    logger.info("Health Check Snapshot Missing or Expired - Running Probes")
+    try:
+        return refresh_snapshot(), "live"
+    finally:
+        if locked:
+            cache.delete(HEALTH_REFRESH_LOCK_KEY)
+
+
+def may_run_deep_check(request: HttpRequest) -> bool:
+    """
+    Returns True if `request` comes from a staff member or carries the shared `HEALTH_CHECK_DEEP_TOKEN`.
+
+    Args:
+        request (HttpRequest): The status request.
+
+    Returns:
+        bool: Whether the request may run the probes synchronously.
+    """
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated and user.is_staff:
+        return True
+    token = request.headers.get("X-Health-Check-Token", "")
+    return bool(settings.HEALTH_CHECK_DEEP_TOKEN) and hmac.compare_digest(token.encode("utf-8"), settings.HEALTH_CHECK_DEEP_TOKEN.encode("utf-8"))
+
+
+class CachedHealthCheckView(MainView):
+    """
+    Serves the last cached health check snapshot, or runs the probes synchronously when an authorized request gives `?deep=1`.
+    """
+
+    @method_decorator(never_cache)
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        if kwargs.get("subset") is not None:
+            return super().get(request, *args, **kwargs)
+        if request.GET.get(settings.HEALTH_CHECK_BYPASS_PARAM):
+            if not may_run_deep_check(request):
+                logger.warning(f"Refused Unauthorized Deep Health Check From {request.META.get('REMOTE_ADDR')}")
+                return HttpResponseForbidden()
+            snapshot, source = refresh_snapshot(), "live"
+        else:
+            snapshot, source = current_snapshot()
+        age = max(0, int(time.time() - snapshot["checked_at"]))
+        freshness = {"checked_at": http_date(snapshot["checked_at"]), "age": age, "duration": snapshot["duration"], "source": source}
+        status_code = 200 if snapshot["healthy"] else 500
+
+        if request.GET.get("format") == "json" or "application/json" in request.META.get("HTTP_ACCEPT", ""):
+            response = JsonResponse({**{plugin["identifier"]: plugin["pretty_status"] for plugin in snapshot["plugins"]}, "freshness": freshness}, status=status_code)
+        else:
+            response = self.render_to_response({"view": self, "plugins": snapshot["plugins"], "freshness": freshness}, status=status_code)
+        response["Age"] = str(age)
+        response["X-Health-Checked-At"] = freshness["checked_at"]
+        response["X-Health-Source"] = source
+        return response
@@ -26,12 +26,14 @@ from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
 from django.urls import include, path, re_path
 from django.urls.resolvers import RegexPattern, RoutePattern
-from django.views.decorators.cache import cache_page
 from loguru import logger
 from web.sitemaps import StaticViewSitemap
 from django.conf import settings
 from django_require_login.mixins import public
 
+from nhhc.status import CachedHealthCheckView
+from nhhc.utils.stampede import stampede_cache_page
+
 # SECTION - Sitemap
 sitemaps: Dict[str, Sitemap] = {"static": StaticViewSitemap}
 #!SECTION
@@ -136,9 +138,10 @@ handler503: Callable = maintenance_handler
 urlpatterns: List[Union[RoutePattern, RegexPattern]] = [
     path("control-center/defender/", include(defender.urls)),  # defender admin
     path("control-center/", admin.site.urls, name="admin"),
-    re_path(r"^sitemap.xml$\/?", cache_page(60)(sitemaps), {"sitemaps": sitemaps}, name="cached-sitemap"),
+    re_path(r"^sitemap.xml$\/?", stampede_cache_page(60)(sitemaps), {"sitemaps": sitemaps}, name="cached-sitemap"),
     re_path(r"^robots\.txt\/?", include(robots.urls)),
     re_path("", include(django_prometheus.urls), name="metric_scrape"),
+    re_path(r"^status/$", CachedHealthCheckView.as_view(), name="health_check_cached"),
     re_path(r"^status/", include(health_check.urls)),
     path("maintenance/", maintenance_handler, name="maintenance_mode"),
     path("tinymce/", include(tinymce.urls)),
@@ -0,0 +1,266 @@
+"""
+Module: nhhc.utils.benchmarks
+
+This module contains the encryption benchmark suite behind the `benchmark_encryption` management command.
+
+Micro benchmarks measure, for every encrypted field of `Employee`, `ClientInterestSubmission` and
+`EmploymentApplicationModel`:
+- envelope seal / open throughput (AES-GCM under the row's data key, in Python),
+- pgcrypto `pgp_pub_encrypt` / `pgp_pub_decrypt` throughput on the same values, which is what the legacy
+  `sage_encrypt` fields paid per value,
+and, per model, the data key wrap / unwrap throughput (one public-key operation per row).
+
+Macro benchmarks time end-to-end operations: saving an `Employee`, `hire_applicant`, rendering `EmployeeRoster` and
+serializing `all_applicants`.
+
+The suite runs in a throwaway test database (pgcrypto requires PostgreSQL) against a freshly generated GPG key pair, and
+returns a JSON-serializable report that can be diffed against a previous run with `compare`.
+
+Classes:
+- EncryptionBenchmark: Seeds the test database and runs every benchmark.
+
+Functions:
+- generate_key_pair: Generates a throwaway armored GPG key pair.
+- timed: Runs a callable several times and summarizes the timings.
+- compare: Returns the throughput change of every benchmark against a baseline report.
+"""
+
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import django
+import gnupg
+from django.db import connection, models
+from django.test import RequestFactory
+from django.utils import timezone
+from employee.models import Employee
+from employee.views import EmployeeRoster
+from portal.views import all_applicants
+from web.models import ClientInterestSubmission, EmploymentApplicationModel
+
+from nhhc.utils.decryption import UNWRAP_BATCH_SQL, DecryptionEngine
+from nhhc.utils.envelope import generate_data_key, seal, unseal
+from nhhc.utils.fields import EnvelopeEncryptedMixin, EnvelopeKeyField, private_key_params
+
+PGP_ENCRYPT_SQL = "SELECT pgp_pub_encrypt(plaintext, dearmor(%s)) FROM unnest(%s::text[]) AS plaintext"
+PGP_DECRYPT_SQL = "SELECT pgp_pub_decrypt(ciphertext, dearmor(%s)) FROM unnest(%s::bytea[]) AS ciphertext"
+PGP_WRAP_SQL = "SELECT pgp_pub_encrypt_bytea(data_key, dearmor(%s)) FROM unnest(%s::bytea[]) AS data_key"
+BENCHMARKED_MODELS = (Employee, ClientInterestSubmission, EmploymentApplicationModel)
+
+
+def generate_key_pair(key_length: int = 2048) -> Tuple[str, str]:
+    """
+    Generates a throwaway, unprotected RSA key pair in a temporary GnuPG home.
+
+    Args:
+        key_length (int): The RSA modulus size.
+
+    Returns:
+        Tuple[str, str]: The armored public and private keys.
+    """
+    with tempfile.TemporaryDirectory() as home:
+        gpg = gnupg.GPG(gnupghome=home)
+        key = gpg.gen_key(gpg.gen_key_input(key_type="RSA", key_length=key_length, subkey_type="RSA", subkey_length=key_length, name_email="benchmark@nhhc.invalid", no_protection=True))
+        return gpg.export_keys(key.fingerprint), gpg.export_keys(key.fingerprint, secret=True, expect_passphrase=False)
+
+
+def timed(operation: Callable[[], Any], operations: int, repeat: int) -> Dict[str, float]:
+    """
+    Runs `operation` `repeat` times and summarizes the timings.
+
+    Args:
+        operation (Callable[[], Any]): One timed run.
+        operations (int): How many units of work one run performs, for the throughput figure.
+        repeat (int): Number of runs.
+
+    Returns:
+        Dict[str, float]: Best, median and mean seconds per run, and operations per second at the median.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - started)
+    median = statistics.median(timings)
+    return {
+        "operations": operations,
+        "best_seconds": round(min(timings), 6),
+        "median_seconds": round(median, 6),
+        "mean_seconds": round(statistics.fmean(timings), 6),
+        "ops_per_second": round(operations / median, 2) if median else 0.0,
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Returns the throughput change of every benchmark present in both reports.
+
+    Args:
+        report (Dict[str, Any]): The current report.
+        baseline (Dict[str, Any]): A report from a previous run.
+
+    Returns:
+        List[Dict[str, Any]]: One entry per benchmark with both throughputs and the ratio current / baseline.
+    """
+    previous = {result["name"]: result for result in baseline.get("results", [])}
+    changes = []
+    for result in report["results"]:
+        before = previous.get(result["name"])
+        if before and before["ops_per_second"]:
+            changes.append({"name": result["name"], "baseline": before["ops_per_second"], "current": result["ops_per_second"], "ratio": round(result["ops_per_second"] / before["ops_per_second"], 3)})
+    return changes
+
+
+class EncryptionBenchmark:
+    """
+    Seeds the test database and runs the micro and macro encryption benchmarks.
+
+    Must run inside a test database whose connection carries the generated key pair (see the management command).
+
+    Attributes:
+        rows (int): Rows seeded per model, and values per micro benchmark.
+        repeat (int): Runs per benchmark.
+        results (List[Dict[str, Any]]): One entry per benchmark, filled by `run`.
+    """
+
+    def __init__(self, rows: int = 200, repeat: int = 5) -> None:
+        self.rows = max(1, rows)
+        self.repeat = max(1, repeat)
+        self.results: List[Dict[str, Any]] = []
+        self.factory = RequestFactory()
+
+    def record(self, name: str, kind: str, summary: Dict[str, float], **labels: str) -> None:
+        self.results.append({"name": name, "kind": kind, **labels, **summary})
+
+    def _sample(self, field: models.Field, index: int) -> Any:
+        if isinstance(field, models.DateField):
+            return timezone.now().date()
+        if isinstance(field, models.EmailField):
+            return f"person{index}@example.com"
+        if field.choices:
+            return field.choices[index % len(field.choices)][0]
+        return f"{field.name.replace('_', ' ').title()} {index}"
+
+    def seed(self) -> None:
+        """Creates `rows` rows of every benchmarked model, plus the reviewer used by `hire_applicant`."""
+        self.reviewer = Employee.objects.create_user(username="benchmark.reviewer", password="benchmark", first_name="Bench", last_name="Reviewer", is_superuser=True, is_staff=True)
+        for index in range(self.rows):
+            Employee.objects.create(username=f"benchmark.{index}", **{field.name: self._sample(field, index) for field in self._envelope_fields(Employee)})
+            ClientInterestSubmission.objects.create(contact_number="+13125550100", **{field.name: self._sample(field, index) for field in self._envelope_fields(ClientInterestSubmission)})
+            self._create_application(index)
+
+    def _create_application(self, index: int) -> EmploymentApplicationModel:
+        return EmploymentApplicationModel.objects.create(
+            contact_number="+13125550100",
+            state="IL",
+            zipcode="60601",
+            mobility=EmploymentApplicationModel.MOBILITTY.values[0],
+            prior_experience=EmploymentApplicationModel.PRIOREXPERIENCE.values[0],
+            **{field.name: self._sample(field, index) for field in self._envelope_fields(EmploymentApplicationModel)},
+        )
+
+    @staticmethod
+    def _envelope_fields(model: type[models.Model]) -> List[models.Field]:
+        return [field for field in model._meta.concrete_fields if isinstance(field, EnvelopeEncryptedMixin)]
+
+    def _execute(self, sql: str, params: List[Any]) -> List[Tuple]:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def run_micro(self) -> None:
+        """Benchmarks every encrypted field (envelope and pgcrypto) and every model's data key."""
+        public_key = connection.settings_dict["ENCRYPT_PUBLIC_KEY"]
+        private_key = private_key_params(connection)[-1]
+        for model in BENCHMARKED_MODELS:
+            label = model._meta.label
+            data_key = generate_data_key()
+            for field in self._envelope_fields(model):
+                plaintexts = [str(field.get_prep_value(self._sample(field, index))) for index in range(self.rows)]
+                associated_data = field.associated_data
+                sealed = [seal(data_key, plaintext, associated_data, compress=field.compress) for plaintext in plaintexts]
+                ciphertexts = [bytes(row[0]) for row in self._execute(PGP_ENCRYPT_SQL, [public_key, plaintexts])]
+                name = f"{label}.{field.name}"
+                self.record(
+                    f"{name}:envelope_seal",
+                    "micro",
+                    timed(lambda: [seal(data_key, plaintext, associated_data, compress=field.compress) for plaintext in plaintexts], self.rows, self.repeat),
+                    model=label,
+                    field=field.name,
+                )
+                self.record(f"{name}:envelope_open", "micro", timed(lambda: [unseal(data_key, value, associated_data) for value in sealed], self.rows, self.repeat), model=label, field=field.name)
+                self.record(f"{name}:pgp_encrypt", "micro", timed(lambda: self._execute(PGP_ENCRYPT_SQL, [public_key, plaintexts]), self.rows, self.repeat), model=label, field=field.name)
+                self.record(f"{name}:pgp_decrypt", "micro", timed(lambda: self._execute(PGP_DECRYPT_SQL, [private_key, ciphertexts]), self.rows, self.repeat), model=label, field=field.name)
+            data_keys = [generate_data_key() for _ in range(self.rows)]
+            key_field = next(field for field in model._meta.concrete_fields if isinstance(field, EnvelopeKeyField))
+            wrapped = list(model._default_manager.values_list(key_field.attname, flat=True)[: self.rows])
+            self.record(f"{label}.{key_field.name}:wrap", "micro", timed(lambda: self._execute(PGP_WRAP_SQL, [public_key, data_keys]), self.rows, self.repeat), model=label, field=key_field.name)
+            self.record(
+                f"{label}.{key_field.name}:unwrap",
+                "micro",
+                timed(lambda: DecryptionEngine(workers=1).decrypt(wrapped, sql=UNWRAP_BATCH_SQL), len(wrapped), self.repeat),
+                model=label,
+                field=key_field.name,
+            )
+
+    def run_macro(self) -> None:
+        """Times saves, `hire_applicant`, the `EmployeeRoster` render and the `all_applicants` export end to end."""
+        counter = iter(range(self.rows, self.rows + self.rows * self.repeat * 2))
+
+        def save_employee():
+            index = next(counter)
+            Employee.objects.create(username=f"benchmark.{index}", **{field.name: self._sample(field, index) for field in self._envelope_fields(Employee)})
+
+        def hire():
+            self._create_application(next(counter)).hire_applicant(hired_by=self.reviewer)
+
+        def render_roster():
+            request = self.factory.get("/employee/roster/")
+            request.user = self.reviewer
+            EmployeeRoster.as_view()(request).render()
+
+        def export_applicants():
+            request = self.factory.get("/portal/all_applicants")
+            request.user = self.reviewer
+            # The export streams: its rows are only queried, decrypted and encoded as the body is consumed.
+            for _ in all_applicants(request).streaming_content:
+                pass
+
+        self.record("employee:save", "macro", timed(save_employee, 1, self.repeat))
+        self.record("application:hire_applicant", "macro", timed(hire, 1, self.repeat))
+        self.record("employee_roster:render", "macro", timed(render_roster, Employee.objects.count(), self.repeat))
+        self.record("all_applicants:serialize", "macro", timed(export_applicants, EmploymentApplicationModel.objects.count(), self.repeat))
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Seeds the database and runs every benchmark.
+
+        Returns:
+            Dict[str, Any]: The report: environment metadata plus one result per benchmark.
+        """
+        self.seed()
+        self.run_micro()
+        self.run_macro()
+        return {"metadata": self.metadata(), "results": self.results}
+
+    def metadata(self) -> Dict[str, Any]:
+        return {
+            "commit": _git_commit(),
+            "timestamp": timezone.now().isoformat(),
+            "database": f"{connection.vendor} {getattr(connection, 'pg_version', '')}".strip(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "rows": self.rows,
+            "repeat": self.repeat,
+        }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
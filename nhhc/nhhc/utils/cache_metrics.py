@@ -0,0 +1,221 @@
+"""
+Module: nhhc.utils.cache_metrics
+
+This module contains InstrumentedCache, a cache backend that wraps the configured backend (django-redis in
+production) and reports how effectively each family of keys is cached, so TTLs can be tuned from data.
+
+Every key is classified into a family by its prefix (see `KEY_FAMILIES`): `page`, `queryset`, `session`,
+`object`, `fragment`, `feed`, `display`, `stats`, `healthcheck`, `lock` or `other`. Per cache alias and family it records:
+- `cache_lookups_total`: reads by result (`hit` / `miss`), including every key of `get_many`.
+- `cache_operation_seconds`: latency of every operation (`get`, `set`, `add`, `delete`, `incr`, ...).
+- `cache_payload_bytes`: the pickled size of written values, measured on a sample of writes
+  (`CACHE_METRICS_PAYLOAD_SAMPLE_RATE`) since pickling a value twice is not free.
+Evictions happen inside Redis and cannot be attributed to a key, so `RedisStatsCollector` exports the server's
+`evicted_keys`, `expired_keys`, `keyspace_hits` and `keyspace_misses` counters per alias at scrape time.
+
+The metrics live in the default Prometheus registry and are served by the existing `django_prometheus` endpoint.
+Attributes the wrapper does not instrument (e.g. django-redis' `client`, `lock` or `ttl`) are delegated unchanged.
+
+Classes:
+- InstrumentedCache: The instrumented backend wrapper.
+- RedisStatsCollector: Prometheus collector of Redis' eviction and keyspace statistics.
+
+Functions:
+- key_family: Returns the family of a cache key.
+
+Usage:
+    CACHES = {
+        "default": {
+            "BACKEND": "nhhc.utils.cache_metrics.InstrumentedCache",
+            "WRAPPED_BACKEND": "django_redis.cache.RedisCache",
+            "ALIAS": "default",
+            ...
+        }
+    }
+"""
+
+import pickle
+import random
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from loguru import logger
+from prometheus_client import REGISTRY, Counter, Histogram
+from prometheus_client.core import CounterMetricFamily
+
+KEY_FAMILIES: Tuple[Tuple[str, str], ...] = (
+    ("qs:", "queryset"),
+    ("qs-generation:", "queryset"),
+    ("object:", "object"),
+    ("fragment:", "fragment"),
+    ("announcement-feed:", "feed"),
+    ("display:", "display"),
+    ("stats:", "stats"),
+    ("django.contrib.sessions.cache", "session"),
+    ("djangohealth", "healthcheck"),
+    ("healthcheck", "healthcheck"),
+)
+PAGE_KEY_MARKERS = (".cache_page.", ".cache_header.")
+LOCK_SUFFIX = ":lock"
+
+cache_lookups = Counter("cache_lookups", "Cache reads by key family and result.", ["cache", "family", "result"])
+cache_operation_seconds = Histogram(
+    "cache_operation_seconds",
+    "Latency of cache operations by key family.",
+    ["cache", "family", "operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+cache_payload_bytes = Histogram(
+    "cache_payload_bytes",
+    "Pickled size of values written to the cache, by key family.",
+    ["cache", "family"],
+    buckets=(64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+)
+
+
+def key_family(key: Any) -> str:
+    """
+    Returns the family of a cache key, before the backend adds its prefix and version.
+
+    Args:
+        key (Any): The key as passed to the cache.
+
+    Returns:
+        str: The family name, "other" when no family matches.
+    """
+    key = str(key)
+    if key.endswith(LOCK_SUFFIX):
+        return "lock"
+    if any(marker in key for marker in PAGE_KEY_MARKERS):
+        return "page"
+    for prefix, family in KEY_FAMILIES:
+        if key.startswith(prefix):
+            return family
+    return "other"
+
+
+class RedisStatsCollector:
+    """
+    Collects the eviction and keyspace counters of the Redis servers behind the instrumented caches at scrape time.
+    """
+
+    STATS = ("evicted_keys", "expired_keys", "keyspace_hits", "keyspace_misses")
+
+    def __init__(self) -> None:
+        self.caches: Dict[str, "InstrumentedCache"] = {}
+
+    def collect(self) -> Iterator[CounterMetricFamily]:
+        families = {stat: CounterMetricFamily(f"cache_redis_{stat}", f"Redis INFO {stat} of the server behind the cache.", labels=["cache"]) for stat in self.STATS}
+        for alias, instrumented in list(self.caches.items()):
+            client = getattr(instrumented._cache, "client", None)
+            if client is None:
+                continue
+            try:
+                info = client.get_client(write=False).info("stats")
+            except Exception as e:
+                logger.warning(f"Unable to Read Redis Stats of the {alias} Cache - {e}")
+                continue
+            for stat, family in families.items():
+                family.add_metric([alias], info.get(stat, 0))
+        yield from families.values()
+
+
+redis_stats = RedisStatsCollector()
+REGISTRY.register(redis_stats)
+
+
+class InstrumentedCache:
+    """
+    Cache backend that delegates to `params["WRAPPED_BACKEND"]` and records Prometheus metrics per key family.
+
+    Attributes:
+        alias (str): The `cache` label of the metrics, `params["ALIAS"]`.
+    """
+
+    def __init__(self, location: str, params: Dict[str, Any]) -> None:
+        params = dict(params)
+        self.alias = params.pop("ALIAS", "default")
+        self._cache = import_string(params.pop("WRAPPED_BACKEND"))(location, params)
+        redis_stats.caches[self.alias] = self
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cache, name)
+
+    def __contains__(self, key: Any) -> bool:
+        return self.has_key(key)
+
+    def _timed(self, operation: str, key: Any, call, *args, **kwargs) -> Any:
+        started = time.perf_counter()
+        try:
+            return call(*args, **kwargs)
+        finally:
+            cache_operation_seconds.labels(self.alias, key_family(key), operation).observe(time.perf_counter() - started)
+
+    def _record_payload(self, key: Any, value: Any) -> None:
+        if random.random() >= settings.CACHE_METRICS_PAYLOAD_SAMPLE_RATE:
+            return
+        try:
+            cache_payload_bytes.labels(self.alias, key_family(key)).observe(len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)))
+        except Exception:
+            pass
+
+    def get(self, key: Any, default: Any = None, version: Any = None) -> Any:
+        missing = object()
+        value = self._timed("get", key, self._cache.get, key, missing, version=version)
+        cache_lookups.labels(self.alias, key_family(key), "miss" if value is missing else "hit").inc()
+        return default if value is missing else value
+
+    def get_many(self, keys: Iterable[Any], version: Any = None) -> Dict[Any, Any]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        found = self._timed("get_many", keys[0], self._cache.get_many, keys, version=version)
+        for key in keys:
+            cache_lookups.labels(self.alias, key_family(key), "hit" if key in found else "miss").inc()
+        return found
+
+    def get_or_set(self, key: Any, default: Any, timeout: Any = None, version: Any = None) -> Any:
+        # Composed of the instrumented get / add, so both the lookup and the write are recorded.
+        missing = object()
+        value = self.get(key, missing, version=version)
+        if value is missing:
+            value = default() if callable(default) else default
+            if value is None:
+                return None
+            self.add(key, value, timeout=timeout, version=version)
+            return self.get(key, value, version=version)
+        return value
+
+    def set(self, key: Any, value: Any, timeout: Any = None, version: Any = None, **kwargs) -> Any:
+        self._record_payload(key, value)
+        return self._timed("set", key, self._cache.set, key, value, timeout=timeout, version=version, **kwargs)
+
+    def add(self, key: Any, value: Any, timeout: Any = None, version: Any = None, **kwargs) -> bool:
+        self._record_payload(key, value)
+        return self._timed("add", key, self._cache.add, key, value, timeout=timeout, version=version, **kwargs)
+
+    def set_many(self, data: Dict[Any, Any], timeout: Any = None, version: Any = None, **kwargs) -> List[Any]:
+        for key, value in data.items():
+            self._record_payload(key, value)
+        return self._timed("set_many", next(iter(data), ""), self._cache.set_many, data, timeout=timeout, version=version, **kwargs)
+
+    def touch(self, key: Any, timeout: Any = None, version: Any = None) -> bool:
+        return self._timed("touch", key, self._cache.touch, key, timeout=timeout, version=version)
+
+    def delete(self, key: Any, version: Any = None, **kwargs) -> Any:
+        return self._timed("delete", key, self._cache.delete, key, version=version, **kwargs)
+
+    def delete_many(self, keys: Iterable[Any], version: Any = None) -> Any:
+        keys = list(keys)
+        return self._timed("delete_many", keys[0] if keys else "", self._cache.delete_many, keys, version=version)
+
+    def has_key(self, key: Any, version: Any = None) -> bool:
+        return self._timed("has_key", key, self._cache.has_key, key, version=version)
+
+    def incr(self, key: Any, delta: int = 1, version: Any = None, **kwargs) -> int:
+        return self._timed("incr", key, self._cache.incr, key, delta, version=version, **kwargs)
+
+    def decr(self, key: Any, delta: int = 1, version: Any = None, **kwargs) -> int:
+        return self._timed("decr", key, self._cache.decr, key, delta, version=version, **kwargs)
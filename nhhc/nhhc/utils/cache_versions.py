@@ -0,0 +1,120 @@
+"""
+Module: nhhc.utils.cache_versions
+
+This module contains deploy-versioned cache keys, so a deploy no longer needs to flush Redis.
+
+`make_key` is the `KEY_FUNCTION` of the `default` cache. It inserts the key's family (see
+`nhhc.utils.cache_metrics.key_family`) and that family's schema version between the prefix and Django's version:
+
+    NHHC-NATIVE:<family>.<schema>:<version>:<key>
+
+A family's schema is `CACHE_SCHEMA_VERSIONS[family]`. Families listed in `CACHE_BUILD_FAMILIES`, the ones that hold
+rendered templates (pages and fragments), also carry `CACHE_BUILD_ID`, so every deploy renders them afresh. Every
+other family keeps its warm entries across deploys until its schema version is bumped, e.g. after changing the
+columns of a model whose rows are cached as tuples (`object`, `display`, `queryset`).
+
+Entries of retired versions are never read again. Most expire with their TTL; the ones stored without a timeout
+(generations) are removed by `prune_stale_keys`, which scans the cache in the background
+(`portal.tasks.prune_stale_cache_versions`) instead of flushing it at deploy time.
+
+Functions:
+- family_schema: Returns the current schema segment of a family.
+- make_key: The cache KEY_FUNCTION.
+- prune_stale_keys: Deletes entries of retired schema versions.
+
+Usage:
+    CACHES = {"default": {..., "KEY_PREFIX": "NHHC-NATIVE", "KEY_FUNCTION": "nhhc.utils.cache_versions.make_key"}}
+
+    CACHE_SCHEMA_VERSIONS["object"] += 1  # in settings, after changing Employee's columns
+"""
+
+from itertools import chain
+from typing import Any, Optional
+
+from django.conf import settings
+from loguru import logger
+
+from nhhc.utils.cache_metrics import key_family
+
+PRUNE_BATCH_SIZE = 500
+
+
+def family_schema(family: str) -> str:
+    """
+    Returns the schema segment of `family`: its schema version, suffixed with the build id for build families.
+
+    Args:
+        family (str): The key family.
+
+    Returns:
+        str: e.g. "queryset.1" or "page.1-3f9c2ab".
+    """
+    schema = f"{family}.{settings.CACHE_SCHEMA_VERSIONS.get(family, 1)}"
+    return f"{schema}-{settings.CACHE_BUILD_ID}" if family in settings.CACHE_BUILD_FAMILIES else schema
+
+
+def make_key(key: Any, key_prefix: str, version: Any) -> str:
+    """
+    Builds the full cache key of `key`, versioned by its family's schema.
+
+    Args:
+        key (Any): The key as passed to the cache.
+        key_prefix (str): The cache's KEY_PREFIX.
+        version (Any): Django's cache version.
+
+    Returns:
+        str: The key stored in Redis.
+    """
+    return f"{key_prefix}:{family_schema(key_family(key))}:{version}:{key}"
+
+
+def _is_current(stored_key: str, key_prefix: str) -> bool:
+    parts = stored_key.split(":", 3)
+    if len(parts) < 4 or parts[0] != key_prefix:
+        return False
+    # Keys are classified by their original name, so a retired schema of any family is detected the same way.
+    return parts[1] == family_schema(key_family(parts[3]))
+
+
+def _redis_client(alias: str):
+    try:
+        from django_redis import get_redis_connection
+
+        return get_redis_connection(alias)
+    except (ImportError, NotImplementedError, AttributeError):
+        return None
+
+
+def prune_stale_keys(alias: str = "default", batch_size: int = PRUNE_BATCH_SIZE, dry_run: bool = False) -> Optional[int]:
+    """
+    Deletes every entry of the `alias` cache whose schema segment is not current, including the unversioned keys written before versioning.
+
+    The keyspace is walked with SCAN and deleted with UNLINK in batches, so Redis is never blocked.
+
+    Args:
+        alias (str): The cache alias.
+        batch_size (int): Keys per SCAN page and per UNLINK.
+        dry_run (bool): Only count the stale keys.
+
+    Returns:
+        Optional[int]: The number of stale keys, or None when the cache is not backed by Redis.
+    """
+    client = _redis_client(alias)
+    if client is None:
+        return None
+    key_prefix = settings.CACHES[alias].get("KEY_PREFIX", "")
+    stale = []
+    pruned = 0
+    # Only this cache's keys and the unprefixed ":<version>:" keys of before versioning are considered; anything else sharing the database is left alone.
+    for raw in chain(client.scan_iter(match=f"{key_prefix}:*", count=batch_size), client.scan_iter(match=":[0-9]*:*", count=batch_size)):
+        stored_key = raw.decode("utf-8", "replace") if isinstance(raw, bytes) else raw
+        if _is_current(stored_key, key_prefix):
+            continue
+        stale.append(raw)
+        if len(stale) >= batch_size:
+            pruned += len(stale) if dry_run else client.unlink(*stale)
+            stale = []
+    if stale:
+        pruned += len(stale) if dry_run else client.unlink(*stale)
+    logger.info(f"{'Found' if dry_run else 'Pruned'} {pruned} Stale Cache Keys in the {alias} Cache")
+    return pruned
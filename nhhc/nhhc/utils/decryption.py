@@ -0,0 +1,440 @@
+"""
+Module: nhhc.utils.decryption
+
+This module contains a batched decryption engine for the `sage_encrypt` asymmetric fields used across the project.
+
+`sage_encrypt` wraps every encrypted column in a `pgp_pub_decrypt(...)` call inside the SELECT, so a list view pays one
+public-key operation per row, per column. The engine in this module instead selects the stored ciphertext untouched,
+de-duplicates it, and decrypts all of it in a handful of `unnest()` round trips (optionally spread across a pool of
+worker connections so Postgres can use more than one core). Plaintexts are held in a bounded LRU that lives for the
+duration of a single request, so the same ciphertext is never decrypted twice during one render.
+
+Models in the envelope storage mode (see `nhhc.utils.fields`) only hold one public-key ciphertext per row: the wrapped
+data key. Asking the engine for any envelope-encrypted field batch-unwraps those keys instead (and batch-decrypts any
+values still holding `sage_encrypt` ciphertext); the sealed fields are then opened in Python by their descriptors.
+Bulk exports can instead open every sealed field up front across a process pool (`open_parallel`), which is opt-in
+through `EXPORT_DECRYPTION_PROCESSES`.
+
+Classes:
+- Ciphertext: Query expression selecting an encrypted column as raw `bytea`.
+- PlaintextLRU: Bounded, thread-safe ciphertext -> plaintext cache.
+- DecryptionEngine: Batches, de-duplicates and decrypts ciphertexts for querysets and model instances.
+- BatchDecryptionMixin: ListView mixin that decrypts the rendered page through the request's engine.
+- BatchDecryptionChangeList / BatchDecryptionAdminMixin: The same for admin change lists.
+
+Functions:
+- encrypted_fields: Returns the public-key encrypted fields of a model.
+- for_request: Returns (creating if needed) the DecryptionEngine bound to a request.
+- export_pool: Returns the process pool shared by bulk exports.
+
+Usage:
+    engine = for_request(request)
+    employees = engine.decrypt_queryset(Employee.objects.filter(is_active=True), fields=["first_name", "last_name"])
+"""
+
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from django.conf import settings
+from django.contrib.admin.views.main import ChangeList
+from django.db import connections, models
+from django.db.models import F, QuerySet
+from django.db.models.expressions import Col, Expression
+from django.http import HttpRequest
+from loguru import logger
+from sage_encrypt.mixins.encrypt import EncryptAsymmetricMixin
+
+from nhhc.utils.envelope import is_sealed, unseal_many
+from nhhc.utils.fields import PRIVATE_KEY_SQL, EnvelopeEncryptedMixin, EnvelopeKeyField, StoredValue, WrappedKey, envelope_data_key, private_key_params, sort_within_buckets
+
+DECRYPT_BATCH_SQL = f"SELECT ciphertext, pgp_pub_decrypt(ciphertext, {PRIVATE_KEY_SQL.format(ciphertext='ciphertext')}) FROM unnest(%s::bytea[]) AS ciphertext"
+UNWRAP_BATCH_SQL = f"SELECT ciphertext, pgp_pub_decrypt_bytea(ciphertext, {PRIVATE_KEY_SQL.format(ciphertext='ciphertext')}) FROM unnest(%s::bytea[]) AS ciphertext"
+CIPHERTEXT_SUFFIX = "_ciphertext"
+
+_export_pool: Optional[ProcessPoolExecutor] = None
+_export_pool_lock = Lock()
+
+
+def encrypted_fields(model: type[models.Model]) -> List[models.Field]:
+    """
+    Returns the concrete fields of a model that hold public-key ciphertext: `sage_encrypt` asymmetric fields and envelope data keys.
+
+    Args:
+        model (type[models.Model]): The model class to inspect.
+
+    Returns:
+        List[models.Field]: The encrypted fields, in declaration order.
+    """
+    return [field for field in model._meta.concrete_fields if isinstance(field, (EncryptAsymmetricMixin, EnvelopeKeyField))]
+
+
+class Ciphertext(Expression):
+    """
+    Query expression that selects an encrypted column exactly as it is stored.
+
+    Resolving an `F()` reference to a `sage_encrypt` field yields a `DecryptedCol`, which wraps the column in
+    `pgp_pub_decrypt`. This expression resolves the reference the same way and swaps the result for a plain `Col`
+    so the database returns the `bytea` ciphertext without paying for the decryption.
+    """
+
+    def __init__(self, field_name: str) -> None:
+        super().__init__(output_field=models.BinaryField())
+        self.field_name = field_name
+
+    def resolve_expression(self, query=None, allow_joins=True, reuse=None, summarize=False, for_save=False) -> Col:
+        resolved = F(self.field_name).resolve_expression(query, allow_joins, reuse, summarize, for_save)
+        return Col(resolved.alias, resolved.target, output_field=models.BinaryField())
+
+
+class PlaintextLRU:
+    """
+    Bounded, thread-safe mapping of ciphertext to plaintext with least-recently-used eviction.
+
+    Attributes:
+        maxsize (int): The maximum number of plaintexts held at once.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that required decryption.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, Optional[str]] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, ciphertext: bytes) -> bool:
+        return ciphertext in self._entries
+
+    def get(self, ciphertext: bytes) -> Optional[str]:
+        with self._lock:
+            self._entries.move_to_end(ciphertext)
+            return self._entries[ciphertext]
+
+    def set(self, ciphertext: bytes, plaintext: Optional[str]) -> None:
+        with self._lock:
+            self._entries[ciphertext] = plaintext
+            self._entries.move_to_end(ciphertext)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+class DecryptionEngine:
+    """
+    Decrypts `sage_encrypt` ciphertexts in batches instead of one `pgp_pub_decrypt` per row and column.
+
+    Attributes:
+        using (str): The database alias used to run the decryption queries.
+        workers (int): Number of worker connections used when more than one chunk needs decrypting.
+        chunk_size (int): Maximum number of ciphertexts sent to the database in one round trip.
+        cache (PlaintextLRU): The plaintexts decrypted so far by this engine.
+    """
+
+    def __init__(self, using: str = "default", workers: Optional[int] = None, chunk_size: Optional[int] = None, cache_size: Optional[int] = None) -> None:
+        self.using = using
+        self.workers = max(1, workers or settings.DECRYPTION_WORKERS)
+        self.chunk_size = max(1, chunk_size or settings.DECRYPTION_CHUNK_SIZE)
+        self.cache = PlaintextLRU(cache_size or settings.DECRYPTION_CACHE_SIZE)
+
+    def _decrypt_chunk(self, chunk: Sequence[bytes], sql: str = DECRYPT_BATCH_SQL, close_connection: bool = False) -> Dict[bytes, str]:
+        """
+        Decrypts one chunk of ciphertexts in a single round trip.
+
+        Args:
+            chunk (Sequence[bytes]): The ciphertexts to decrypt.
+            sql (str): The batch statement to run. `UNWRAP_BATCH_SQL` for envelope data keys.
+            close_connection (bool): Close the thread's connection afterwards. Set for pool workers, which otherwise leak connections.
+
+        Returns:
+            Dict[bytes, str]: Plaintext keyed by ciphertext.
+        """
+        connection = connections[self.using]
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [*private_key_params(connection), list(chunk)])
+                return {bytes(ciphertext): bytes(plaintext) if isinstance(plaintext, memoryview) else plaintext for ciphertext, plaintext in cursor.fetchall()}
+        finally:
+            if close_connection:
+                connection.close()
+
+    def decrypt(self, ciphertexts: Iterable[Optional[bytes]], sql: str = DECRYPT_BATCH_SQL) -> Dict[bytes, Optional[str]]:
+        """
+        Decrypts a collection of ciphertexts, skipping duplicates and anything already in the cache.
+
+        Args:
+            ciphertexts (Iterable[Optional[bytes]]): The raw ciphertexts. `None` values are ignored.
+            sql (str): The batch statement to run. `UNWRAP_BATCH_SQL` for envelope data keys.
+
+        Returns:
+            Dict[bytes, Optional[str]]: Plaintext keyed by ciphertext for every non-null input.
+        """
+        unique = {bytes(ciphertext) for ciphertext in ciphertexts if ciphertext is not None}
+        results: Dict[bytes, Optional[str]] = {ciphertext: self.cache.get(ciphertext) for ciphertext in unique if ciphertext in self.cache}
+        misses = [ciphertext for ciphertext in unique if ciphertext not in results]
+        self.cache.hits += len(results)
+        self.cache.misses += len(misses)
+
+        if misses:
+            chunks = [misses[start : start + self.chunk_size] for start in range(0, len(misses), self.chunk_size)]
+            if self.workers > 1 and len(chunks) > 1:
+                with ThreadPoolExecutor(max_workers=min(self.workers, len(chunks))) as pool:
+                    decrypted_chunks = list(pool.map(lambda chunk: self._decrypt_chunk(chunk, sql, close_connection=True), chunks))
+            else:
+                decrypted_chunks = [self._decrypt_chunk(chunk, sql) for chunk in chunks]
+            for decrypted in decrypted_chunks:
+                for ciphertext, plaintext in decrypted.items():
+                    self.cache.set(ciphertext, plaintext)
+                    results[ciphertext] = plaintext
+            logger.debug(f"Decrypted {len(misses)} Ciphertexts in {len(chunks)} Batch(es) - {len(unique) - len(misses)} Served From Cache")
+        return results
+
+    def _resolve_fields(self, model: type[models.Model], fields: Optional[Iterable[str]]) -> List[models.Field]:
+        candidates = encrypted_fields(model)
+        if fields is None:
+            return candidates
+        wanted = set(fields)
+        # Envelope-encrypted fields are opened in Python, so what needs decrypting for them is the row's data key.
+        if any(isinstance(field, EnvelopeEncryptedMixin) and (field.name in wanted or field.attname in wanted) for field in model._meta.concrete_fields):
+            wanted.update(field.name for field in candidates if isinstance(field, EnvelopeKeyField))
+        return [field for field in candidates if field.name in wanted or field.attname in wanted]
+
+    def prepare(self, queryset: QuerySet, fields: Optional[Iterable[str]] = None) -> QuerySet:
+        """
+        Returns a lazy copy of `queryset` that defers every encrypted column and annotates the raw ciphertext of `fields`.
+
+        The result can be sliced and paginated as usual; pass the evaluated rows to `decrypt_instances`.
+
+        Args:
+            queryset (QuerySet): The queryset to prepare.
+            fields (Optional[Iterable[str]]): The encrypted fields to fetch ciphertext for. Defaults to all of them.
+
+        Returns:
+            QuerySet: The prepared queryset.
+        """
+        deferred = [field.attname for field in encrypted_fields(queryset.model)]
+        annotations = {f"{field.attname}{CIPHERTEXT_SUFFIX}": Ciphertext(field.name) for field in self._resolve_fields(queryset.model, fields)}
+        return queryset.defer(*deferred).annotate(**annotations)
+
+    def decrypt_instances(self, instances: Iterable[models.Model], fields: Optional[Iterable[str]] = None) -> List[models.Model]:
+        """
+        Fills in the plaintext of `fields` on instances loaded from a queryset returned by `prepare`.
+
+        Args:
+            instances (Iterable[models.Model]): The evaluated rows.
+            fields (Optional[Iterable[str]]): The encrypted fields to decrypt. Must match the fields given to `prepare`.
+
+        Returns:
+            List[models.Model]: The same instances, with the plaintext set as if it had been loaded normally.
+        """
+        instances = list(instances)
+        if not instances:
+            return instances
+        targets = self._resolve_fields(type(instances[0]), fields)
+        plaintexts: Dict[bytes, Optional[str]] = {}
+        for sql, group in (
+            (DECRYPT_BATCH_SQL, [field for field in targets if not isinstance(field, EnvelopeKeyField)]),
+            (UNWRAP_BATCH_SQL, [field for field in targets if isinstance(field, EnvelopeKeyField)]),
+        ):
+            if group:
+                plaintexts.update(self.decrypt((_ciphertext_of(instance, field) for instance in instances for field in group), sql))
+        for instance in instances:
+            for field in targets:
+                ciphertext = _ciphertext_of(instance, field)
+                plaintext = None if ciphertext is None else plaintexts[bytes(ciphertext)]
+                instance.__dict__[field.attname] = field.to_python(plaintext)
+        self._decrypt_legacy_values(instances, fields)
+        return instances
+
+    def _decrypt_legacy_values(self, instances: List[models.Model], fields: Optional[Iterable[str]]) -> None:
+        """
+        Batch-decrypts envelope-encrypted fields whose column still holds `sage_encrypt` ciphertext, which their
+        descriptors would otherwise decrypt one query at a time.
+        """
+        wanted = None if fields is None else set(fields)
+        envelope_fields = [
+            field for field in type(instances[0])._meta.concrete_fields if isinstance(field, EnvelopeEncryptedMixin) and (wanted is None or field.name in wanted or field.attname in wanted)
+        ]
+        legacy = [
+            (instance, field)
+            for instance in instances
+            for field in envelope_fields
+            if isinstance(instance.__dict__.get(field.attname), StoredValue) and not is_sealed(instance.__dict__[field.attname])
+        ]
+        if not legacy:
+            return
+        plaintexts = self.decrypt(instance.__dict__[field.attname] for instance, field in legacy)
+        for instance, field in legacy:
+            instance.__dict__[field.attname] = field.to_python(plaintexts[bytes(instance.__dict__[field.attname])])
+
+    def decrypt_queryset(self, queryset: QuerySet, fields: Optional[Iterable[str]] = None) -> List[models.Model]:
+        """
+        Evaluates `queryset` and decrypts `fields` on every row in batches.
+
+        Args:
+            queryset (QuerySet): The queryset to evaluate. Must not be sliced.
+            fields (Optional[Iterable[str]]): The encrypted fields to decrypt. Defaults to all of them.
+
+        Returns:
+            List[models.Model]: The decrypted instances in queryset order.
+        """
+        return self.decrypt_instances(self.prepare(queryset, fields), fields)
+
+    def open_parallel(self, instances: List[models.Model], fields: Optional[Iterable[str]] = None) -> List[models.Model]:
+        """
+        Opens the sealed envelope fields of `instances` up front, in chunks spread across the export process pool.
+
+        The instances must come from `decrypt_instances`, so their data keys are already unwrapped. Plaintexts are
+        written back in place, so the rows keep their order. Without `EXPORT_DECRYPTION_PROCESSES`, or when everything
+        fits in one chunk, the chunks are opened in this process.
+
+        Args:
+            instances (List[models.Model]): The decrypted rows.
+            fields (Optional[Iterable[str]]): The envelope fields to open. Defaults to all of them.
+
+        Returns:
+            List[models.Model]: The same instances, with every sealed field opened.
+        """
+        if not instances:
+            return instances
+        wanted = None if fields is None else set(fields)
+        envelope_fields = [
+            field for field in type(instances[0])._meta.concrete_fields if isinstance(field, EnvelopeEncryptedMixin) and (wanted is None or field.name in wanted or field.attname in wanted)
+        ]
+        targets = [
+            (instance, field) for instance in instances for field in envelope_fields if isinstance(instance.__dict__.get(field.attname), StoredValue) and is_sealed(instance.__dict__[field.attname])
+        ]
+        items = [(envelope_data_key(instance), bytes(instance.__dict__[field.attname]), field.associated_data) for instance, field in targets]
+        chunk_size = max(1, settings.EXPORT_DECRYPTION_CHUNK_SIZE)
+        chunks = [items[start : start + chunk_size] for start in range(0, len(items), chunk_size)]
+        processes = settings.EXPORT_DECRYPTION_PROCESSES
+        opened = None
+        if processes > 1 and len(chunks) > 1:
+            try:
+                opened = list(chain.from_iterable(export_pool(processes).map(unseal_many, chunks)))
+            except BrokenProcessPool:
+                logger.warning("Export Decryption Pool Is Broken - Opening Values In-Process")
+                _reset_export_pool()
+        if opened is None:
+            opened = list(chain.from_iterable(map(unseal_many, chunks)))
+        for (instance, field), plaintext in zip(targets, opened):
+            instance.__dict__[field.attname] = field.to_python(plaintext)
+        return instances
+
+
+def _ciphertext_of(instance: models.Model, field: models.Field) -> Optional[bytes]:
+    """Returns the ciphertext `prepare` annotated for `field`, or the still-wrapped data key of rows loaded without `prepare` (e.g. through `select_related`)."""
+    ciphertext = getattr(instance, f"{field.attname}{CIPHERTEXT_SUFFIX}", None)
+    if ciphertext is None and isinstance(instance.__dict__.get(field.attname), WrappedKey):
+        return bytes(instance.__dict__[field.attname])
+    return ciphertext
+
+
+def export_pool(processes: int) -> ProcessPoolExecutor:
+    """
+    Returns the process pool shared by bulk exports, creating it on first use.
+
+    The workers are spawned rather than forked: a fork of a threaded web worker can inherit locks held by other threads
+    and the parent's open database and cache connections. Spawned workers only import `nhhc.utils.envelope` to run
+    `unseal_many`, so they need no Django setup; the pool is created once and reused, so each export does not pay the start-up cost.
+
+    Args:
+        processes (int): The number of worker processes.
+
+    Returns:
+        ProcessPoolExecutor: The shared pool.
+    """
+    global _export_pool
+    with _export_pool_lock:
+        if _export_pool is None:
+            _export_pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+        return _export_pool
+
+
+def _reset_export_pool() -> None:
+    global _export_pool
+    with _export_pool_lock:
+        if _export_pool is not None:
+            _export_pool.shutdown(wait=False, cancel_futures=True)
+        _export_pool = None
+
+
+def for_request(request: HttpRequest) -> DecryptionEngine:
+    """
+    Returns the DecryptionEngine bound to `request`, creating it on first use.
+
+    Binding the engine (and so its plaintext cache) to the request keeps plaintext from outliving the render that needed it.
+
+    Args:
+        request (HttpRequest): The current request.
+
+    Returns:
+        DecryptionEngine: The request's engine.
+    """
+    engine = getattr(request, "_decryption_engine", None)
+    if engine is None:
+        engine = DecryptionEngine()
+        request._decryption_engine = engine
+    return engine
+
+
+class BatchDecryptionMixin:
+    """
+    ListView mixin that decrypts only the rows being rendered, in batches, through the request's DecryptionEngine.
+
+    Attributes:
+        decrypt_fields (Optional[Sequence[str]]): The encrypted fields the template displays. Defaults to every encrypted field.
+        bucket_ordering (Optional[Sequence[str]]): Encrypted fields the queryset is ordered by through their SortKeyFields.
+            Rows sharing a bucket are alphabetized in Python after decryption.
+    """
+
+    decrypt_fields: Optional[Sequence[str]] = None
+    bucket_ordering: Optional[Sequence[str]] = None
+
+    def get_queryset(self) -> QuerySet:
+        return for_request(self.request).prepare(super().get_queryset(), self.decrypt_fields)
+
+    def get_context_data(self, **kwargs) -> dict:
+        context = super().get_context_data(**kwargs)
+        decrypted = for_request(self.request).decrypt_instances(context["object_list"], self.decrypt_fields)
+        if self.bucket_ordering:
+            decrypted = sort_within_buckets(decrypted, self.bucket_ordering)
+        context["object_list"] = decrypted
+        context_object_name = self.get_context_object_name(decrypted)
+        if context_object_name is not None:
+            context[context_object_name] = decrypted
+        return context
+
+
+class BatchDecryptionChangeList(ChangeList):
+    """
+    Admin change list that decrypts the rows of the displayed page in batches, through the request's DecryptionEngine.
+    """
+
+    def get_queryset(self, request: HttpRequest, *args, **kwargs) -> QuerySet:
+        return for_request(request).prepare(super().get_queryset(request, *args, **kwargs), self.model_admin.decrypt_fields)
+
+    def get_results(self, request: HttpRequest) -> None:
+        super().get_results(request)
+        self.result_list = for_request(request).decrypt_instances(self.result_list, self.model_admin.decrypt_fields)
+
+
+class BatchDecryptionAdminMixin:
+    """
+    ModelAdmin mixin whose change list decrypts the displayed page in batches instead of once per row.
+
+    Attributes:
+        decrypt_fields (Optional[Sequence[str]]): The encrypted fields `list_display` shows. Defaults to every encrypted field.
+    """
+
+    decrypt_fields: Optional[Sequence[str]] = None
+
+    def get_changelist(self, request: HttpRequest, **kwargs) -> type[ChangeList]:
+        return BatchDecryptionChangeList
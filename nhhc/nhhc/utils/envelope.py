@@ -0,0 +1,125 @@
+"""
+Module: nhhc.utils.envelope
+
+This module contains the symmetric half of the envelope encryption storage mode.
+
+Each row owns one random 256-bit data key. The data key is wrapped once with the existing GPG public key (by pgcrypto,
+see `nhhc.utils.fields.EnvelopeKeyField`) and every encrypted column of the row is sealed with AES-256-GCM under it.
+Reading or writing a row therefore costs one public-key operation instead of one per encrypted column.
+
+Sealed values are raw `bytea`, laid out as `header | nonce (12 bytes) | ciphertext + tag`: 33 bytes on top of the
+plaintext, against the few hundred bytes of a `pgp_pub_encrypt` message per value. The header starts with a NUL byte,
+which can never begin a legacy `pgp_pub_encrypt` message or a Postgres text value, so sealed and legacy values can share
+a column. `MAGIC` marks a plain payload; `MAGIC_COMPRESSED` marks a payload that was zlib-compressed before encryption.
+
+Functions:
+- generate_data_key: Returns a new random data key.
+- is_sealed: Returns True if a stored value was written in envelope mode.
+- seal: Encrypts a plaintext with a data key.
+- unseal: Decrypts a sealed value with a data key.
+- unseal_many: Decrypts a batch of sealed values, each with its own data key.
+"""
+
+import os
+import zlib
+from typing import Iterable, List, Tuple
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+MAGIC = b"\x00NHE\x01"
+MAGIC_COMPRESSED = b"\x00NHE\x02"
+COMPRESSION_THRESHOLD = 128
+NONCE_SIZE = 12
+DATA_KEY_SIZE = 32
+
+
+class EnvelopeError(ValueError):
+    """Raised when a sealed value cannot be produced or opened."""
+
+    pass
+
+
+def generate_data_key() -> bytes:
+    """
+    Returns a new random AES-256 data key.
+
+    Returns:
+        bytes: 32 random bytes.
+    """
+    return AESGCM.generate_key(bit_length=DATA_KEY_SIZE * 8)
+
+
+def is_sealed(value: bytes) -> bool:
+    """
+    Returns True if `value` was written by `seal` rather than by `sage_encrypt`.
+
+    Args:
+        value (bytes): The stored column value.
+
+    Returns:
+        bool: Whether the value carries the envelope header.
+    """
+    return bytes(value[: len(MAGIC)]) in (MAGIC, MAGIC_COMPRESSED)
+
+
+def seal(data_key: bytes, plaintext: str, associated_data: bytes, compress: bool = False) -> bytes:
+    """
+    Encrypts `plaintext` with AES-256-GCM under the row's data key.
+
+    Args:
+        data_key (bytes): The row's unwrapped data key.
+        plaintext (str): The value to encrypt.
+        associated_data (bytes): Authenticated context (the table and column) so sealed values cannot be swapped between columns.
+        compress (bool): zlib-compress plaintexts of at least `COMPRESSION_THRESHOLD` bytes first, when that makes them smaller.
+
+    Returns:
+        bytes: The sealed value.
+    """
+    if not data_key:
+        raise EnvelopeError("A Data Key is Required to Seal a Value")
+    payload = plaintext.encode("utf-8")
+    header = MAGIC
+    if compress and len(payload) >= COMPRESSION_THRESHOLD:
+        packed = zlib.compress(payload)
+        if len(packed) < len(payload):
+            # The header is authenticated too, so a compressed value cannot be passed off as a plain one.
+            payload, header, associated_data = packed, MAGIC_COMPRESSED, MAGIC_COMPRESSED + associated_data
+    nonce = os.urandom(NONCE_SIZE)
+    return header + nonce + AESGCM(data_key).encrypt(nonce, payload, associated_data)
+
+
+def unseal(data_key: bytes, sealed: bytes, associated_data: bytes) -> str:
+    """
+    Decrypts a value produced by `seal`.
+
+    Args:
+        data_key (bytes): The row's unwrapped data key.
+        sealed (bytes): The stored value, including the envelope header.
+        associated_data (bytes): The same context passed to `seal`.
+
+    Returns:
+        str: The plaintext.
+    """
+    if not data_key:
+        raise EnvelopeError("A Data Key is Required to Unseal a Value")
+    sealed = bytes(sealed)
+    compressed = sealed[: len(MAGIC)] == MAGIC_COMPRESSED
+    if compressed:
+        associated_data = MAGIC_COMPRESSED + associated_data
+    nonce = sealed[len(MAGIC) : len(MAGIC) + NONCE_SIZE]
+    payload = AESGCM(data_key).decrypt(nonce, sealed[len(MAGIC) + NONCE_SIZE :], associated_data)
+    return (zlib.decompress(payload) if compressed else payload).decode("utf-8")
+
+
+def unseal_many(items: Iterable[Tuple[bytes, bytes, bytes]]) -> List[str]:
+    """
+    Decrypts a batch of `(data_key, sealed, associated_data)` items. This is the task the export process pool runs
+    (see `nhhc.utils.decryption.export_pool`); it needs nothing from Django, so spawned workers can import it.
+
+    Args:
+        items (Iterable[Tuple[bytes, bytes, bytes]]): The items.
+
+    Returns:
+        List[str]: The plaintexts, in order.
+    """
+    return [unseal(data_key, sealed, associated_data) for data_key, sealed, associated_data in items]
@@ -0,0 +1,100 @@
+"""
+Module: nhhc.utils.feed
+
+This module contains the announcements feed shown on the dashboard and by the `recent_announcements` tag.
+
+The feed is loaded with one query joining each active announcement to its poster, the posters' names are decrypted
+in one batch, and the resulting rows are cached under the announcements generation (see `nhhc.utils.managers`).
+Saving or deleting an announcement bumps that generation (see `nhhc.signals`), so the next render reloads. So does
+deleting an employee: their announcements lose their poster through an `on_delete` update, which sends no signal.
+The rows carry the posters' decrypted first names, so with `DISPLAY_PROJECTION_ENCRYPT` they are sealed with AES-GCM
+like the display records of `nhhc.utils.projection`.
+
+Functions:
+- recent_announcements: Returns the most recent active announcements as display dictionaries.
+- invalidate_feed: Retires the cached feed.
+
+Usage:
+    from nhhc.utils.feed import recent_announcements
+
+    context["recent_announcements"] = recent_announcements()
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from announcements.models import Announcements
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.dateparse import parse_datetime
+from loguru import logger
+
+from nhhc.utils.decryption import DecryptionEngine
+from nhhc.utils.envelope import EnvelopeError, is_sealed, seal, unseal
+from nhhc.utils.fields import blind_index_key
+from nhhc.utils.managers import bump_generation, generation
+from nhhc.utils.projection import ProjectionEncoder
+
+FEED_CACHE_KEY = "announcement-feed:{generation}:{limit}"
+FEED_FIELDS = ("id", "announcement_title", "message", "message_type", "status", "date_posted")
+FEED_ASSOCIATED_DATA = b"announcement-feed"
+
+
+def _dump(feed: List[Dict[str, Any]]) -> Any:
+    # date_posted is written in full, since DjangoJSONEncoder would drop its microseconds and a cache hit would differ from the miss.
+    payload = json.dumps([{**item, "date_posted": item["date_posted"].isoformat() if item["date_posted"] else None} for item in feed], cls=ProjectionEncoder)
+    if settings.DISPLAY_PROJECTION_ENCRYPT:
+        return seal(blind_index_key("announcement-feed"), payload, FEED_ASSOCIATED_DATA)
+    return payload
+
+
+def _load(stored: Any) -> Optional[List[Dict[str, Any]]]:
+    try:
+        if isinstance(stored, bytes) and is_sealed(stored):
+            stored = unseal(blind_index_key("announcement-feed"), stored, FEED_ASSOCIATED_DATA)
+        elif settings.DISPLAY_PROJECTION_ENCRYPT:
+            # Written before encryption was enabled; treat as a miss so it is rewritten sealed.
+            return None
+        feed = json.loads(stored)
+    except (EnvelopeError, ValueError, TypeError) as e:
+        logger.warning(f"Discarding Unreadable Announcement Feed - {e}")
+        return None
+    for item in feed:
+        if item.get("date_posted"):
+            item["date_posted"] = parse_datetime(item["date_posted"])
+    return feed
+
+
+def recent_announcements(limit: int = 5) -> List[Dict[str, Any]]:
+    """
+    Returns the `limit` most recently posted active announcements, with `posted_by` resolved to the poster's first name.
+
+    Args:
+        limit (int): The number of announcements.
+
+    Returns:
+        List[Dict[str, Any]]: One dictionary per announcement, newest first.
+    """
+    cachekey = FEED_CACHE_KEY.format(generation=generation(Announcements), limit=limit)
+    stored = cache.get(cachekey)
+    feed = _load(stored) if stored is not None else None
+    if feed is not None:
+        return feed
+    logger.debug(f"Announcement Feed Cache Miss - Loading {cachekey}")
+    announcements = list(
+        Announcements.objects.filter(status=Announcements.STATUS.ACTIVE)
+        .select_related("posted_by")
+        .only(*FEED_FIELDS, "posted_by__employee_id", "posted_by__first_name", "posted_by__data_key")
+        .order_by("-date_posted")[:limit]
+    )
+    posters = [announcement.posted_by for announcement in announcements if announcement.posted_by is not None]
+    # Every poster's data key is unwrapped in one query instead of one per announcement.
+    DecryptionEngine().decrypt_instances(posters, ["first_name"])
+    feed = [{**{name: getattr(announcement, name) for name in FEED_FIELDS}, "posted_by": announcement.posted_by.first_name if announcement.posted_by else ""} for announcement in announcements]
+    cache.set(cachekey, _dump(feed), settings.CACHE_TTL)
+    return feed
+
+
+def invalidate_feed() -> None:
+    """Retires the cached feed by bumping the announcements generation."""
+    bump_generation(Announcements)
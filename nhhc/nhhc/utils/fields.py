@@ -0,0 +1,611 @@
+"""
+Module: nhhc.utils.fields
+
+This module contains custom model fields that sit alongside the `sage_encrypt` encrypted fields.
+
+`sage_encrypt` stores randomized OpenPGP ciphertext, so an index or unique constraint on an encrypted column never
+matches anything and every lookup on one has to decrypt the whole table. A blind index stores a keyed HMAC of the
+normalized plaintext next to the encrypted column instead. The HMAC is deterministic, so it can carry a real B-tree
+index and unique constraint, but it cannot be reversed without the key. Sort keys apply the same idea to ordering:
+a keyed bucket per name prefix that can be indexed and sorted, with ties finished in Python.
+
+It also contains the fields of the envelope encryption storage mode (see `nhhc.utils.envelope`): one data key per row,
+wrapped by the existing GPG key pair, and encrypted columns sealed with AES-256-GCM under that key. Nothing is
+decrypted while a row loads: the data key and each field are opened the first time they are accessed.
+
+Classes:
+- BlindIndexField: CharField holding the keyed HMAC-SHA256 of another field on the same model.
+- BlindIndexMatch: `__matches` lookup that hashes the plaintext right-hand side before comparing.
+- SortKeyField: Keyed, coarse, order-preserving sort key of another field on the same model.
+- EnvelopeKeyField: The per-row data key, wrapped and unwrapped by pgcrypto.
+- EnvelopeKeyDescriptor / EnvelopeDescriptor: Open the data key and the encrypted fields on first access.
+- EnvelopeEncryptedCharField / EnvelopeEncryptedEmailField / EnvelopeEncryptedDateField: Columns sealed with the row's data key.
+
+Functions:
+- blind_index_key: Derives the HMAC key for a blind-index purpose.
+- sort_key_table: The keyed, monotonic bucket table behind SortKeyField.
+- sort_within_buckets: Finishes an ordering by sort keys with an in-Python alphabetical sort of each bucket.
+- populate_derived_fields: Recomputes every blind index or sort key of a model in batches.
+- populate_blind_indexes / populate_sort_keys: Shortcuts for the two derived field types.
+- envelope_data_key: Returns (generating if needed) the data key of a row.
+- private_key_params: The current and previous private keys, as parameters of `PRIVATE_KEY_SQL`.
+- wrap_data_key: Expression wrapping a data key with the current public key.
+- pgp_decrypt: Decrypts one wrapped data key or legacy value with pgcrypto.
+- plaintext_values: `values()`-style dicts for rows with envelope-encrypted fields.
+
+Usage:
+    class Employee(models.Model):
+        email = EncryptedEmailField(null=True)
+        email_bidx = BlindIndexField(source="email", normalizer="email", unique=True)
+
+    Employee.objects.filter(email_bidx__matches="Jane.Doe@Example.com").exists()
+"""
+
+import hashlib
+import hmac
+import re
+import unicodedata
+from functools import lru_cache
+from itertools import groupby
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, models
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models.expressions import Col, F, RawSQL
+from django.db.models.lookups import Exact
+from django.db.models.query_utils import DeferredAttribute
+from django.db.models.sql.compiler import SQLCompiler
+from sage_encrypt.mixins.encrypt import Encrypt
+from sage_encrypt.services.setting import get_setting
+
+from nhhc.utils.envelope import EnvelopeError, generate_data_key, is_sealed, seal, unseal
+
+# Picks the private key matching the key id a message was encrypted for, so rows wrapped before a key rotation stay
+# readable through `ENCRYPT_PREVIOUS_PRIVATE_KEY`. Takes the parameters returned by `private_key_params`.
+PRIVATE_KEY_SQL = "dearmor(CASE WHEN pgp_key_id({ciphertext}) = pgp_key_id(dearmor(%s)) THEN %s ELSE %s END)"
+UNWRAP_KEY_SQL = f"SELECT pgp_pub_decrypt_bytea(ciphertext, {PRIVATE_KEY_SQL.format(ciphertext='ciphertext')}) FROM (SELECT %s::bytea AS ciphertext) AS stored"
+LEGACY_DECRYPT_SQL = f"SELECT pgp_pub_decrypt(ciphertext, {PRIVATE_KEY_SQL.format(ciphertext='ciphertext')}) FROM (SELECT %s::bytea AS ciphertext) AS stored"
+WRAP_KEY_SQL = "pgp_pub_encrypt_bytea(%s, dearmor(%s))"
+SORT_ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+# The sort key of values without letters: after every bucket, as NULLs sorted before the keys were made NOT NULL.
+SORT_KEY_LAST = 2**63 - 1
+
+NORMALIZERS: Dict[str, Callable[[str], str]] = {
+    "text": lambda value: re.sub(r"\s+", " ", value).strip().casefold(),
+    "email": lambda value: value.strip().lower(),
+    "digits": lambda value: re.sub(r"\D", "", value),
+}
+
+
+def blind_index_key(purpose: str) -> bytes:
+    """
+    Derives the HMAC key used for one blind-index purpose from `settings.BLIND_INDEX_KEY`.
+
+    Fields that share a purpose (e.g. "email" on employees and applicants) share a key, so their indexes can be compared.
+
+    Args:
+        purpose (str): The purpose label of the index.
+
+    Returns:
+        bytes: The derived key.
+    """
+    return hmac.new(settings.BLIND_INDEX_KEY.encode("utf-8"), purpose.encode("utf-8"), hashlib.sha256).digest()
+
+
+class BlindIndexField(models.CharField):
+    """
+    Keyed HMAC-SHA256 of the normalized plaintext of another field, maintained on save.
+
+    Attributes:
+        source (str): The name of the (encrypted) field that is indexed.
+        purpose (str): The key-derivation label. Defaults to `source`.
+        normalizer (str): The key in `NORMALIZERS` applied to the plaintext before hashing.
+    """
+
+    description = "Keyed HMAC of an encrypted field, for exact-match lookups"
+
+    def __init__(self, *args, source: Optional[str] = None, purpose: Optional[str] = None, normalizer: str = "text", **kwargs) -> None:
+        if normalizer not in NORMALIZERS:
+            raise ValueError(f"Unknown Blind Index Normalizer: {normalizer}")
+        self.source = source
+        self.purpose = purpose or source
+        self.normalizer = normalizer
+        kwargs.setdefault("max_length", 64)
+        kwargs.setdefault("editable", False)
+        kwargs.setdefault("null", True)
+        kwargs.setdefault("blank", True)
+        kwargs.setdefault("db_index", not kwargs.get("unique", False))
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["source"] = self.source
+        if self.purpose != self.source:
+            kwargs["purpose"] = self.purpose
+        if self.normalizer != "text":
+            kwargs["normalizer"] = self.normalizer
+        return name, path, args, kwargs
+
+    def digest(self, value: Any) -> Optional[str]:
+        """
+        Computes the blind index of a plaintext value.
+
+        Args:
+            value (Any): The plaintext. `None` and empty values index to `None`.
+
+        Returns:
+            Optional[str]: The hex HMAC digest.
+        """
+        if value is None:
+            return None
+        normalized = NORMALIZERS[self.normalizer](str(value))
+        if not normalized:
+            return None
+        return hmac.new(blind_index_key(self.purpose), normalized.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    def pre_save(self, model_instance: models.Model, add: bool) -> Optional[str]:
+        value = self.digest(getattr(model_instance, self.source))
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+@BlindIndexField.register_lookup
+class BlindIndexMatch(Exact):
+    """
+    Exact match against the plaintext: `filter(email_bidx__matches="jane@example.com")`.
+    """
+
+    lookup_name = "matches"
+
+    def get_prep_lookup(self) -> Any:
+        if hasattr(self.rhs, "resolve_expression"):
+            return self.rhs
+        return self.lhs.output_field.digest(self.rhs)
+
+
+class SortKeyField(models.BigIntegerField):
+    """
+    Keyed, coarse, order-preserving sort key for an encrypted field, maintained on save.
+
+    The first `prefix_length` letters of the normalized plaintext are ranked alphabetically, and each rank is mapped
+    through a table of cumulative keyed HMAC gaps. The mapping is monotonic, so `ORDER BY` on the key (and an index on
+    it) yields the plaintext order bucket by bucket, but the stored integers do not reveal the prefix without the key.
+    Rows sharing a bucket are put in alphabetical order in Python by `sort_within_buckets`. Values without letters
+    (including `None`) are keyed `SORT_KEY_LAST`, so the column is NOT NULL and can be compared as a row value.
+
+    Attributes:
+        source (str): The name of the (encrypted) field that is sorted.
+        purpose (str): The key-derivation label. Defaults to "sort", so keys are comparable across fields and models.
+        prefix_length (int): The number of leading letters that make up a bucket.
+    """
+
+    description = "Keyed, bucketed sort key of an encrypted field"
+
+    def __init__(self, *args, source: Optional[str] = None, purpose: str = "sort", prefix_length: int = 2, **kwargs) -> None:
+        self.source = source
+        self.purpose = purpose
+        self.prefix_length = prefix_length
+        kwargs.setdefault("editable", False)
+        kwargs.setdefault("default", SORT_KEY_LAST)
+        kwargs.setdefault("blank", True)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["source"] = self.source
+        if self.purpose != "sort":
+            kwargs["purpose"] = self.purpose
+        if self.prefix_length != 2:
+            kwargs["prefix_length"] = self.prefix_length
+        return name, path, args, kwargs
+
+    def sort_key(self, value: Any) -> int:
+        """
+        Computes the sort key of a plaintext value.
+
+        Args:
+            value (Any): The plaintext. `None` and values without letters sort last, as `SORT_KEY_LAST`.
+
+        Returns:
+            int: The keyed bucket.
+        """
+        if value is None:
+            return SORT_KEY_LAST
+        letters = [character for character in unicodedata.normalize("NFKD", str(value).casefold()) if character in SORT_ALPHABET]
+        if not letters:
+            return SORT_KEY_LAST
+        rank = 0
+        for position in range(self.prefix_length):
+            rank = rank * (len(SORT_ALPHABET) + 1) + (SORT_ALPHABET.index(letters[position]) + 1 if position < len(letters) else 0)
+        return sort_key_table(self.purpose, self.prefix_length)[rank]
+
+    def pre_save(self, model_instance: models.Model, add: bool) -> int:
+        value = self.sort_key(getattr(model_instance, self.source))
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+@lru_cache(maxsize=None)
+def sort_key_table(purpose: str, prefix_length: int) -> Tuple[int, ...]:
+    """
+    Returns the monotonic rank -> sort key table for one purpose: each rank adds a keyed pseudo-random gap to the last.
+
+    Args:
+        purpose (str): The key-derivation label.
+        prefix_length (int): The number of letters per bucket.
+
+    Returns:
+        Tuple[int, ...]: The sort key of every rank.
+    """
+    key = blind_index_key(f"sort:{purpose}")
+    total = 0
+    table = []
+    for rank in range((len(SORT_ALPHABET) + 1) ** prefix_length):
+        total += int.from_bytes(hmac.new(key, rank.to_bytes(4, "big"), hashlib.sha256).digest()[:2], "big") + 1
+        table.append(total)
+    return tuple(table)
+
+
+def sort_within_buckets(instances: Iterable[models.Model], fields: Sequence[str], model: Optional[type[models.Model]] = None) -> List[models.Model]:
+    """
+    Finishes an ordering by SortKeyFields: rows whose sort keys tie are put in plaintext order, in Python.
+
+    The sort is stable, so the database's remaining ordering (e.g. `-hire_date`) still breaks plaintext ties.
+    Only the given rows are reordered; on a paginated list a bucket split across pages is ordered per page.
+
+    Args:
+        instances (Iterable[models.Model]): The rows, already ordered by the sort keys of `fields`.
+        fields (Sequence[str]): The sorted (encrypted) fields, most significant first.
+        model (Optional[type[models.Model]]): The model the rows project, when they are not instances (e.g. display records).
+
+    Returns:
+        List[models.Model]: The rows in alphabetical order.
+    """
+    instances = list(instances)
+    if not instances:
+        return instances
+    sort_fields = {field.source: field for field in (model or type(instances[0]))._meta.concrete_fields if isinstance(field, SortKeyField)}
+    keys = [sort_fields[name].attname for name in fields]
+    normalize = NORMALIZERS["text"]
+    ordered = []
+    for _, bucket in groupby(instances, key=lambda instance: tuple(getattr(instance, key) for key in keys)):
+        ordered.extend(sorted(bucket, key=lambda instance: tuple(normalize(str(getattr(instance, name) or "")) for name in fields)))
+    return ordered
+
+
+def populate_derived_fields(model: type[models.Model], field_class: type[models.Field], batch_size: int = 500) -> int:
+    """
+    Recomputes every field of `field_class` on `model` from its source field and writes them back with `bulk_update`.
+
+    Args:
+        model (type[models.Model]): The model (or historical model) to backfill.
+        field_class (type[models.Field]): BlindIndexField or SortKeyField.
+        batch_size (int): The number of rows loaded and updated per batch.
+
+    Returns:
+        int: The number of rows updated.
+    """
+    derived_fields = [field for field in model._meta.concrete_fields if isinstance(field, field_class)]
+    if not derived_fields:
+        return 0
+    # Envelope-encrypted sources are opened with the row's data key, so load it with them.
+    sources = {field.source for field in derived_fields} | {field.attname for field in model._meta.concrete_fields if isinstance(field, EnvelopeKeyField)}
+    updated = 0
+    batch = []
+    for instance in model._default_manager.only(model._meta.pk.attname, *sources).iterator(chunk_size=batch_size):
+        for field in derived_fields:
+            field.pre_save(instance, add=False)
+        batch.append(instance)
+        if len(batch) >= batch_size:
+            updated += model._default_manager.bulk_update(batch, [field.name for field in derived_fields])
+            batch = []
+    if batch:
+        updated += model._default_manager.bulk_update(batch, [field.name for field in derived_fields])
+    return updated
+
+
+def populate_blind_indexes(model: type[models.Model], batch_size: int = 500) -> int:
+    """
+    Recomputes every BlindIndexField of `model`. Used by the migrations that introduce a blind index and after rotating `BLIND_INDEX_KEY`.
+
+    Args:
+        model (type[models.Model]): The model (or historical model) to backfill.
+        batch_size (int): The number of rows loaded and updated per batch.
+
+    Returns:
+        int: The number of rows updated.
+    """
+    return populate_derived_fields(model, BlindIndexField, batch_size)
+
+
+def populate_sort_keys(model: type[models.Model], batch_size: int = 500) -> int:
+    """
+    Recomputes every SortKeyField of `model`. Used by the migrations that introduce a sort key and after rotating `BLIND_INDEX_KEY`.
+
+    Args:
+        model (type[models.Model]): The model (or historical model) to backfill.
+        batch_size (int): The number of rows loaded and updated per batch.
+
+    Returns:
+        int: The number of rows updated.
+    """
+    return populate_derived_fields(model, SortKeyField, batch_size)
+
+
+def private_key_params(connection: BaseDatabaseWrapper) -> List[str]:
+    """
+    Returns the parameters of `PRIVATE_KEY_SQL`: the previous private key (twice) and the current one.
+
+    Without a previous key configured the current key stands in for it, so the CASE always picks the current key.
+
+    Args:
+        connection (BaseDatabaseWrapper): The connection the statement runs on.
+
+    Returns:
+        List[str]: The armored keys, in placeholder order.
+    """
+    current = get_setting(connection, "ENCRYPT_PRIVATE_KEY")
+    previous = connection.settings_dict.get("ENCRYPT_PREVIOUS_PRIVATE_KEY", getattr(settings, "ENCRYPT_PREVIOUS_PRIVATE_KEY", "")) or current
+    return [previous, previous, current]
+
+
+def wrap_data_key(data_key: bytes, using: Optional[str] = None) -> RawSQL:
+    """
+    Returns an expression that wraps `data_key` with the current public key, for writes that bypass `save()` such as `bulk_update`.
+
+    Args:
+        data_key (bytes): The unwrapped data key.
+        using (Optional[str]): The database alias the expression is written to.
+
+    Returns:
+        RawSQL: The wrapping expression.
+    """
+    public_key = get_setting(connections[using or DEFAULT_DB_ALIAS], "ENCRYPT_PUBLIC_KEY")
+    return RawSQL(WRAP_KEY_SQL, (bytes(data_key), public_key), output_field=models.BinaryField())
+
+
+def pgp_decrypt(sql: str, ciphertext: bytes, using: Optional[str] = None) -> Any:
+    """
+    Decrypts a single public-key ciphertext with pgcrypto.
+
+    Args:
+        sql (str): `UNWRAP_KEY_SQL` for a wrapped data key, `LEGACY_DECRYPT_SQL` for a `sage_encrypt` value.
+        ciphertext (bytes): The stored ciphertext.
+        using (Optional[str]): The database alias the value was loaded from.
+
+    Returns:
+        Any: The decrypted value.
+    """
+    connection = connections[using or DEFAULT_DB_ALIAS]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*private_key_params(connection), bytes(ciphertext)])
+        return cursor.fetchone()[0]
+
+
+class WrappedKey(bytes):
+    """Data key as loaded from the database, still wrapped by the GPG public key."""
+
+    pass
+
+
+class EnvelopeKeyDescriptor(DeferredAttribute):
+    """
+    Unwraps the data key of an instance on first access and memoizes it, so rows whose encrypted fields are never
+    read never pay for the public-key operation.
+    """
+
+    def __get__(self, instance: Optional[models.Model], cls: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        if isinstance(value, WrappedKey):
+            value = bytes(pgp_decrypt(UNWRAP_KEY_SQL, value, instance._state.db))
+            instance.__dict__[self.field.attname] = value
+        return value
+
+
+class EnvelopeKeyField(Encrypt, models.BinaryField):
+    """
+    Per-row AES-256 data key, wrapped with the GPG public key by pgcrypto on write.
+
+    The key is selected exactly as stored and unwrapped lazily by `EnvelopeKeyDescriptor`, or in bulk by
+    `nhhc.utils.decryption.DecryptionEngine`. A row's key is generated the first time the row is saved and is never
+    exposed outside the model.
+    """
+
+    descriptor_class = EnvelopeKeyDescriptor
+    encrypt_query = "pgp_pub_encrypt_bytea(%s, dearmor('{}'))"
+    decrypt_query = "pgp_pub_decrypt_bytea(%s::bytea, dearmor('{}'))::%s"
+    cast = "BYTEA"
+
+    def __init__(self, *args, **kwargs) -> None:
+        kwargs.setdefault("null", True)
+        super().__init__(*args, **kwargs)
+
+    def get_col(self, alias: str, output_field: Optional[models.Field] = None) -> Col:
+        return Col(alias, self, output_field or self)
+
+    def get_placeholder(self, value: Any, compiler: SQLCompiler, connection: BaseDatabaseWrapper) -> str:
+        # Expressions (the column itself, or `wrap_data_key` in bulk writes) already yield a wrapped key.
+        if isinstance(value, WrappedKey) or hasattr(value, "as_sql"):
+            return "%s"
+        return self.encrypt_query.format(get_setting(connection, "ENCRYPT_PUBLIC_KEY"))
+
+    def get_decrypt_sql(self, connection: BaseDatabaseWrapper) -> str:
+        return self.decrypt_query.format(get_setting(connection, "ENCRYPT_PRIVATE_KEY"))
+
+    def get_internal_type(self) -> str:
+        return "BinaryField"
+
+    def from_db_value(self, value: Any, expression: Any, connection: BaseDatabaseWrapper) -> Optional[WrappedKey]:
+        return None if value is None else WrappedKey(value)
+
+    def pre_save(self, model_instance: models.Model, add: bool) -> Any:
+        stored = model_instance.__dict__.get(self.attname)
+        if isinstance(stored, WrappedKey) and not add:
+            # The loaded wrap may predate a key rotation (e.g. an instance from the object cache); writing it back would
+            # replace the current wrap with one made for a retired key. The UPDATE keeps the column as it is instead.
+            return F(self.attname)
+        return envelope_data_key(model_instance)
+
+    def get_db_prep_save(self, value: Any, connection: BaseDatabaseWrapper) -> Any:
+        if isinstance(value, WrappedKey):
+            return value
+        return super().get_db_prep_save(value, connection)
+
+
+def envelope_data_key(instance: models.Model) -> bytes:
+    """
+    Returns the unwrapped data key of `instance`, generating one if the row does not have a key yet.
+
+    Args:
+        instance (models.Model): An instance of a model with an EnvelopeKeyField.
+
+    Returns:
+        bytes: The row's data key.
+    """
+    key_field = next(field for field in instance._meta.concrete_fields if isinstance(field, EnvelopeKeyField))
+    data_key = getattr(instance, key_field.attname)
+    if not data_key:
+        data_key = generate_data_key()
+        setattr(instance, key_field.attname, data_key)
+    return data_key
+
+
+class StoredValue(bytes):
+    """Raw column value of an envelope-encrypted field, as loaded from the database and not yet opened."""
+
+    pass
+
+
+class EnvelopeDescriptor(DeferredAttribute):
+    """
+    Opens the stored value of an envelope-encrypted field on first access and memoizes the plaintext on the instance.
+    """
+
+    def __get__(self, instance: Optional[models.Model], cls: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        if isinstance(value, StoredValue):
+            value = self.field.open(instance, value)
+            instance.__dict__[self.field.attname] = value
+        return value
+
+    def __set__(self, instance: models.Model, value: Any) -> None:
+        instance.__dict__[self.field.attname] = value
+
+
+class EnvelopeEncryptedMixin:
+    """
+    Field mixin for the envelope encryption storage mode.
+
+    Columns are selected exactly as stored; nothing is decrypted while a row loads. A field is opened by
+    `EnvelopeDescriptor` the first time it is read, so code that only touches plaintext columns (authentication,
+    permission checks, most templates) never decrypts anything. Values are sealed with the row's data key (see
+    `EnvelopeKeyField`) in `pre_save`. The column stays `bytea`, so fields can be switched from `sage_encrypt`
+    without a rewrite.
+
+    Attributes:
+        compress (bool): Compress long values before sealing them. Off by default: short values only grow. Existing
+            rows pick the setting up when next saved, or all at once with `rotate_encryption_keys --reseal`.
+    """
+
+    descriptor_class = EnvelopeDescriptor
+
+    def __init__(self, *args, compress: bool = False, **kwargs) -> None:
+        self.compress = compress
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.compress:
+            kwargs["compress"] = True
+        return name, path, args, kwargs
+
+    def contribute_to_class(self, cls: type[models.Model], name: str, private_only: bool = False) -> None:
+        super().contribute_to_class(cls, name, private_only=private_only)
+        # Always install the descriptor, even over one inherited from an abstract parent (e.g. AbstractUser.email).
+        setattr(cls, self.attname, self.descriptor_class(self))
+
+    def db_type(self, connection: BaseDatabaseWrapper) -> str:
+        return "bytea"
+
+    def from_db_value(self, value: Any, expression: Any, connection: BaseDatabaseWrapper) -> Optional[StoredValue]:
+        return None if value is None else StoredValue(value)
+
+    @property
+    def associated_data(self) -> bytes:
+        return f"{self.model._meta.db_table}.{self.column}".encode("utf-8")
+
+    def open(self, instance: models.Model, stored: StoredValue) -> Any:
+        """
+        Converts a stored column value to its Python plaintext.
+
+        Values still holding `sage_encrypt` ciphertext are decrypted by pgcrypto, so rows written before envelope
+        mode keep loading until they are next saved.
+
+        Args:
+            instance (models.Model): The instance the value was loaded for, which holds the data key.
+            stored (StoredValue): The raw column value.
+
+        Returns:
+            Any: The plaintext, converted with `to_python`.
+        """
+        if is_sealed(stored):
+            return self.to_python(unseal(envelope_data_key(instance), stored, self.associated_data))
+        return self.to_python(pgp_decrypt(LEGACY_DECRYPT_SQL, stored, instance._state.db))
+
+    def pre_save(self, model_instance: models.Model, add: bool) -> Optional[bytes]:
+        # A sealed value that was never opened is written back untouched, without unwrapping the data key.
+        stored = model_instance.__dict__.get(self.attname)
+        if isinstance(stored, StoredValue) and is_sealed(stored):
+            return stored
+        value = getattr(model_instance, self.attname)
+        if value is None:
+            return None
+        return seal(envelope_data_key(model_instance), str(self.get_prep_value(value)), self.associated_data, compress=self.compress)
+
+    def get_db_prep_value(self, value: Any, connection: BaseDatabaseWrapper, prepared: bool = False) -> Any:
+        # Sealed values reach the database as bytes, including through `bulk_update`, which prepares with this method.
+        if isinstance(value, (bytes, memoryview)):
+            return connection.Database.Binary(bytes(value))
+        return super().get_db_prep_value(value, connection, prepared)
+
+    def get_db_prep_save(self, value: Any, connection: BaseDatabaseWrapper) -> Any:
+        if value is None or hasattr(value, "as_sql"):
+            return value
+        if isinstance(value, (bytes, memoryview)):
+            return connection.Database.Binary(bytes(value))
+        raise EnvelopeError(f"{self.model.__name__}.{self.name} Is Envelope Encrypted and Must Be Written Through save() or bulk_create()")
+
+
+class EnvelopeEncryptedCharField(EnvelopeEncryptedMixin, models.CharField):
+    pass
+
+
+class EnvelopeEncryptedEmailField(EnvelopeEncryptedMixin, models.EmailField):
+    pass
+
+
+class EnvelopeEncryptedDateField(EnvelopeEncryptedMixin, models.DateField):
+    pass
+
+
+def plaintext_values(instances: Iterable[models.Model]) -> List[Dict[str, Any]]:
+    """
+    Returns one dict of concrete field values per instance, like `QuerySet.values()`, but with envelope-encrypted
+    fields opened and the wrapped data key left out. `values()` itself would return the sealed column bytes.
+    Blind indexes and sort keys are left out too: they are keyed digests of the plaintext, not data.
+
+    Args:
+        instances (Iterable[models.Model]): The rows to convert.
+
+    Returns:
+        List[Dict[str, Any]]: Field values keyed by attname.
+    """
+    return [
+        {field.attname: field.value_from_object(instance) for field in instance._meta.concrete_fields if not isinstance(field, (EnvelopeKeyField, BlindIndexField, SortKeyField))}
+        for instance in instances
+    ]
@@ -0,0 +1,118 @@
+"""
+Module: nhhc.utils.fragments
+
+This module contains fragment caching for the authenticated portal, where whole-page caching does not apply.
+
+A fragment's cache key combines its name, the viewer's role (`admin`, `staff` or `employee`), the current data
+generation of every model it depends on (see `nhhc.utils.managers`) and a digest of any extra `vary_on` values, e.g.
+the request path that highlights the active sidenav link. Saving or deleting a row of a dependency bumps its
+generation (`nhhc.signals`), so every fragment built from it is re-rendered on the next request while untouched
+fragments keep being served. Fragments are rendered stampede-safely through `nhhc.utils.stampede`.
+
+Every lookup is counted in the `fragment_cache_requests` Prometheus counter by fragment and result (`hit` / `miss`),
+from which the per-fragment hit rate is derived.
+
+Functions:
+- role_of: Returns the fragment role of a user.
+- fragment_key: Returns the cache key of a fragment.
+- cached_fragment: Returns a fragment's HTML, rendering it on a miss.
+- fragment_models: Returns the models whose changes invalidate fragments.
+
+Usage:
+    {% load fragment_cache %}
+    {% cachefragment "sidenav" "web.EmploymentApplicationModel" "web.ClientInterestSubmission" vary_on request.path %}
+        ...
+    {% endcachefragment %}
+
+    html = cached_fragment("stats", lambda: render_to_string(...), request.user, [EmploymentApplicationModel])
+"""
+
+import hashlib
+from typing import Any, Callable, Iterable, List, Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.db import models
+from prometheus_client import Counter
+
+from nhhc.utils.managers import generation
+from nhhc.utils.stampede import cached_compute
+
+FRAGMENT_CACHE_KEY = "fragment:{name}:{role}:{generations}:{digest}"
+
+fragment_requests = Counter("fragment_cache_requests", "Template fragment cache lookups.", ["fragment", "result"])
+
+
+def role_of(user: Any) -> str:
+    """
+    Returns the role a fragment is cached for.
+
+    Args:
+        user (Any): The requesting user, possibly anonymous.
+
+    Returns:
+        str: "admin", "staff", "employee" or "anonymous".
+    """
+    if not getattr(user, "is_authenticated", False):
+        return "anonymous"
+    if user.is_superuser:
+        return "admin"
+    return "staff" if user.is_staff else "employee"
+
+
+def _resolve(dependency: Any) -> type[models.Model]:
+    return apps.get_model(dependency) if isinstance(dependency, str) else dependency
+
+
+def fragment_key(name: str, role: str, dependencies: Iterable[Any], vary_on: Iterable[Any] = ()) -> str:
+    """
+    Returns the cache key of fragment `name` for `role` at the current generation of its dependencies.
+
+    Args:
+        name (str): The fragment name.
+        role (str): The viewer's role.
+        dependencies (Iterable[Any]): Models (or "app_label.Model" labels) the fragment is built from.
+        vary_on (Iterable[Any]): Extra values the fragment depends on.
+
+    Returns:
+        str: The cache key.
+    """
+    generations = ".".join(str(generation(_resolve(dependency))) for dependency in dependencies) or "0"
+    digest = hashlib.sha256("\x00".join(str(value) for value in vary_on).encode("utf-8")).hexdigest()[:16]
+    return FRAGMENT_CACHE_KEY.format(name=name, role=role, generations=generations, digest=digest)
+
+
+def cached_fragment(name: str, render: Callable[[], str], user: Any, dependencies: Iterable[Any] = (), vary_on: Iterable[Any] = (), timeout: Optional[int] = None) -> str:
+    """
+    Returns the HTML of fragment `name`, rendering it with `render` on a miss.
+
+    Args:
+        name (str): The fragment name, also the metrics label.
+        render (Callable[[], str]): Renders the fragment.
+        user (Any): The requesting user, whose role is part of the key.
+        dependencies (Iterable[Any]): Models (or labels) whose changes invalidate the fragment.
+        vary_on (Iterable[Any]): Extra values the fragment depends on.
+        timeout (Optional[int]): Seconds the fragment is fresh. Defaults to `settings.FRAGMENT_CACHE_TTL`.
+
+    Returns:
+        str: The fragment HTML.
+    """
+    rendered: List[bool] = []
+
+    def miss() -> str:
+        rendered.append(True)
+        return str(render())
+
+    html = cached_compute(fragment_key(name, role_of(user), dependencies, vary_on), miss, settings.FRAGMENT_CACHE_TTL if timeout is None else timeout)
+    fragment_requests.labels(name, "miss" if rendered else "hit").inc()
+    return html
+
+
+def fragment_models() -> List[type[models.Model]]:
+    """
+    Returns the models listed in `settings.FRAGMENT_CACHE_MODELS`, whose saves and deletes bump their generation.
+
+    Returns:
+        List[type[models.Model]]: The fragment dependencies.
+    """
+    return [apps.get_model(label) for label in settings.FRAGMENT_CACHE_MODELS]
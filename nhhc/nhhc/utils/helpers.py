@@ -4,11 +4,13 @@ from django.conf import settings
 from django.core.mail import send_mail
 from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page, never_cache
+from django.views.decorators.cache import never_cache
 from django.views.generic import TemplateView
 from loguru import logger
 from rest_framework import status
 
+from nhhc.utils.stampede import stampede_cache_page
+
 
 def get_status_code_for_unauthorized_or_forbidden(request: HttpRequest) -> int:
     """
@@ -76,7 +78,7 @@ def send_new_user_credentials(new_user_email: str, new_user_first_name: str, pas
 class CachedTemplateView(TemplateView):
     @classmethod
     def as_view(cls, **initkwargs):  # @NoSelf
-        return cache_page(settings.CACHE_TTL)(super(CachedTemplateView, cls).as_view(**initkwargs))
+        return stampede_cache_page(settings.CACHE_TTL)(super(CachedTemplateView, cls).as_view(**initkwargs))
 
 
 class NeverCacheMixin(object):
@@ -0,0 +1,148 @@
+"""
+Module: nhhc.utils.keyset
+
+This module contains keyset (seek) pagination: each page is fetched with `WHERE (<ordering key>) > (<last key seen>)`
+and `LIMIT`, so it walks an index from where the previous page ended instead of counting past `OFFSET` rows. The cost
+of a page stays flat however deep it is and however many rows the table holds.
+
+The seek is one row-value comparison, e.g. `(last_name_sort, first_name_sort, employee_id) > (%s, %s, %s)`, which
+PostgreSQL turns into a single index range scan on a matching composite index. Row values compare NULLs as unknown,
+so every key field must be NOT NULL; the ordering is ascending on every key field and must end with a unique field so
+each row has a distinct key. Pages are addressed by opaque, signed cursors holding the key of the first or last row
+shown, so clients can neither forge nor need to understand them.
+
+Classes:
+- RowValue: A row constructor, `(a, b, c)`.
+- RowComparison: Compares two row values.
+- KeysetPage: One page of rows with the cursors of its neighbours.
+- KeysetPaginator: Fetches pages of a queryset after or before a cursor.
+
+Usage:
+    paginator = KeysetPaginator(Employee.objects.values("employee_id", "last_name_sort"), ("last_name_sort", "employee_id"), per_page=50)
+    page = paginator.page(after=request.GET.get("after"))
+    page.next_cursor
+"""
+
+from typing import Any, List, Optional, Sequence
+
+from django.core import signing
+from django.db.models import BooleanField, F, Func, QuerySet, Value
+from loguru import logger
+
+CURSOR_SALT = "nhhc.keyset"
+
+
+class RowValue(Func):
+    """
+    A row constructor of its expressions, `(a, b, c)`.
+    """
+
+    template = "(%(expressions)s)"
+
+
+class RowComparison(Func):
+    """
+    The comparison of two row values, e.g. `(a, b) > (%s, %s)`, usable as a filter.
+    """
+
+    template = "%(expressions)s"
+    output_field = BooleanField()
+
+    def __init__(self, lhs: RowValue, operator: str, rhs: RowValue) -> None:
+        super().__init__(lhs, rhs)
+        self.arg_joiner = f" {operator} "
+
+
+class KeysetPage:
+    """
+    One page of a keyset-paginated queryset.
+
+    Attributes:
+        object_list (List[Any]): The rows, in ascending order.
+        next_cursor (Optional[str]): The cursor of the following page, None on the last page.
+        previous_cursor (Optional[str]): The cursor of the preceding page, None on the first page.
+    """
+
+    def __init__(self, object_list: List[Any], next_cursor: Optional[str], previous_cursor: Optional[str]) -> None:
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+
+class KeysetPaginator:
+    """
+    Pages through a queryset ordered by `ordering`, seeking past a cursor instead of using OFFSET.
+
+    Attributes:
+        queryset (QuerySet): The rows, as model instances or `values()` dictionaries including every key field.
+        ordering (Sequence[str]): The key fields, most significant first. Every one must be NOT NULL, and the last unique.
+        per_page (int): The number of rows per page.
+    """
+
+    def __init__(self, queryset: QuerySet, ordering: Sequence[str], per_page: int) -> None:
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.per_page = per_page
+
+    def _key(self, row: Any) -> List[Any]:
+        return [row[name] if isinstance(row, dict) else getattr(row, name) for name in self.ordering]
+
+    def encode(self, row: Any) -> str:
+        return signing.dumps(self._key(row), salt=CURSOR_SALT, compress=True)
+
+    def decode(self, cursor: Optional[str]) -> Optional[List[Any]]:
+        if not cursor:
+            return None
+        try:
+            key = signing.loads(cursor, salt=CURSOR_SALT)
+        except signing.BadSignature:
+            logger.warning("Discarding Invalid Keyset Cursor - Serving the First Page")
+            return None
+        # Cursors issued while sort keys could be NULL cannot be compared as a row value.
+        return key if isinstance(key, list) and len(key) == len(self.ordering) and None not in key else None
+
+    def _seek(self, key: List[Any], forward: bool) -> RowComparison:
+        """
+        Returns the filter of rows strictly after (or before) `key` in ascending order.
+        """
+        return RowComparison(RowValue(*[F(name) for name in self.ordering]), ">" if forward else "<", RowValue(*[Value(value) for value in key]))
+
+    def page(self, after: Optional[str] = None, before: Optional[str] = None) -> KeysetPage:
+        """
+        Returns the page following cursor `after`, or preceding cursor `before`, or the first page.
+
+        Args:
+            after (Optional[str]): A `next_cursor` of a previous page.
+            before (Optional[str]): A `previous_cursor` of a previous page.
+
+        Returns:
+            KeysetPage: The page.
+        """
+        after_key, before_key = self.decode(after), self.decode(before)
+        if before_key is not None:
+            ordering = [F(name).desc() for name in self.ordering]
+            rows = list(self.queryset.filter(self._seek(before_key, forward=False)).order_by(*ordering)[: self.per_page + 1])
+            more = len(rows) > self.per_page
+            rows = rows[: self.per_page][::-1]
+            return KeysetPage(rows, self.encode(rows[-1]) if rows else None, self.encode(rows[0]) if rows and more else None)
+
+        queryset = self.queryset if after_key is None else self.queryset.filter(self._seek(after_key, forward=True))
+        ordering = [F(name).asc() for name in self.ordering]
+        rows = list(queryset.order_by(*ordering)[: self.per_page + 1])
+        more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        return KeysetPage(rows, self.encode(rows[-1]) if rows and more else None, self.encode(rows[0]) if rows and after_key is not None else None)
@@ -1,5 +1,7 @@
+from typing import Iterable, List
+
 from django.conf import settings
-from django.core.mail import EmailMessage, EmailMultiAlternatives
+from django.core.mail import EmailMessage, EmailMultiAlternatives, get_connection
 from django.forms.models import model_to_dict
 from loguru import logger
 
@@ -102,6 +104,80 @@ class PostOffice(EmailMultiAlternatives):
             logger.trace(f"ERROR: Unable to Send Email - {e}")
             settings.HIGHLIGHT_MONITORING.record_exception(f"ERROR: Unable to Send Email - {e}")
 
+    def rejection_message(self, rejected_applicant: dict) -> EmailMultiAlternatives:
+        """
+        Builds, without sending, the email rejecting the application for employment of the reciepent.
+
+        Args:
+            rejected_applicant (dict): The applicant's `first_name` and `email`.
+
+        Returns:
+            EmailMultiAlternatives: The message.
+        """
+        msg = EmailMultiAlternatives(
+            subject=f"Thank You So Much For Considering Nett Hands, {rejected_applicant['first_name']}!",
+            to=[rejected_applicant["email"].lower()],
+            from_email=self.from_email,
+            reply_to=[self.reply_to] if self.reply_to else None,
+            body=PLAIN_TEXT_REJECTION_EMAI_TEMPLATE.substitute(first_name=rejected_applicant["first_name"]),
+        )
+        msg.attach_alternative(REJECTION_TEMPLATE_BODY.substitute(first_name=rejected_applicant["first_name"]), "text/html")
+        return msg
+
+    def onboarding_message(self, new_hire: dict) -> EmailMultiAlternatives:
+        """
+        Builds, without sending, the email giving a new hire their login credentials.
+
+        Args:
+            new_hire (dict): The new hire's `first_name`, `email`, `username` and `plaintext_temp_password`.
+
+        Returns:
+            EmailMultiAlternatives: The message.
+        """
+        credentials = {"first_name": new_hire["first_name"], "username": new_hire["username"], "plaintext_password": new_hire["plaintext_temp_password"]}
+        msg = EmailMultiAlternatives(
+            subject=f"Welcome to Nett Hands, {new_hire['first_name']}!",
+            to=[new_hire["email"].lower()],
+            from_email=self.from_email,
+            reply_to=[self.reply_to] if self.reply_to else None,
+            body=PLAIN_TEXT_NEW_HIRE_ONBOARDING_EMAIL_TEMPLATE.substitute(**credentials),
+        )
+        msg.attach_alternative(NEW_HIRE_ONBOARDING_TEMPLATE_BODY.substitute(**credentials), "text/html")
+        return msg
+
+    def send_batch(self, messages: Iterable[EmailMessage]) -> List[EmailMessage]:
+        """
+        Sends `messages` over one connection to the mail server instead of one connection per message.
+
+        Args:
+            messages (Iterable[EmailMessage]): The messages, e.g. from `onboarding_message` or `rejection_message`.
+
+        Returns:
+            List[EmailMessage]: The messages that could not be sent, empty when every message was sent.
+        """
+        messages: List[EmailMessage] = list(messages)
+        if not messages:
+            return []
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as e:
+            logger.error(f"EMAIL TRANSMISSION FAILURE - Unable to Connect to the Mail Server - {e}")
+            return messages
+        failed: List[EmailMessage] = []
+        try:
+            for msg in messages:
+                try:
+                    if not connection.send_messages([msg]):
+                        failed.append(msg)
+                except Exception as e:
+                    logger.error(f"EMAIL TRANSMISSION FAILURE - {msg.to} - {e}")
+                    failed.append(msg)
+        finally:
+            connection.close()
+        logger.info(f"Number of External Emails Sent in Batch: {len(messages) - len(failed)} of {len(messages)}")
+        return failed
+
     def send_external_applicant_rejection_email(self, rejected_applicant: dict) -> int:
         """
         Sends email rerjecting the application for employment of the reciepent
@@ -120,14 +196,7 @@ class PostOffice(EmailMultiAlternatives):
             logger.info(f"Inititating EMAIL Transmission - Rejection Email - Receipent {rejected_applicant['last_name'], rejected_applicant['first_name']}({rejected_applicant['email']})")
 
         try:
-            subject: str = f"Thank You So Much For Considering Nett Hands, {rejected_applicant['first_name']}!"
-            to: list = rejected_applicant["email"].lower()
-            content_subtype = "text/html"
-            html_content = REJECTION_TEMPLATE_BODY.substitute(first_name=rejected_applicant["first_name"])
-            text_content = PLAIN_TEXT_REJECTION_EMAI_TEMPLATE.substitute(first_name=rejected_applicant["first_name"])
-            msg = EmailMultiAlternatives(subject=subject, to=[to], from_email=self.from_email, reply_to=self.reply_to, body=text_content)
-            msg.attach_alternative(html_content, content_subtype)
-            sent_emails = msg.send()
+            sent_emails = self.rejection_message(rejected_applicant).send()
             if sent_emails <= 0:
                 logger.error(f"EMAIL TRANSMISSION FAILURE - {sent_emails}")
                 raise RuntimeError("Email Not Sents")
@@ -181,16 +250,7 @@ class PostOffice(EmailMultiAlternatives):
         if not isinstance(new_hire, dict):
             new_hire = model_to_dict(new_hire)
         try:
-            subject: str = f"Welcome to Nett Hands, {new_hire['first_name']}!"
-            to: list = new_hire["email"].lower()
-            content_subtype = "text/html"
-            html_content = NEW_HIRE_ONBOARDING_TEMPLATE_BODY.substitute(first_name=new_hire["first_name"], username=new_hire["username"], plaintext_password=new_hire["plaintext_temp_password"])
-            text_content = PLAIN_TEXT_NEW_HIRE_ONBOARDING_EMAIL_TEMPLATE.substitute(
-                first_name=new_hire["first_name"], username=new_hire["username"], plaintext_password=new_hire["plaintext_temp_password"]
-            )
-            msg = EmailMultiAlternatives(subject=subject, to=[to], from_email=self.from_email, reply_to=[self.reply_to], body=text_content)
-            msg.attach_alternative(html_content, content_subtype)
-            sent_emails = msg.send()
+            sent_emails = self.onboarding_message(new_hire).send()
             if sent_emails <= 0:
                 logger.error(f"EMAIL TRANSMISSION FAILURE - {sent_emails}")
                 raise RuntimeError("Email Not Sents")
@@ -1,39 +1,196 @@
-import pickle
+"""
+Module: nhhc.utils.managers
 
+This module contains CachedQuerySet, a QuerySet whose evaluated results can be served from the `default` cache.
+
+A cached result is keyed by the model, the model's generation counter and a digest of the compiled SQL and its
+parameters, so every distinct filter, ordering and slice has its own entry. Rows are stored compactly as tuples of
+raw column values (encrypted columns stay sealed) and rebuilt with `Model.from_db`, so a hit never touches the
+database. Results are computed stampede-safely (see `nhhc.utils.stampede`), so concurrent misses run the query once.
+Saving or deleting a row (`post_save` / `post_delete`, see `nhhc.signals`), or writing through this queryset's
+`update`, `bulk_create` and `bulk_update`, bumps the model's generation, which retires every cached result of that
+model at once.
+
+Classes:
+- CachedQuerySet: QuerySet with `queryset_from_cache` / `from_cache`.
+- CachedPageMixin: ListView mixin reading the displayed page through `from_cache`.
+- CachedListAPIMixin: ListAPIView mixin reading the listed rows through `from_cache`.
+
+Functions:
+- generation: Returns the current cache generation of a model.
+- bump_generation: Invalidates every cached result of a model.
+- cached_models: Returns every installed model managed by a CachedQuerySet.
+
+Usage:
+    objects = CachedQuerySet.as_manager()
+
+    submissions = ClientInterestSubmission.objects.filter(reviewed=False).from_cache()
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.apps import apps
 from django.conf import settings
 from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.db import models
 from django.db.models import QuerySet
+from django.db.models.query import ModelIterable
+from django.http import HttpRequest
 from loguru import logger
+from rest_framework.response import Response
+
+from nhhc.utils.decryption import for_request
+from nhhc.utils.stampede import cached_compute
+
+GENERATION_CACHE_KEY = "qs-generation:{model}"
+RESULT_CACHE_KEY = "qs:{model}:{generation}:{digest}"
+
+
+def generation(model: type[models.Model]) -> int:
+    """
+    Returns the current cache generation of `model`, starting it at 1.
+
+    Args:
+        model (type[models.Model]): The model.
+
+    Returns:
+        int: The generation.
+    """
+    key = GENERATION_CACHE_KEY.format(model=model._meta.label_lower)
+    return cache.get_or_set(key, 1, timeout=None)
+
+
+def bump_generation(model: type[models.Model]) -> None:
+    """
+    Invalidates every cached result of `model` by advancing its generation.
+
+    Args:
+        model (type[models.Model]): The model whose rows changed.
+    """
+    key = GENERATION_CACHE_KEY.format(model=model._meta.label_lower)
+    cache.add(key, 1, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add and incr; any value other than the old one retires the old results.
+        cache.set(key, 1, timeout=None)
+    logger.debug(f"Bumped Queryset Cache Generation for {model._meta.label}")
+
+
+def cached_models() -> List[type[models.Model]]:
+    """
+    Returns every installed model whose default manager is built on CachedQuerySet.
+
+    Returns:
+        List[type[models.Model]]: The models whose results can be cached.
+    """
+    return [model for model in apps.get_models() if issubclass(model._default_manager._queryset_class, CachedQuerySet)]
 
 
 class CachedQuerySet(QuerySet):
-    def queryset_from_cache(self, filterdict=None):
-        if filterdict is None:
-            filterdict = {}
-        # Generate a cache key based on the model name
-        cachekey = str(self.model.__name__).lower()
-
-        # Attempt to retrieve the queryset from the cache
-        queryset = cache.get(cachekey)
-        qself = self.model.objects.all()
-
-        if queryset:
-            logger.debug(f"Cache Hit On Queryset for {cachekey}")
-            logger.debug(type(queryset))
-            cache_hit_queryset = queryset
-            # If the queryset is found in the cache, return it with a flag indicating it was cached
-            # data = {
-            #     'in_cache': True,
-            #     'queryset': queryset
-            #     }
-            # query = qself.data['ps']]
-            return pickle.loads(cache_hit_queryset)
-        else:
-            logger.debug(f"Cache Miss On Queryset for {cachekey}, Setting In Cache")
-            logger.debug(type(queryset))
-            # If the queryset is not found in the cache, generate it from the database and store it in the cache
-            fresh_query = self.model.objects.filter(**filterdict)
-            cache.set(cachekey, pickle.dumps(fresh_query), settings.QUERYSET_TTL)
-            return fresh_query
+    def cache_key(self) -> str:
+        """
+        Returns the cache key of this queryset's result: the model, its generation and a digest of the compiled SQL and parameters.
+        """
+        sql, params = self.query.sql_with_params()
+        digest = hashlib.sha256(f"{self.db}\x00{sql}\x00{params!r}".encode("utf-8")).hexdigest()[:32]
+        return RESULT_CACHE_KEY.format(model=self.model._meta.label_lower, generation=generation(self.model), digest=digest)
+
+    def _cacheable(self) -> bool:
+        # Only model rows are cached: values() rows and select_related joins are not rebuilt by from_db.
+        return self._iterable_class is ModelIterable and not self.query.select_related
+
+    def _loaded_attnames(self) -> List[str]:
+        names, defer = self.query.deferred_loading
+        fields = self.model._meta.concrete_fields
+        if defer:
+            return [field.attname for field in fields if field.name not in names and field.attname not in names]
+        return [field.attname for field in fields if not names or field.primary_key or field.name in names or field.attname in names]
+
+    def from_cache(self, timeout: Optional[int] = None) -> List[models.Model]:
+        """
+        Evaluates this queryset, serving the rows from the cache when this exact query was run in the current generation.
+
+        Deferred columns stay deferred on the rebuilt rows and annotations are set as attributes, so querysets prepared
+        by `DecryptionEngine.prepare` can be cached too.
+
+        Args:
+            timeout (Optional[int]): Seconds to keep the result. Defaults to `settings.QUERYSET_TTL`.
+
+        Returns:
+            List[models.Model]: The rows.
+        """
+        if not self._cacheable():
+            return list(self)
+        attnames = self._loaded_attnames()
+        annotations = list(self.query.annotation_select)
+        cachekey = self.cache_key()
+
+        def compute() -> List[tuple]:
+            # bytea annotations arrive as memoryviews, which cannot be pickled.
+            return [tuple(bytes(value) if isinstance(value, memoryview) else value for value in row) for row in self.values_list(*attnames, *annotations)]
+
+        rows = cached_compute(cachekey, compute, settings.QUERYSET_TTL if timeout is None else timeout)
+        instances = []
+        for row in rows:
+            instance = self.model.from_db(self.db, attnames, row[: len(attnames)])
+            for name, value in zip(annotations, row[len(attnames) :]):
+                setattr(instance, name, value)
+            instances.append(instance)
+        return instances
+
+    def queryset_from_cache(self, filterdict: Optional[Dict[str, Any]] = None) -> List[models.Model]:
+        """
+        Returns the rows matching `filterdict`, served from the cache when possible.
+
+        Args:
+            filterdict (Optional[Dict[str, Any]]): Keyword filters applied before evaluating.
+
+        Returns:
+            List[models.Model]: The rows.
+        """
+        return self.filter(**(filterdict or {})).from_cache()
+
+    def update(self, **kwargs) -> int:
+        rows = super().update(**kwargs)
+        bump_generation(self.model)
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs) -> List[models.Model]:
+        created = super().bulk_create(objs, *args, **kwargs)
+        bump_generation(self.model)
+        return created
+
+    def bulk_update(self, objs, fields, batch_size=None) -> int:
+        rows = super().bulk_update(objs, fields, batch_size=batch_size)
+        bump_generation(self.model)
+        return rows
 
     queryset_from_cache.queryset_only = False
+    from_cache.queryset_only = False
+
+
+class CachedPageMixin:
+    """
+    ListView mixin that evaluates the displayed page through `from_cache`, so a page that was already rendered in the
+    current generation is read without a query. The listed queryset must be a CachedQuerySet.
+    """
+
+    def paginate_queryset(self, queryset: QuerySet, page_size: int) -> Tuple[Paginator, Page, List[models.Model], bool]:
+        paginator, page, object_list, is_paginated = super().paginate_queryset(queryset, page_size)
+        page.object_list = object_list.from_cache()
+        return paginator, page, page.object_list, is_paginated
+
+
+class CachedListAPIMixin:
+    """
+    ListAPIView mixin that evaluates the filtered queryset through `from_cache` and decrypts the rows in one batch
+    through the request's DecryptionEngine before serializing them. The listed queryset must be a CachedQuerySet.
+    """
+
+    def list(self, request: HttpRequest, *args, **kwargs) -> Response:
+        engine = for_request(request)
+        rows = engine.decrypt_instances(engine.prepare(self.filter_queryset(self.get_queryset())).from_cache())
+        return Response(self.get_serializer(rows, many=True).data)
@@ -0,0 +1,268 @@
+"""
+Module: nhhc.utils.onboarding
+
+This module contains the bulk hiring and rejection of employment applications, so a whole hiring cohort is processed
+in one request and one transaction instead of one AJAX round trip, a handful of queries and one email per applicant.
+
+Hiring a batch:
+- Generates and hashes the temporary passwords in a thread pool (`ONBOARDING_HASH_WORKERS`) before any row is locked.
+  Django's hashers spend their time in C code (`hashlib.pbkdf2_hmac`, argon2) that releases the GIL, so the hashes
+  are computed in parallel.
+- Locks the applications (`SELECT ... FOR UPDATE`), skipping the ones already hired and reporting unknown PKs.
+- Reserves the usernames with one counter upsert per distinct name (see `nhhc.utils.usernames`).
+- Inserts the `Employee`, `UserProfile` and `Compliance` rows with one `bulk_create` each and marks the applications
+  reviewed with one `bulk_update`.
+- Once the transaction commits, sends every onboarding email over one connection to the mail server. New hires whose
+  email fails are handed to `employee.tasks.reissue_onboarding_credentials`, which retries with a fresh password.
+
+Rejecting a batch marks the applications reviewed with one `bulk_update` and queues one Celery task that sends every
+rejection email over one connection.
+
+`bulk_create` and `bulk_update` send no model signals, so this module does the work the signals in `nhhc.signals`
+would: it creates the ancillary profiles, retires the cached querysets, stats and fragments of the models it wrote
+and evicts the rows it wrote from the object cache (see `nhhc.utils.tiered_cache`). Display records of the new employees are filled on their first read.
+
+The onboarding emails carry the temporary passwords, so they are sent from the web process rather than through the
+Celery broker; a retry only carries the employee IDs and issues a new password in the worker.
+
+Functions:
+- hash_passwords: Hashes passwords in a thread pool.
+- send_credentials: Emails new hires their credentials.
+- reissue_credentials: Replaces undelivered temporary passwords and emails the new ones.
+- bulk_hire: Hires a batch of applicants.
+- bulk_reject: Rejects a batch of applicants.
+
+Usage:
+    result = bulk_hire([12, 15, 16], hired_by=request.user)
+    result["hired"]  # [{"application": 12, "employee_id": 40, "username": "doe.jane"}, ...]
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from authentication.models import UserProfile
+from compliance.models import Compliance
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import models, transaction
+from employee.models import Employee
+from employee.tasks import reissue_onboarding_credentials, send_rejection_emails
+from loguru import logger
+from web.models import EmploymentApplicationModel
+
+from nhhc.utils.fragments import fragment_models
+from nhhc.utils.mailer import PostOffice
+from nhhc.utils.managers import bump_generation, cached_models
+from nhhc.utils.password_generator import RandomPasswordGenerator
+from nhhc.utils.tiered_cache import invalidate_many
+from nhhc.utils.usernames import allocate_usernames
+
+HR_MAILROOM = PostOffice("HR@netthandshome.care")
+
+
+def hash_passwords(passwords: Iterable[str], workers: Optional[int] = None) -> List[str]:
+    """
+    Hashes `passwords` with the configured password hasher, in parallel.
+
+    Args:
+        passwords (Iterable[str]): The plaintext passwords.
+        workers (Optional[int]): Passwords hashed concurrently. Defaults to `settings.ONBOARDING_HASH_WORKERS`.
+
+    Returns:
+        List[str]: The encoded hashes, in the same order.
+    """
+    passwords = list(passwords)
+    workers = min(workers or settings.ONBOARDING_HASH_WORKERS, len(passwords))
+    if workers <= 1:
+        return [make_password(password) for password in passwords]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash") as pool:
+        return list(pool.map(make_password, passwords))
+
+
+def _allocate_usernames(applications: List[EmploymentApplicationModel]) -> List[str]:
+    # One allocation per distinct name, so applicants of a batch sharing a name receive consecutive usernames.
+    names: Dict[Tuple[str, str], List[int]] = {}
+    for index, application in enumerate(applications):
+        names.setdefault((application.first_name, application.last_name), []).append(index)
+    allocated: List[str] = [""] * len(applications)
+    for (first_name, last_name), indexes in names.items():
+        for index, username in zip(indexes, allocate_usernames(first_name, last_name, len(indexes))):
+            allocated[index] = username
+    return allocated
+
+
+def _retire_cached_results(written: Iterable[type[models.Model]], rows: Iterable[models.Model] = ()) -> None:
+    # What the cache signals in `nhhc.signals` do for each save: bump now for readers inside the transaction, and again on commit; evict the rows on commit.
+    invalidated = set(cached_models()) | set(fragment_models())
+    rows = list(rows)
+
+    def retire() -> None:
+        for model in written:
+            if model in invalidated:
+                try:
+                    bump_generation(model)
+                except Exception as e:
+                    logger.warning(f"Unable to Invalidate Cached Querysets for {model._meta.label} - {e}")
+
+    def evict() -> None:
+        retire()
+        try:
+            invalidate_many(rows)
+        except Exception as e:
+            logger.warning(f"Unable to Evict {len(rows)} Cached Rows - {e}")
+
+    retire()
+    transaction.on_commit(evict)
+
+
+def _review(applications: List[EmploymentApplicationModel], reviewed_by: Employee, hired: bool) -> None:
+    for application in applications:
+        application.hired = hired
+        application.reviewed = True
+        application.reviewed_by = reviewed_by
+    EmploymentApplicationModel.objects.bulk_update(applications, ["hired", "reviewed", "reviewed_by"])
+
+
+def _lock(pks: List[int]) -> Dict[int, EmploymentApplicationModel]:
+    return {application.pk: application for application in EmploymentApplicationModel.objects.select_for_update().filter(pk__in=pks).order_by("pk")}
+
+
+def send_credentials(new_hires: List[Dict[str, Any]]) -> List[int]:
+    """
+    Emails each new hire their credentials, over one connection to the mail server.
+
+    Args:
+        new_hires (List[Dict[str, Any]]): Each new hire's `employee_id`, `first_name`, `email`, `username` and `plaintext_temp_password`.
+
+    Returns:
+        List[int]: The employee IDs whose email could not be sent.
+    """
+    messages = [HR_MAILROOM.onboarding_message(new_hire) for new_hire in new_hires]
+    failed = HR_MAILROOM.send_batch(messages)
+    return [new_hire["employee_id"] for new_hire, msg in zip(new_hires, messages) if msg in failed]
+
+
+def reissue_credentials(employee_ids: Iterable[int], workers: Optional[int] = None) -> List[int]:
+    """
+    Replaces the temporary passwords of `employee_ids`, whose previous ones were never delivered, and emails the new ones.
+
+    Args:
+        employee_ids (Iterable[int]): The employees.
+        workers (Optional[int]): Passwords hashed concurrently. Defaults to `settings.ONBOARDING_HASH_WORKERS`.
+
+    Returns:
+        List[int]: The employee IDs whose email could not be sent again.
+    """
+    employees = list(Employee.objects.filter(pk__in=list(employee_ids)).only("employee_id", "username", "data_key", "first_name", "email"))
+    passwords = [RandomPasswordGenerator.generate() for _ in employees]
+    for employee, hashed in zip(employees, hash_passwords(passwords, workers)):
+        employee.password = hashed
+    with transaction.atomic():
+        Employee.objects.bulk_update(employees, ["password"])
+        _retire_cached_results((Employee,), employees)
+    return send_credentials(
+        [
+            {"employee_id": employee.employee_id, "first_name": employee.first_name, "email": employee.email, "username": employee.username, "plaintext_temp_password": password}
+            for employee, password in zip(employees, passwords)
+        ]
+    )
+
+
+def bulk_hire(pks: Iterable[int], hired_by: Employee, workers: Optional[int] = None) -> Dict[str, List[Any]]:
+    """
+    Hires the applicants of `pks` in one transaction and emails each their credentials once it commits.
+
+    Args:
+        pks (Iterable[int]): The PKs of the employment applications.
+        hired_by (Employee): The employee hiring the applicants.
+        workers (Optional[int]): Passwords hashed concurrently. Defaults to `settings.ONBOARDING_HASH_WORKERS`.
+
+    Returns:
+        Dict[str, List[Any]]: "hired", one dict per new employee with its application, employee_id and username;
+        "skipped", the PKs of applicants already hired; "missing", the PKs matching no application.
+    """
+    pks = list(dict.fromkeys(pks))
+    passwords = [RandomPasswordGenerator.generate() for _ in pks]
+    hashes = hash_passwords(passwords, workers)
+
+    with transaction.atomic():
+        applications = _lock(pks)
+        skipped = [pk for pk in pks if pk in applications and applications[pk].hired is True]
+        eligible = [applications[pk] for pk in pks if pk in applications and applications[pk].hired is not True]
+        usernames = _allocate_usernames(eligible)
+        employees = Employee.objects.bulk_create(
+            [
+                Employee(
+                    is_superuser=False,
+                    username=username,
+                    password=hashed,
+                    is_active=True,
+                    first_name=application.first_name,
+                    last_name=application.last_name,
+                    email=application.email,
+                    street_address1=application.home_address1,
+                    street_address2=application.home_address2,
+                    state=application.state,
+                    city=application.city,
+                    zipcode=application.zipcode,
+                    application_id=application.pk,
+                    qualifications_verification=application.resume_cv,
+                )
+                for application, username, hashed in zip(eligible, usernames, hashes)
+            ]
+        )
+        profiles = UserProfile.objects.bulk_create([UserProfile(user=employee) for employee in employees])
+        compliance = Compliance.objects.bulk_create([Compliance(employee=employee) for employee in employees])
+        if eligible:
+            _review(eligible, hired_by, True)
+            _retire_cached_results((Employee, UserProfile, Compliance, EmploymentApplicationModel), [*employees, *profiles, *compliance])
+
+        new_hires = [
+            {"employee_id": employee.employee_id, "first_name": employee.first_name, "email": employee.email, "username": employee.username, "plaintext_temp_password": password}
+            for employee, password in zip(employees, passwords)
+        ]
+
+        def send_onboarding_emails() -> None:
+            failed = send_credentials(new_hires)
+            if failed:
+                logger.error(f"Onboarding Emails Failed for Employees {failed} - Queuing New Credentials")
+                reissue_onboarding_credentials.delay(failed)
+
+        transaction.on_commit(send_onboarding_emails)
+
+    logger.success(f"Bulk Hired {len(employees)} Applicants - {len(pks) - len(employees)} Skipped or Missing")
+    return {
+        "hired": [{"application": employee.application_id, "employee_id": employee.employee_id, "username": employee.username} for employee in employees],
+        "skipped": skipped,
+        "missing": [pk for pk in pks if pk not in applications],
+    }
+
+
+def bulk_reject(pks: Iterable[int], rejected_by: Employee) -> Dict[str, List[int]]:
+    """
+    Rejects the applicants of `pks` in one transaction and queues their rejection emails as one Celery task once it commits.
+
+    Args:
+        pks (Iterable[int]): The PKs of the employment applications.
+        rejected_by (Employee): The employee rejecting the applicants.
+
+    Returns:
+        Dict[str, List[int]]: "rejected", the PKs rejected; "skipped", the PKs of applicants already hired; "missing", the PKs matching no application.
+    """
+    pks = list(dict.fromkeys(pks))
+    with transaction.atomic():
+        applications = _lock(pks)
+        skipped = [pk for pk in pks if pk in applications and applications[pk].hired is True]
+        rejected = [applications[pk] for pk in pks if pk in applications and applications[pk].hired is not True]
+        if rejected:
+            _review(rejected, rejected_by, False)
+            _retire_cached_results((EmploymentApplicationModel,))
+        recipients = [{"first_name": application.first_name, "email": application.email} for application in rejected]
+        transaction.on_commit(lambda: send_rejection_emails.delay(recipients) if recipients else None)
+
+    logger.success(f"Bulk Rejected {len(rejected)} Applicants - {len(pks) - len(rejected)} Skipped or Missing")
+    return {
+        "rejected": [application.pk for application in rejected],
+        "skipped": skipped,
+        "missing": [pk for pk in pks if pk not in applications],
+    }
@@ -0,0 +1,171 @@
+"""
+Module: nhhc.utils.projection
+
+This module contains the display projection of employees: a small, already-decrypted record per employee holding only
+the fields that listings render (username, names, phone, hire date and status), kept in the `default` Redis cache.
+
+Records are written through by the `post_save` / `post_delete` signals of `Employee` (see `nhhc.signals`) once the
+transaction commits, expire after `DISPLAY_PROJECTION_TTL` seconds, and are filled from the database on a miss. With
+`DISPLAY_PROJECTION_ENCRYPT` (the default) every record is sealed with AES-GCM under a key derived from
+`BLIND_INDEX_KEY`, so plaintext personal data never sits in Redis.
+
+Classes:
+- DisplayRecord: One employee's display fields, readable as attributes by templates and `sort_within_buckets`.
+- DisplayProjection: Reads, fills and invalidates the records of one model.
+
+Usage:
+    from nhhc.utils.projection import EMPLOYEE_DISPLAY
+
+    records = EMPLOYEE_DISPLAY.get_many(pks)
+"""
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils.dateparse import parse_datetime
+from employee.models import Employee
+from loguru import logger
+
+from nhhc.utils.decryption import DecryptionEngine
+from nhhc.utils.envelope import EnvelopeError, is_sealed, seal, unseal
+from nhhc.utils.fields import blind_index_key
+
+PROJECTION_CACHE_KEY = "display:{model}:{pk}"
+
+
+class ProjectionEncoder(DjangoJSONEncoder):
+    """Serializes what DjangoJSONEncoder does, and any other display value (e.g. a PhoneNumber) as its string form."""
+
+    def default(self, o: Any) -> Any:
+        try:
+            return super().default(o)
+        except TypeError:
+            return str(o)
+
+
+class DisplayRecord(dict):
+    """One projected row. Keys are also readable as attributes, so records can stand in for instances in templates."""
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+class DisplayProjection:
+    """
+    Reads, fills and invalidates the display records of one model.
+
+    Attributes:
+        model (type[models.Model]): The projected model.
+        fields (Sequence[str]): The projected fields. Encrypted ones are decrypted when the record is built.
+        datetime_fields (Sequence[str]): Projected fields restored to datetimes when a record is read.
+        cache_alias (str): The cache the records are stored in.
+    """
+
+    def __init__(self, model: type[models.Model], fields: Sequence[str], datetime_fields: Sequence[str] = (), cache_alias: str = "default") -> None:
+        self.model = model
+        self.fields = tuple(fields)
+        self.datetime_fields = tuple(datetime_fields)
+        self.cache_alias = cache_alias
+        self.associated_data = f"display:{model._meta.label_lower}".encode("utf-8")
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def key(self, pk: Any) -> str:
+        return PROJECTION_CACHE_KEY.format(model=self.model._meta.label_lower, pk=pk)
+
+    def build(self, instance: models.Model) -> DisplayRecord:
+        """Projects `instance`, opening its encrypted fields as needed."""
+        return DisplayRecord({"pk": instance.pk, **{name: getattr(instance, name) for name in self.fields}})
+
+    def _dump(self, record: Dict[str, Any]) -> Any:
+        payload = json.dumps(record, cls=ProjectionEncoder)
+        if settings.DISPLAY_PROJECTION_ENCRYPT:
+            return seal(blind_index_key("display-projection"), payload, self.associated_data)
+        return payload
+
+    def _load(self, stored: Any) -> Optional[DisplayRecord]:
+        try:
+            if isinstance(stored, bytes) and is_sealed(stored):
+                stored = unseal(blind_index_key("display-projection"), stored, self.associated_data)
+            elif settings.DISPLAY_PROJECTION_ENCRYPT:
+                # Written before encryption was enabled; treat as a miss so it is rewritten sealed.
+                return None
+            record = DisplayRecord(json.loads(stored))
+        except (EnvelopeError, ValueError, TypeError) as e:
+            logger.warning(f"Discarding Unreadable {self.model.__name__} Display Record - {e}")
+            return None
+        for name in self.datetime_fields:
+            if record.get(name):
+                record[name] = parse_datetime(record[name])
+        return record
+
+    def write(self, instance: models.Model) -> DisplayRecord:
+        """
+        Writes the record of `instance` through to the cache.
+
+        Args:
+            instance (models.Model): A saved instance.
+
+        Returns:
+            DisplayRecord: The record written.
+        """
+        record = self.build(instance)
+        self.cache.set(self.key(instance.pk), self._dump(record), settings.DISPLAY_PROJECTION_TTL)
+        return record
+
+    def evict(self, pk: Any) -> None:
+        self.cache.delete(self.key(pk))
+
+    def get_many(self, pks: Iterable[Any], engine: Optional[DecryptionEngine] = None) -> List[DisplayRecord]:
+        """
+        Returns the records of `pks`, in the same order, filling misses from the database in one batch-decrypted query.
+
+        Args:
+            pks (Iterable[Any]): Primary keys. Keys without a row are skipped.
+            engine (Optional[DecryptionEngine]): The engine decrypting misses, e.g. the request's. Defaults to a new one.
+
+        Returns:
+            List[DisplayRecord]: The records, in the order of `pks`.
+        """
+        pks = list(pks)
+        keys = {pk: self.key(pk) for pk in pks}
+        stored = self.cache.get_many(list(keys.values()))
+        records = {}
+        for pk in pks:
+            record = self._load(stored[keys[pk]]) if keys[pk] in stored else None
+            if record is not None:
+                records[pk] = record
+        missing = [pk for pk in pks if pk not in records]
+        if missing:
+            logger.debug(f"{len(missing)} {self.model.__name__} Display Record Misses - Filling From Database")
+            engine = engine or DecryptionEngine()
+            fresh = {}
+            for instance in engine.decrypt_queryset(self.model._default_manager.filter(pk__in=missing).only(*self.fields), self.fields):
+                record = self.build(instance)
+                fresh[self.key(instance.pk)] = self._dump(record)
+                records[instance.pk] = self._load(fresh[self.key(instance.pk)])
+            self.cache.set_many(fresh, settings.DISPLAY_PROJECTION_TTL)
+        return [records[pk] for pk in pks if pk in records]
+
+    def get(self, pk: Any) -> Optional[DisplayRecord]:
+        """
+        Returns the record of `pk`, or None if no row has that key (e.g. the employee was deleted). Callers must handle None.
+        """
+        records = self.get_many([pk])
+        return records[0] if records else None
+
+
+EMPLOYEE_DISPLAY = DisplayProjection(
+    Employee,
+    fields=("employee_id", "username", "first_name", "last_name", "last_name_sort", "first_name_sort", "phone", "hire_date", "is_active", "is_superuser"),
+    datetime_fields=("hire_date",),
+)
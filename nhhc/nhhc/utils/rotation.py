@@ -0,0 +1,270 @@
+"""
+Module: nhhc.utils.rotation
+
+This module contains the re-encryption job behind the `rotate_encryption_keys` management command.
+
+Envelope-encrypted rows (see `nhhc.utils.fields`) only hold one public-key ciphertext each: the wrapped data key. Rotating
+the GPG key pair therefore re-wraps that key in SQL (`pgp_pub_decrypt_bytea` with the previous private key, then
+`pgp_pub_encrypt_bytea` with the current public key) without ever moving the sealed columns. Rows that still hold
+`sage_encrypt` ciphertext are decrypted in bulk, sealed under a data key and written back with `bulk_update`. With
+`reseal`, every sealed value is opened and sealed again too, e.g. to apply a field's `compress` option to existing rows.
+
+The table is walked in keyset-paginated batches (`pk > last_pk ORDER BY pk`), each locked with `SELECT ... FOR UPDATE`
+for the duration of its transaction so concurrent edits are never overwritten, split into primary-key ranges that run on
+parallel workers. The last primary key finished in each range is persisted in the cache after every committed batch,
+so an interrupted run resumes where it stopped. A pause between batches throttles the load on the database. Once a
+batch commits its rows are evicted from the object cache (see `nhhc.utils.tiered_cache`), which would otherwise keep
+serving the data keys wrapped for the previous key pair; cached querysets are retired when the run finishes.
+
+Rotation procedure:
+    1. Deploy with the new pair in DB_GPG_PRIVATE_KEY / DB_GPG_PUBLIC_KEY and the old private key in DB_GPG_PREVIOUS_PRIVATE_KEY.
+    2. Run `python manage.py rotate_encryption_keys`.
+    3. Remove DB_GPG_PREVIOUS_PRIVATE_KEY.
+
+Classes:
+- RotationCheckpoint: The persisted progress of one model's rotation.
+- KeyRotationJob: Re-encrypts every row of one model.
+
+Functions:
+- rotatable_models: Returns every installed model with an EnvelopeKeyField.
+"""
+
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Dict, List, Tuple
+
+from django.apps import apps
+from django.core.cache import caches
+from django.db import connections, models, transaction
+from loguru import logger
+from prometheus_client import Counter, Gauge, Histogram
+from sage_encrypt.services.setting import get_setting
+
+from nhhc.utils.decryption import DecryptionEngine
+from nhhc.utils.envelope import is_sealed
+from nhhc.utils.fields import PRIVATE_KEY_SQL, EnvelopeEncryptedMixin, EnvelopeKeyField, StoredValue, envelope_data_key, private_key_params, wrap_data_key
+from nhhc.utils.managers import bump_generation
+from nhhc.utils.tiered_cache import invalidate_many
+
+REWRAP_SQL = (
+    "UPDATE {table} SET {key} = pgp_pub_encrypt_bytea(pgp_pub_decrypt_bytea({key}, " + PRIVATE_KEY_SQL.format(ciphertext="{key}") + "), dearmor(%s)) "
+    "WHERE {pk} = ANY(%s) AND {key} IS NOT NULL AND pgp_key_id({key}) <> pgp_key_id(dearmor(%s))"
+)
+CHECKPOINT_CACHE_KEY = "key-rotation:{model}:{fingerprint}"
+
+rotation_rows = Counter("key_rotation_rows", "Rows handled by the encryption key rotation job.", ["model", "action"])
+rotation_batch_duration = Histogram("key_rotation_batch_duration", "Duration of one encryption key rotation batch.", ["model"])
+rotation_progress = Gauge("key_rotation_progress", "Fraction of rows scanned by the encryption key rotation job.", ["model"])
+
+
+def rotatable_models() -> List[type[models.Model]]:
+    """
+    Returns every installed model with an EnvelopeKeyField.
+
+    Returns:
+        List[type[models.Model]]: The models whose rows can be rotated.
+    """
+    return [model for model in apps.get_models() if any(isinstance(field, EnvelopeKeyField) for field in model._meta.concrete_fields)]
+
+
+class RotationCheckpoint:
+    """
+    The persisted progress of one model's rotation: the primary-key ranges being walked and the last key finished in each.
+
+    Stored without a timeout in the given cache. The cache key includes a fingerprint of the current public key, so a
+    later rotation to another key starts over instead of resuming.
+
+    Attributes:
+        cache_key (str): Where the checkpoint is stored.
+        ranges (List[Tuple[int, int]]): Inclusive primary-key ranges, one per worker.
+        positions (Dict[int, int]): Last primary key committed, by range index.
+        total (int): Number of rows when the run started, for progress reporting.
+    """
+
+    def __init__(self, model: type[models.Model], public_key: str, cache_alias: str = "default") -> None:
+        fingerprint = hashlib.sha256(public_key.encode("utf-8")).hexdigest()[:16]
+        self.cache = caches[cache_alias]
+        self.cache_key = CHECKPOINT_CACHE_KEY.format(model=model._meta.label_lower, fingerprint=fingerprint)
+        self.ranges: List[Tuple[int, int]] = []
+        self.positions: Dict[int, int] = {}
+        self.total = 0
+        self._lock = Lock()
+
+    def load(self) -> bool:
+        """
+        Loads a saved checkpoint.
+
+        Returns:
+            bool: True if one was found.
+        """
+        saved = self.cache.get(self.cache_key)
+        if not saved:
+            return False
+        self.ranges = [tuple(bounds) for bounds in saved["ranges"]]
+        self.positions = {int(index): position for index, position in saved["positions"].items()}
+        self.total = saved["total"]
+        return True
+
+    def advance(self, index: int, position: int) -> None:
+        """
+        Records that range `index` is committed up to `position` and persists the checkpoint.
+        """
+        with self._lock:
+            self.positions[index] = position
+            self.cache.set(self.cache_key, {"ranges": self.ranges, "positions": self.positions, "total": self.total}, timeout=None)
+
+    def clear(self) -> None:
+        self.cache.delete(self.cache_key)
+
+    @property
+    def scanned(self) -> int:
+        """Approximate number of rows scanned, assuming primary keys are dense within each range."""
+        return sum(self.positions.get(index, low - 1) - low + 1 for index, (low, high) in enumerate(self.ranges))
+
+
+class KeyRotationJob:
+    """
+    Re-encrypts every row of one model under the current key pair.
+
+    Attributes:
+        model (type[models.Model]): The model to rotate.
+        batch_size (int): Rows per keyset page, and per transaction.
+        workers (int): Number of primary-key ranges processed in parallel, each on its own connection.
+        pause (float): Seconds each worker sleeps after every batch.
+        reseal (bool): Seal every value again, not only values still holding `sage_encrypt` ciphertext.
+        using (str): The database alias.
+        checkpoint (RotationCheckpoint): The persisted progress.
+    """
+
+    def __init__(self, model: type[models.Model], batch_size: int = 500, workers: int = 1, pause: float = 0.0, reseal: bool = False, using: str = "default", cache_alias: str = "default") -> None:
+        self.model = model
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
+        self.pause = max(0.0, pause)
+        self.reseal = reseal
+        self.using = using
+        self.label = model._meta.label
+        self.key_field = next(field for field in model._meta.concrete_fields if isinstance(field, EnvelopeKeyField))
+        self.envelope_fields = [field for field in model._meta.concrete_fields if isinstance(field, EnvelopeEncryptedMixin)]
+        self.public_key = get_setting(connections[using], "ENCRYPT_PUBLIC_KEY")
+        self.checkpoint = RotationCheckpoint(model, self.public_key, cache_alias)
+
+    def plan(self, reset: bool = False) -> None:
+        """
+        Loads the saved checkpoint, or splits the current primary-key span into one range per worker.
+
+        Args:
+            reset (bool): Ignore any saved checkpoint.
+        """
+        if not reset and self.checkpoint.load():
+            logger.info(f"Resuming {self.label} Key Rotation From Checkpoint - {self.checkpoint.scanned}/{self.checkpoint.total} Rows Scanned")
+            return
+        queryset = self.model._default_manager.using(self.using)
+        bounds = queryset.aggregate(low=models.Min("pk"), high=models.Max("pk"))
+        self.checkpoint.total = queryset.count()
+        self.checkpoint.positions = {}
+        if bounds["low"] is None:
+            self.checkpoint.ranges = []
+            return
+        # Rows added after this point are written under the current key, so the span can be fixed now.
+        span = bounds["high"] - bounds["low"] + 1
+        step = -(-span // self.workers)
+        self.checkpoint.ranges = [(low, min(low + step - 1, bounds["high"])) for low in range(bounds["low"], bounds["high"] + 1, step)]
+
+    def _reseal(self, rows: List[models.Model], engine: DecryptionEngine) -> int:
+        """
+        Seals every value still holding `sage_encrypt` ciphertext (every value, with `reseal`) and writes the rows back with `bulk_update`.
+
+        Returns:
+            int: The number of rows resealed.
+        """
+        legacy = [row for row in rows if self.reseal or any(isinstance(row.__dict__.get(field.attname), StoredValue) and not is_sealed(row.__dict__[field.attname]) for field in self.envelope_fields)]
+        if not legacy:
+            return 0
+        engine.decrypt_instances(legacy, [field.name for field in self.envelope_fields])
+        for row in legacy:
+            for field in self.envelope_fields:
+                if self.reseal:
+                    getattr(row, field.attname)
+                row.__dict__[field.attname] = field.pre_save(row, add=False)
+            # Rows without a key get one here; either way the key is written wrapped for the current public key.
+            row.__dict__[self.key_field.attname] = wrap_data_key(envelope_data_key(row), self.using)
+        self.model._default_manager.using(self.using).bulk_update(legacy, [self.key_field.name, *[field.name for field in self.envelope_fields]])
+        return len(legacy)
+
+    def _rewrap(self, pks: List[int]) -> int:
+        """
+        Re-wraps the data keys of `pks` that are not yet wrapped for the current public key.
+
+        Returns:
+            int: The number of keys re-wrapped.
+        """
+        connection = connections[self.using]
+        sql = REWRAP_SQL.format(
+            table=connection.ops.quote_name(self.model._meta.db_table), key=connection.ops.quote_name(self.key_field.column), pk=connection.ops.quote_name(self.model._meta.pk.column)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [*private_key_params(connection), self.public_key, pks, self.public_key])
+            return cursor.rowcount
+
+    def _run_range(self, index: int) -> None:
+        low, high = self.checkpoint.ranges[index]
+        position = self.checkpoint.positions.get(index, low - 1)
+        engine = DecryptionEngine(using=self.using, workers=1)
+        lookups = [lookup for lookup in getattr(self.model._default_manager, "cache_lookups", ()) if lookup != "pk"]
+        base = self.model._default_manager.using(self.using).only(self.model._meta.pk.attname, *lookups, *[field.attname for field in self.envelope_fields])
+        while position < high:
+            with rotation_batch_duration.labels(self.label).time(), transaction.atomic(using=self.using):
+                # Locked until the batch commits, so an edit made meanwhile waits instead of being overwritten by the resealed values.
+                batch = base.filter(pk__gt=position, pk__lte=high).order_by("pk").select_for_update(of=("self",))
+                rows = list(engine.prepare(batch, [field.name for field in self.envelope_fields])[: self.batch_size])
+                if not rows:
+                    break
+                resealed = self._reseal(rows, engine)
+                rewrapped = self._rewrap([row.pk for row in rows])
+                transaction.on_commit(lambda rows=rows: invalidate_many(rows), using=self.using)
+            position = rows[-1].pk
+            self.checkpoint.advance(index, position)
+            rotation_rows.labels(self.label, "scanned").inc(len(rows))
+            rotation_rows.labels(self.label, "resealed").inc(resealed)
+            rotation_rows.labels(self.label, "rewrapped").inc(rewrapped)
+            if self.checkpoint.total:
+                rotation_progress.labels(self.label).set(min(1.0, self.checkpoint.scanned / self.checkpoint.total))
+            if self.pause:
+                time.sleep(self.pause)
+
+    def _run_range_in_pool(self, index: int) -> None:
+        # Each pool thread opens its own connection; close it once the range is done. The caller's connection is left open.
+        try:
+            self._run_range(index)
+        finally:
+            connections[self.using].close()
+
+    def run(self, reset: bool = False) -> Dict[str, float]:
+        """
+        Rotates every row of the model, resuming from the saved checkpoint unless `reset` is set.
+
+        Args:
+            reset (bool): Start over instead of resuming.
+
+        Returns:
+            Dict[str, float]: Rows scanned and elapsed seconds.
+        """
+        started = time.monotonic()
+        self.plan(reset=reset)
+        indexes = range(len(self.checkpoint.ranges))
+        if self.workers > 1 and len(indexes) > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                list(pool.map(self._run_range_in_pool, indexes))
+        else:
+            for index in indexes:
+                self._run_range(index)
+        report = {"rows": self.checkpoint.scanned, "seconds": round(time.monotonic() - started, 2)}
+        self.checkpoint.clear()
+        # Re-wrapped keys are written in raw SQL, so cached querysets still hold the old ciphertext.
+        bump_generation(self.model)
+        rotation_progress.labels(self.label).set(1.0)
+        logger.info(f"Rotated {self.label} - {report['rows']} Rows in {report['seconds']}s")
+        return report
@@ -0,0 +1,167 @@
+"""
+Module: nhhc.utils.stampede
+
+This module contains stampede-safe caching for values that are expensive to recompute and requested concurrently:
+public pages, the sitemap and cached queryset results.
+
+Every entry is stored with the time its computation took and the moment it goes stale, and is kept in Redis for
+`STAMPEDE_STALE_TTL` seconds longer than its TTL. Reads then combine three protections:
+- Probabilistic early recomputation ("XFetch"): each read recomputes ahead of expiry with a probability that grows
+  as expiry nears and with how long the value takes to compute (scaled by `STAMPEDE_BETA`), so refreshes are spread
+  out instead of all landing at the expiry instant.
+- Single-flight locking: only the worker that wins an atomic `cache.add` on the entry's lock key recomputes. The
+  lock holds an owner token and is released by compare-and-delete, so an expired holder never frees another's lock.
+- Stale-while-revalidate: while one worker recomputes an expired entry, the others keep serving the stale copy;
+  on a cold miss they wait briefly for the winner instead of all hitting the database.
+
+Functions:
+- cached_compute: Returns a cached value, recomputing it stampede-safely.
+- stampede_cache_page: A `cache_page` replacement for views, built on `cached_compute`.
+
+Usage:
+    rows = cached_compute("qs:...", lambda: list(queryset), timeout=300)
+
+    @stampede_cache_page(settings.CACHE_TTL)
+    def view(request): ...
+"""
+
+import math
+import random
+import time
+from functools import wraps
+from typing import Any, Callable, Optional
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_cache_key, learn_cache_key, patch_response_headers
+from loguru import logger
+
+LOCK_SUFFIX = ":lock"
+RELEASE_LOCK_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) else return 0 end"
+LOCK_POLL_INTERVAL = 0.05
+
+
+def _should_recompute(delta: float, expires: float, beta: float) -> bool:
+    # XFetch: recompute once `now - delta * beta * ln(U)` passes the expiry, with U uniform in (0, 1].
+    return time.time() - delta * beta * math.log(1.0 - random.random()) >= expires
+
+
+def _store(key: str, value: Any, delta: float, timeout: int) -> None:
+    cache.set(key, (value, delta, time.time() + timeout), timeout + settings.STAMPEDE_STALE_TTL)
+
+
+def _acquire(lock_key: str) -> Optional[str]:
+    # The token identifies the holder, so a worker whose lock expired mid-computation cannot release its successor's.
+    token = uuid4().hex
+    return token if cache.add(lock_key, token, settings.STAMPEDE_LOCK_TIMEOUT) else None
+
+
+def _release(lock_key: str, token: str) -> None:
+    client = getattr(cache, "client", None)
+    if client is not None and hasattr(client, "encode"):
+        # django-redis: compare-and-delete atomically in Redis, against the token as the backend serialized it.
+        client.get_client(write=True).eval(RELEASE_LOCK_SCRIPT, 1, cache.make_key(lock_key), client.encode(token))
+    elif cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+
+def cached_compute(key: str, compute: Callable[[], Any], timeout: int, beta: Optional[float] = None, should_store: Callable[[Any], bool] = lambda value: True) -> Any:
+    """
+    Returns the value cached under `key`, recomputing it with `compute` without letting concurrent callers stampede.
+
+    Args:
+        key (str): The cache key.
+        compute (Callable[[], Any]): Produces the value.
+        timeout (int): Seconds the value is fresh.
+        beta (Optional[float]): Eagerness of early recomputation. Defaults to `settings.STAMPEDE_BETA`; 0 disables it.
+        should_store (Callable[[Any], bool]): Whether a computed value may be cached (e.g. only successful responses).
+
+    Returns:
+        Any: The cached or freshly computed value.
+    """
+    beta = settings.STAMPEDE_BETA if beta is None else beta
+    lock_key = f"{key}{LOCK_SUFFIX}"
+    entry = cache.get(key)
+    if entry is not None:
+        value, delta, expires = entry
+        if not _should_recompute(delta, expires, beta):
+            return value
+        token = _acquire(lock_key)
+        if token is None:
+            # Another worker is recomputing; serve the stale (or soon-to-be-stale) copy meanwhile.
+            return value
+        logger.debug(f"Recomputing {key} {'After Expiry' if time.time() >= expires else 'Early'}")
+    else:
+        token = _acquire(lock_key)
+        if token is None:
+            deadline = time.monotonic() + settings.STAMPEDE_LOCK_TIMEOUT
+            while time.monotonic() < deadline:
+                time.sleep(LOCK_POLL_INTERVAL)
+                entry = cache.get(key)
+                if entry is not None:
+                    return entry[0]
+                if cache.get(lock_key) is None:
+                    break
+            logger.warning(f"Gave Up Waiting for {key} to Be Computed - Computing Without the Lock")
+            return compute()
+    try:
+        started = time.monotonic()
+        value = compute()
+        if should_store(value):
+            _store(key, value, time.monotonic() - started, timeout)
+        return value
+    finally:
+        _release(lock_key, token)
+
+
+def _cacheable_response(response: HttpResponse) -> bool:
+    return response.status_code == 200 and not response.streaming and not response.cookies and "private" not in response.get("Cache-Control", "")
+
+
+def stampede_cache_page(timeout: int, key_prefix: str = "stampede") -> Callable:
+    """
+    Caches a view's GET / HEAD responses like `cache_page`, through `cached_compute`.
+
+    Cache keys follow Django's page cache (URL plus the headers named in the response's Vary), so pages that vary by
+    cookie or language are cached separately. Responses that set cookies, are private or are not 200s are not cached.
+
+    Args:
+        timeout (int): Seconds a page is fresh.
+        key_prefix (str): Namespace of the page keys.
+
+    Returns:
+        Callable: The view decorator.
+    """
+
+    def decorator(view: Callable[..., HttpResponse]) -> Callable[..., HttpResponse]:
+        @wraps(view)
+        def wrapped(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+            if request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+
+            def render() -> HttpResponse:
+                response = view(request, *args, **kwargs)
+                if hasattr(response, "render") and callable(response.render):
+                    response = response.render()
+                if _cacheable_response(response):
+                    patch_response_headers(response, timeout)
+                    # The header list outlives the page it points to, and is renewed with every render, so the page
+                    # key stays resolvable while a stale copy is being served and the lock keeps guarding recomputes.
+                    learn_cache_key(request, response, timeout + settings.STAMPEDE_STALE_TTL, key_prefix, cache=cache)
+                return response
+
+            key = get_cache_key(request, key_prefix, "GET", cache=cache)
+            if key is None:
+                # First request for this URL: the Vary headers that shape the key are learned from the response.
+                started = time.monotonic()
+                response = render()
+                if _cacheable_response(response):
+                    _store(get_cache_key(request, key_prefix, "GET", cache=cache), response, time.monotonic() - started, timeout)
+                return response
+            return cached_compute(key, render, timeout, should_store=_cacheable_response)
+
+        return wrapped
+
+    return decorator
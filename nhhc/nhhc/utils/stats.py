@@ -0,0 +1,124 @@
+"""
+Module: nhhc.utils.stats
+
+This module contains aggregate statistics of a model computed in one conditional-aggregate query
+(`COUNT(*) FILTER (WHERE ...)` per bucket), and a paginator that takes its total from them.
+
+Results are cached under the model's data generation (see `nhhc.utils.managers`), which every save, delete,
+`update`, `bulk_create` and `bulk_update` advances, so a cached result is always exact and is recomputed once,
+stampede-safely, after the data changes. A list view mixing in AggregateStatsMixin renders its counts and feeds its
+paginator the total from the same cached result, so a page load no longer runs bucket counts or the paginator's own
+`COUNT`. The unreviewed badges of the portal navigation (the `app_count` and `client_count` tags) read the same
+result. A cached result is recomputed from the table instead of being adjusted by increments, so it cannot drift and
+needs no periodic reconciliation.
+
+Classes:
+- AggregateStats: Bucket counts of one model.
+- KnownCountPaginator: Paginator whose count is given instead of queried.
+- AggregateStatsMixin: ListView mixin exposing the stats and paginating with their total.
+
+Usage:
+    class EmploymentApplicationListView(AggregateStatsMixin, ListView):
+        stats = APPLICATION_STATS
+
+    APPLICATION_STATS.get()  # {"total": 42, "reviewed": 40, "unreviewed": 2}
+"""
+
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import models
+from django.db.models import Count, Q
+from django.utils.functional import cached_property
+from web.models import ClientInterestSubmission, EmploymentApplicationModel
+
+from nhhc.utils.managers import generation
+from nhhc.utils.stampede import cached_compute
+
+STATS_CACHE_KEY = "stats:{model}:{name}:{generation}"
+# Rows whose `reviewed` is NULL count as unreviewed.
+REVIEW_BUCKETS = {"reviewed": Q(reviewed=True), "unreviewed": Q(reviewed=False) | Q(reviewed__isnull=True)}
+
+
+class AggregateStats:
+    """
+    The total and per-bucket row counts of one model.
+
+    Attributes:
+        name (str): Distinguishes stats of the same model in the cache.
+        model (type[models.Model]): The counted model.
+        buckets (Dict[str, Q]): The condition of each bucket.
+    """
+
+    def __init__(self, name: str, model: type[models.Model], buckets: Dict[str, Q]) -> None:
+        self.name = name
+        self.model = model
+        self.buckets = dict(buckets)
+
+    def key(self) -> str:
+        return STATS_CACHE_KEY.format(model=self.model._meta.label_lower, name=self.name, generation=generation(self.model))
+
+    def compute(self) -> Dict[str, int]:
+        """
+        Counts every bucket and the total in one query.
+
+        Returns:
+            Dict[str, int]: The counts, with "total".
+        """
+        return self.model._default_manager.aggregate(total=Count("pk"), **{bucket: Count("pk", filter=condition) for bucket, condition in self.buckets.items()})
+
+    def get(self, timeout: Optional[int] = None) -> Dict[str, int]:
+        """
+        Returns the counts of the current data generation, computing them on a miss.
+
+        Args:
+            timeout (Optional[int]): Seconds to keep the result. Defaults to `settings.STATS_CACHE_TTL`.
+
+        Returns:
+            Dict[str, int]: The counts, with "total".
+        """
+        return cached_compute(self.key(), self.compute, settings.STATS_CACHE_TTL if timeout is None else timeout)
+
+
+class KnownCountPaginator(Paginator):
+    """
+    Paginator whose `count` is passed in (e.g. from AggregateStats), falling back to counting when it is not.
+    """
+
+    def __init__(self, object_list: Any, per_page: int, orphans: int = 0, allow_empty_first_page: bool = True, count: Optional[int] = None, **kwargs) -> None:
+        super().__init__(object_list, per_page, orphans=orphans, allow_empty_first_page=allow_empty_first_page, **kwargs)
+        self.known_count = count
+
+    @cached_property
+    def count(self) -> int:
+        if self.known_count is not None:
+            return self.known_count
+        return super().count
+
+
+class AggregateStatsMixin:
+    """
+    ListView mixin that exposes `stats.get()` to the view and gives its total to the paginator.
+
+    The total is only used while the listed queryset is unfiltered, since it counts every row of the model.
+
+    Attributes:
+        stats (AggregateStats): The stats of the listed model.
+    """
+
+    stats: AggregateStats
+    paginator_class = KnownCountPaginator
+
+    def get_stats(self) -> Dict[str, int]:
+        if not hasattr(self, "_stats"):
+            self._stats = self.stats.get()
+        return self._stats
+
+    def get_paginator(self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs) -> Paginator:
+        count = None if queryset.query.has_filters() else self.get_stats()["total"]
+        return self.paginator_class(queryset, per_page, orphans=orphans, allow_empty_first_page=allow_empty_first_page, count=count, **kwargs)
+
+
+APPLICATION_STATS = AggregateStats("review", EmploymentApplicationModel, REVIEW_BUCKETS)
+CLIENT_REQUEST_STATS = AggregateStats("review", ClientInterestSubmission, REVIEW_BUCKETS)
@@ -0,0 +1,148 @@
+"""
+Module: nhhc.utils.streaming
+
+This module contains streaming JSON exports, so dumping a whole table costs memory in proportion to one chunk of
+rows rather than to the table.
+
+Rows are read one page at a time, seeking past the last primary key of the previous page, since server-side cursors
+are disabled (`DISABLE_SERVER_SIDE_CURSORS`) and `QuerySet.iterator` would buffer the whole result. Each page is
+decrypted and opened in batches (see `nhhc.utils.decryption`), encoded and handed to a `StreamingHttpResponse`, either
+as one JSON array or as newline-delimited JSON (NDJSON). When the client accepts it, the body is gzipped on the fly.
+
+Functions:
+- decrypted_rows: Yields the plaintext values of a queryset's rows, chunk by chunk.
+- encode_rows: Yields the encoded body of an export.
+- gzip_chunks: Compresses a stream of byte chunks incrementally.
+- streaming_json_response: Returns the export response in the format the client asked for.
+
+Usage:
+    engine = for_request(request)
+    return streaming_json_response(request, decrypted_rows(ClientInterestSubmission.objects.all(), engine))
+
+    GET /inquiries/all?format=ndjson          (or Accept: application/x-ndjson)
+    Accept-Encoding: gzip                       (gzipped body)
+"""
+
+import zlib
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+from django.http import HttpRequest, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+
+from nhhc.utils.decryption import DecryptionEngine
+from nhhc.utils.fields import plaintext_values
+
+JSON_CONTENT_TYPE = "application/json"
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+
+def decrypted_rows(queryset: QuerySet, engine: Optional[DecryptionEngine] = None, chunk_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yields one dict of plaintext field values per row of `queryset`, in primary key order, loading and decrypting
+    `chunk_size` rows at a time.
+
+    Args:
+        queryset (QuerySet): The rows to export. Must not be sliced.
+        engine (Optional[DecryptionEngine]): The engine decrypting the rows, e.g. the request's. Defaults to a new one.
+        chunk_size (Optional[int]): Rows per database fetch and per decryption batch. Defaults to `settings.EXPORT_STREAM_CHUNK_SIZE`.
+
+    Yields:
+        Dict[str, Any]: Field values keyed by attname, as returned by `plaintext_values`.
+    """
+    engine = engine or DecryptionEngine()
+    chunk_size = chunk_size or settings.EXPORT_STREAM_CHUNK_SIZE
+    queryset = engine.prepare(queryset).order_by("pk")
+    last = None
+    while True:
+        chunk = list((queryset if last is None else queryset.filter(pk__gt=last))[:chunk_size])
+        if not chunk:
+            return
+        last = chunk[-1].pk
+        yield from plaintext_values(engine.open_parallel(engine.decrypt_instances(chunk)))
+        if len(chunk) < chunk_size:
+            return
+
+
+def encode_rows(rows: Iterable[Dict[str, Any]], ndjson: bool = False, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Yields the UTF-8 body of `rows` as a JSON array or as NDJSON, one piece per `chunk_size` rows.
+
+    Args:
+        rows (Iterable[Dict[str, Any]]): The rows.
+        ndjson (bool): Whether to emit one JSON document per line instead of an array.
+        chunk_size (Optional[int]): Rows encoded per yielded piece. Defaults to `settings.EXPORT_STREAM_CHUNK_SIZE`.
+
+    Yields:
+        bytes: Consecutive pieces of the body.
+    """
+    encoder = DjangoJSONEncoder()
+    rows = iter(rows)
+    chunk_size = chunk_size or settings.EXPORT_STREAM_CHUNK_SIZE
+    first = True
+    if not ndjson:
+        yield b"["
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        if ndjson:
+            yield "".join(f"{encoder.encode(row)}\n" for row in chunk).encode("utf-8")
+        else:
+            yield (("" if first else ",") + ",".join(encoder.encode(row) for row in chunk)).encode("utf-8")
+        first = False
+    if not ndjson:
+        yield b"]"
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """
+    Compresses `chunks` into one gzip stream incrementally, flushing after each chunk so the client receives data as it is produced.
+
+    Args:
+        chunks (Iterable[bytes]): The uncompressed body.
+        level (int): The compression level.
+
+    Yields:
+        bytes: Consecutive pieces of the gzip stream.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def _accepts_gzip(request: HttpRequest) -> bool:
+    return settings.EXPORT_STREAM_GZIP and "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", "").lower()
+
+
+def _wants_ndjson(request: HttpRequest) -> bool:
+    return request.GET.get("format") == "ndjson" or NDJSON_CONTENT_TYPE in request.META.get("HTTP_ACCEPT", "")
+
+
+def streaming_json_response(request: HttpRequest, rows: Iterable[Dict[str, Any]], status: int = 200) -> StreamingHttpResponse:
+    """
+    Returns `rows` as a streamed JSON array, or NDJSON when asked for with `?format=ndjson` or `Accept: application/x-ndjson`,
+    gzipped when the client sends `Accept-Encoding: gzip`.
+
+    Args:
+        request (HttpRequest): The request, whose query string and headers pick the format and encoding.
+        rows (Iterable[Dict[str, Any]]): The rows, consumed lazily while the response is sent.
+        status (int): The response status code.
+
+    Returns:
+        StreamingHttpResponse: The response.
+    """
+    ndjson = _wants_ndjson(request)
+    body = encode_rows(rows, ndjson=ndjson)
+    gzipped = _accepts_gzip(request)
+    response = StreamingHttpResponse(gzip_chunks(body) if gzipped else body, status=status, content_type=NDJSON_CONTENT_TYPE if ndjson else JSON_CONTENT_TYPE)
+    if gzipped:
+        response["Content-Encoding"] = "gzip"
+    patch_vary_headers(response, ("Accept", "Accept-Encoding"))
+    return response
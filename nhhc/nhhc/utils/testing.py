@@ -6,6 +6,7 @@ import gnupg
 from django.conf import settings
 from faker import Faker
 from loguru import logger
+from model_bakery import baker
 
 MockData = Faker()
 
@@ -216,3 +217,13 @@ def generate_random_encrypted_char():
         return ciphertext.data
     logger.error("Error: Encryption failed.")
     raise RuntimeError("Value Not Encrypted")
+
+
+# The cache of every test that exercises a cache layer: per-process, so no test depends on or pollutes a Redis server.
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def register_encrypted_field_generators() -> None:
+    """Registers the `model_bakery` generators of the envelope-encrypted fields, which it cannot generate on its own."""
+    baker.generators.add("nhhc.utils.fields.EnvelopeEncryptedCharField", generate_random_encrypted_char)
+    baker.generators.add("nhhc.utils.fields.EnvelopeEncryptedEmailField", generate_random_encrypted_email)
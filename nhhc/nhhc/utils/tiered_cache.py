@@ -0,0 +1,238 @@
+"""
+Module: nhhc.utils.tiered_cache
+
+This module contains a two-tier object cache for rows that are loaded on almost every request: the `Employee` behind
+`request.user` and its `Compliance` and `UserProfile` rows.
+
+The first tier is a bounded, TTL'd LRU in each worker process; the second is the `default` Redis cache. Both hold the
+raw column values of a row (encrypted columns stay sealed, exactly as stored in PostgreSQL), and every read rebuilds
+a fresh instance with `Model.from_db`, so instances are never shared between requests. Saving or deleting a row
+(`post_save` / `post_delete`, see `nhhc.signals`) deletes it from Redis and publishes its keys on a Redis pub/sub
+channel; every worker runs a listener thread that evicts those keys from its own LRU. Writes that send no signals
+(`bulk_update`, raw SQL) call `invalidate_many` themselves.
+
+Password hashes and blind indexes are never cached: they are left deferred on the rebuilt instance and loaded from the
+database if read. For user models the cache holds the session auth hash instead, which Django checks on every
+request, so a session is verified without loading the password.
+
+Classes:
+- LocalTTLCache: Bounded, thread-safe, per-process LRU whose entries expire.
+- TieredCacheManager: Manager exposing `get_cached`.
+
+Functions:
+- invalidate: Removes an instance from both tiers in every worker.
+- invalidate_many: Removes instances from both tiers in every worker, with one publish.
+- tiered_models: Returns every installed model whose default manager is a TieredCacheManager.
+
+Usage:
+    employee = Employee.objects.get_cached(request.user.pk)
+    profile = UserProfile.objects.get_cached(employee.pk, field="user_id")
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, List, Optional, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+from loguru import logger
+
+from nhhc.utils.fields import BlindIndexField
+
+OBJECT_CACHE_KEY = "object:{model}:{field}:{value}"
+INVALIDATION_CHANNEL = "object-cache:invalidate"
+_MISSING = object()
+
+
+class LocalTTLCache:
+    """
+    Bounded, thread-safe mapping with least-recently-used eviction and a time-to-live per entry.
+
+    Attributes:
+        maxsize (int): The maximum number of entries held at once.
+        ttl (float): Seconds an entry stays valid.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def evict(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+local_cache = LocalTTLCache(maxsize=settings.OBJECT_CACHE_LOCAL_SIZE, ttl=settings.OBJECT_CACHE_LOCAL_TTL)
+_listener_pid: Optional[int] = None
+_listener_lock = threading.Lock()
+
+
+def _redis_connection():
+    """Returns the raw client of the `default` cache, or None when it is not a django-redis cache (e.g. in tests)."""
+    try:
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+    except (ImportError, NotImplementedError, AttributeError):
+        return None
+
+
+def _listen() -> None:
+    while True:
+        connection = _redis_connection()
+        if connection is None:
+            return
+        try:
+            pubsub = connection.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+            for message in pubsub.listen():
+                local_cache.evict(message["data"].decode("utf-8").split("\n"))
+        except Exception as e:
+            # Whatever was missed meanwhile expires with the local TTL.
+            logger.warning(f"Object Cache Invalidation Listener Disconnected - {e}")
+            local_cache.clear()
+            time.sleep(1)
+
+
+def _ensure_listener() -> None:
+    """Starts the invalidation listener once per process (gunicorn forks workers after import, so this runs lazily)."""
+    global _listener_pid
+    if _listener_pid == os.getpid():
+        return
+    with _listener_lock:
+        if _listener_pid != os.getpid():
+            local_cache.clear()
+            threading.Thread(target=_listen, name="object-cache-invalidation", daemon=True).start()
+            _listener_pid = os.getpid()
+
+
+def _key(model: type[models.Model], field: str, value: Any) -> str:
+    return OBJECT_CACHE_KEY.format(model=model._meta.label_lower, field=field, value=value)
+
+
+def _keys_of(instance: models.Model) -> List[str]:
+    manager = type(instance)._default_manager
+    return [_key(type(instance), field, getattr(instance, "pk" if field == "pk" else field)) for field in manager.cache_lookups]
+
+
+def invalidate(instance: models.Model) -> None:
+    """
+    Removes `instance` from Redis and from the local tier of every worker.
+
+    Args:
+        instance (models.Model): A saved or deleted instance of a model managed by a TieredCacheManager.
+    """
+    invalidate_many([instance])
+
+
+def invalidate_many(instances: Iterable[models.Model]) -> None:
+    """
+    Removes `instances` from Redis and from the local tier of every worker, e.g. after a `bulk_update`.
+
+    Args:
+        instances (Iterable[models.Model]): Saved or deleted instances, with their `cache_lookups` fields loaded. Instances of models not managed by a TieredCacheManager are skipped.
+    """
+    keys = [key for instance in instances if isinstance(type(instance)._default_manager, TieredCacheManager) for key in _keys_of(instance)]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    local_cache.evict(keys)
+    connection = _redis_connection()
+    if connection is not None:
+        connection.publish(INVALIDATION_CHANNEL, "\n".join(keys).encode("utf-8"))
+
+
+def tiered_models() -> List[type[models.Model]]:
+    """
+    Returns every installed model whose default manager is a TieredCacheManager.
+
+    Returns:
+        List[type[models.Model]]: The models cached per object.
+    """
+    return [model for model in apps.get_models() if isinstance(model._default_manager, TieredCacheManager)]
+
+
+class TieredCacheManager(models.Manager):
+    """
+    Manager exposing `get_cached`, a two-tier cached `get` by primary key or another unique field.
+
+    Attributes:
+        cache_lookups (Tuple[str, ...]): The unique fields rows can be fetched by. Every one is invalidated on save.
+        cache_exclude (Tuple[str, ...]): Columns never cached, besides blind indexes. They are deferred on cached instances.
+    """
+
+    cache_lookups: Tuple[str, ...] = ("pk",)
+    cache_exclude: Tuple[str, ...] = ("password",)
+
+    def __init__(self, *args, cache_lookups: Optional[Iterable[str]] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        if cache_lookups is not None:
+            self.cache_lookups = tuple(cache_lookups)
+
+    def get_cached(self, value: Any, field: str = "pk") -> models.Model:
+        """
+        Returns the row whose `field` equals `value`, from this worker's LRU, then Redis, then the database.
+
+        Args:
+            value (Any): The looked-up value.
+            field (str): One of `cache_lookups`.
+
+        Returns:
+            models.Model: A fresh instance.
+
+        Raises:
+            DoesNotExist: If no row matches.
+        """
+        if field not in self.cache_lookups:
+            raise ValueError(f"{self.model.__name__} Rows Are Not Cached by {field}")
+        _ensure_listener()
+        key = _key(self.model, field, value)
+        row = local_cache.get(key)
+        if row is _MISSING:
+            row = cache.get(key)
+            if row is None:
+                instance = self.get(**{field: value})
+                session_auth_hash = instance.get_session_auth_hash() if hasattr(instance, "get_session_auth_hash") else None
+                row = (tuple(instance.__dict__.get(name) for name in self._attnames()), session_auth_hash)
+                cache.set(key, row, settings.OBJECT_CACHE_TTL)
+            local_cache.set(key, row)
+        values, session_auth_hash = row
+        instance = self.model.from_db(self.db, self._attnames(), values)
+        if session_auth_hash is not None:
+            instance._cached_session_auth_hash = session_auth_hash
+        return instance
+
+    def _attnames(self) -> List[str]:
+        return [field.attname for field in self.model._meta.concrete_fields if field.attname not in self.cache_exclude and not isinstance(field, BlindIndexField)]
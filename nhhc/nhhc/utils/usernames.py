@@ -0,0 +1,153 @@
+"""
+Module: nhhc.utils.usernames
+
+This module contains the username allocator of new employees: `last.first` for the first employee of a name, then
+`last.first1`, `last.first2`, ... for the next ones.
+
+Each base name has a row in the `username_counters` table (`employee.UsernameCounter`) holding how many usernames of
+that base were handed out. Allocating is one atomic upsert, `INSERT ... ON CONFLICT (base) DO UPDATE SET allocated =
+allocated + n RETURNING allocated`, so it costs one round trip whatever the headcount, and concurrent hires of the
+same name are serialized on the counter row by the database and never receive the same number. A batch of `n`
+usernames of one name (e.g. a bulk hire) is reserved with the same single statement.
+
+Usernames created without the allocator (the admin, fixtures, imports) can run ahead of the counters, so
+`reconcile_counters` raises every counter to at least the highest suffix in use. It runs when the table is created
+(migration `employee.0006`) and daily from Celery beat (`portal.tasks.reconcile_username_counters`).
+
+Functions:
+- base_username: Returns the base name of a first and last name.
+- username_of / number_of: Convert between a base and number and a username.
+- allocate_usernames: Reserves usernames of one name.
+- allocate_username: Reserves one username.
+- reconcile_counters: Raises the counters to the usernames already in use.
+
+Usage:
+    allocate_username("Jane", "Doe")                # "doe.jane", then "doe.jane1", ...
+    allocate_usernames("Jane", "Doe", count=3)      # ["doe.jane2", "doe.jane3", "doe.jane4"]
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from django.apps import apps
+from django.db import connections, router
+from django.db.models import Model
+from loguru import logger
+
+SUFFIX_PATTERN = re.compile(r"^(?P<base>.*?)(?P<suffix>\d+)$")
+RECONCILE_BATCH_SIZE = 500
+
+
+def _counter_model() -> type[Model]:
+    return apps.get_model("employee", "UsernameCounter")
+
+
+def base_username(first_name: str, last_name: str) -> str:
+    """
+    Returns the base username of a name, `last.first` in lower case.
+
+    Args:
+        first_name (str): The first name.
+        last_name (str): The last name.
+
+    Returns:
+        str: The base username.
+    """
+    return f"{last_name.lower()}.{first_name.lower()}"
+
+
+def username_of(base: str, number: int) -> str:
+    """
+    Returns the `number`-th username of `base`, counting from 1: the base itself, then the base suffixed 1, 2, ...
+    """
+    return base if number <= 1 else f"{base}{number - 1}"
+
+
+def number_of(username: str) -> Tuple[str, int]:
+    """
+    Returns the base and the number of `username`, the inverse of `username_of`.
+    """
+    match = SUFFIX_PATTERN.match(username)
+    if match is None or not match["base"]:
+        return username, 1
+    return match["base"], int(match["suffix"]) + 1
+
+
+def allocate_usernames(first_name: str, last_name: str, count: int = 1) -> List[str]:
+    """
+    Reserves `count` consecutive usernames of a name in one atomic statement.
+
+    Inside a transaction the counter row stays locked until it ends, and a rollback returns the numbers.
+
+    Args:
+        first_name (str): The first name.
+        last_name (str): The last name.
+        count (int): The number of usernames to reserve.
+
+    Returns:
+        List[str]: The usernames, in order.
+    """
+    if count <= 0:
+        return []
+    base = base_username(first_name, last_name)
+    model = _counter_model()
+    connection = connections[router.db_for_write(model)]
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (base, allocated) VALUES (%s, %s) ON CONFLICT (base) DO UPDATE SET allocated = {table}.allocated + EXCLUDED.allocated RETURNING allocated",
+            [base, count],
+        )
+        allocated = cursor.fetchone()[0]
+    usernames = [username_of(base, number) for number in range(allocated - count + 1, allocated + 1)]
+    logger.debug(f"Allocated Usernames: {usernames}")
+    return usernames
+
+
+def allocate_username(first_name: str, last_name: str) -> str:
+    """
+    Reserves the next username of a name in one atomic statement.
+
+    Args:
+        first_name (str): The first name.
+        last_name (str): The last name.
+
+    Returns:
+        str: The username.
+    """
+    return allocate_usernames(first_name, last_name, 1)[0]
+
+
+def reconcile_counters(employee_model: Optional[type[Model]] = None, counter_model: Optional[type[Model]] = None) -> int:
+    """
+    Raises every counter to at least the highest number of the usernames in use, never lowering one.
+
+    Args:
+        employee_model (Optional[type[Model]]): The model holding the usernames. Defaults to `employee.Employee`; migrations pass their historical models.
+        counter_model (Optional[type[Model]]): The counter model. Defaults to `employee.UsernameCounter`.
+
+    Returns:
+        int: The number of base names seen.
+    """
+    employee_model = employee_model or apps.get_model("employee", "Employee")
+    counter_model = counter_model or _counter_model()
+    highest: Dict[str, int] = {}
+    for username in employee_model._default_manager.values_list("username", flat=True).iterator(chunk_size=RECONCILE_BATCH_SIZE):
+        if username:
+            base, number = number_of(username)
+            highest[base] = max(highest.get(base, 0), number)
+
+    connection = connections[router.db_for_write(counter_model)]
+    table = connection.ops.quote_name(counter_model._meta.db_table)
+    greatest = "MAX" if connection.vendor == "sqlite" else "GREATEST"
+    rows = list(highest.items())
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), RECONCILE_BATCH_SIZE):
+            batch = rows[start : start + RECONCILE_BATCH_SIZE]
+            cursor.execute(
+                f"INSERT INTO {table} (base, allocated) VALUES {', '.join(['(%s, %s)'] * len(batch))} "
+                f"ON CONFLICT (base) DO UPDATE SET allocated = {greatest}({table}.allocated, EXCLUDED.allocated)",
+                [value for row in batch for value in row],
+            )
+    logger.info(f"Reconciled Username Counters of {len(rows)} Base Names")
+    return len(rows)
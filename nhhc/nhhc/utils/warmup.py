@@ -0,0 +1,156 @@
+"""
+Module: nhhc.utils.warmup
+
+This module contains the cache warm-up run after a deploy, so the first visitors do not pay for cold Redis caches.
+
+Each warmer fills one cache:
+- pages: every `CachedTemplateView` page without URL arguments and every `StaticViewSitemap` location, plus the
+  sitemap itself, requested through the full middleware stack with the production host and scheme so the page keys
+  match those of real requests (see `nhhc.utils.stampede`).
+- stats: the review stats of applications and client requests (see `nhhc.utils.stats`).
+- querysets: the cached querysets behind the first page of the inquiry and application lists, the inquiry and
+  applicant list APIs and the contract choices (see `nhhc.utils.managers`).
+- announcements: the dashboard announcements feed (see `nhhc.utils.feed`).
+- employee_display: the decrypted display records behind the employee roster (see `nhhc.utils.projection`).
+
+Warmers run concurrently on a bounded thread pool; pages are requested on the same pool. Every warmer is timed, and
+a failing warmer is reported without stopping the others.
+
+Functions:
+- cached_page_paths: Returns the paths of the pages served through the page cache.
+- warm_caches: Runs the warmers and reports how long each took.
+
+Usage:
+    python manage.py warm_caches --workers 4
+    warm_caches_task.delay()
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from compliance.models import Contract
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.test import Client, RequestFactory
+from django.urls import NoReverseMatch, URLPattern, URLResolver, get_resolver, reverse
+from employee.models import Employee
+from loguru import logger
+from portal.views import ClientInquiriesAPIListView, ClientInquiriesListView, EmploymentApplicationListView, EmploymentApplicationModelAPIListView
+from web.sitemaps import StaticViewSitemap
+
+from nhhc.utils.decryption import DecryptionEngine
+from nhhc.utils.feed import recent_announcements
+from nhhc.utils.helpers import CachedTemplateView
+from nhhc.utils.projection import EMPLOYEE_DISPLAY
+from nhhc.utils.stats import APPLICATION_STATS, CLIENT_REQUEST_STATS
+
+SITEMAP_PATH = "/sitemap.xml"
+
+
+def _walk(patterns: Iterable[Any]) -> Iterable[str]:
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _walk(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and not pattern.pattern.regex.groups:
+            view_class = getattr(pattern.callback, "view_class", None)
+            if view_class is not None and issubclass(view_class, CachedTemplateView) and pattern.name:
+                yield reverse(pattern.name)
+
+
+def cached_page_paths() -> List[str]:
+    """
+    Returns the paths of every `CachedTemplateView` page without URL arguments, every sitemap location and the sitemap.
+
+    Returns:
+        List[str]: The distinct paths, in URLconf order.
+    """
+    paths = list(_walk(get_resolver().url_patterns))
+    sitemap = StaticViewSitemap()
+    for item in sitemap.items():
+        try:
+            paths.append(sitemap.location(item))
+        except NoReverseMatch:
+            logger.warning(f"Sitemap Entry {item} Does Not Resolve - Not Warmed")
+    paths.append(SITEMAP_PATH)
+    return list(dict.fromkeys(paths))
+
+
+def _request_page(path: str) -> Dict[str, Any]:
+    client = Client(HTTP_HOST=settings.CACHE_WARMUP_HOST, **{settings.SECURE_PROXY_SSL_HEADER[0]: settings.SECURE_PROXY_SSL_HEADER[1]})
+    response = client.get(path, secure=True)
+    if response.status_code != 200:
+        raise RuntimeError(f"GET {path} Returned {response.status_code}")
+    return {"status": response.status_code}
+
+
+def _warm_stats() -> Dict[str, Any]:
+    return {"applications": APPLICATION_STATS.get(), "client_requests": CLIENT_REQUEST_STATS.get()}
+
+
+def _warm_querysets() -> Dict[str, Any]:
+    report = {}
+    for view_class in (ClientInquiriesListView, EmploymentApplicationListView):
+        # The first page is read through the view itself, so its key matches the one a visitor's request computes.
+        view = view_class()
+        view.setup(RequestFactory().get("/"))
+        queryset = view.get_queryset()
+        _, page, _, _ = view.paginate_queryset(queryset, view.get_paginate_by(queryset))
+        report[view_class.__name__] = len(page.object_list)
+    for view_class in (ClientInquiriesAPIListView, EmploymentApplicationModelAPIListView):
+        # The unfiltered list, as CachedListAPIMixin reads it.
+        report[view_class.__name__] = len(DecryptionEngine().prepare(view_class.queryset.all()).from_cache())
+    report["contracts"] = len(Contract.objects.from_cache())
+    return report
+
+
+def _warm_announcements() -> Dict[str, Any]:
+    return {"announcements": len(recent_announcements())}
+
+
+def _warm_employee_display() -> Dict[str, Any]:
+    return {"employees": len(EMPLOYEE_DISPLAY.get_many(Employee.objects.values_list("employee_id", flat=True)))}
+
+
+WARMERS: Dict[str, Callable[[], Dict[str, Any]]] = {
+    "stats": _warm_stats,
+    "querysets": _warm_querysets,
+    "announcements": _warm_announcements,
+    "employee_display": _warm_employee_display,
+}
+
+
+def _timed(name: str, warmer: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    close_old_connections()
+    started = time.monotonic()
+    try:
+        report = {"ok": True, **warmer()}
+    except Exception as e:
+        logger.warning(f"Unable to Warm {name} - {e}")
+        report = {"ok": False, "error": str(e)}
+    finally:
+        # Each pool thread holds its own connection; release it instead of leaving it to the server's timeout.
+        connections.close_all()
+    report["seconds"] = round(time.monotonic() - started, 3)
+    logger.info(f"Warmed {name} in {report['seconds']}s" if report["ok"] else f"Failed to Warm {name} after {report['seconds']}s")
+    return report
+
+
+def warm_caches(workers: Optional[int] = None, only: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Fills the page, review stats, queryset, announcement and employee display caches, at most `workers` at a time.
+
+    Args:
+        workers (Optional[int]): The maximum number of concurrent warmers and page requests. Defaults to `settings.CACHE_WARMUP_WORKERS`.
+        only (Optional[Iterable[str]]): Run only these warmers ("pages" or a key of `WARMERS`). Defaults to all.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Per cache ("page:<path>" for pages), whether it warmed, its details and the seconds taken.
+    """
+    selected = set(only) if only else {"pages", *WARMERS}
+    jobs: Dict[str, Callable[[], Dict[str, Any]]] = {name: warmer for name, warmer in WARMERS.items() if name in selected}
+    if "pages" in selected:
+        jobs.update({f"page:{path}": (lambda path=path: _request_page(path)) for path in cached_page_paths()})
+    with ThreadPoolExecutor(max_workers=max(1, workers or settings.CACHE_WARMUP_WORKERS), thread_name_prefix="cache-warmup") as pool:
+        futures = {name: pool.submit(_timed, name, warmer) for name, warmer in jobs.items()}
+        return {name: future.result() for name, future in futures.items()}
@@ -4,34 +4,64 @@ from announcements.models import Announcements
 from authentication.models import UserProfile
 from compliance.models import Compliance, Contract
 from django.contrib import admin
+from django.db.models import Q
 from employee.models import Employee
 from portal.models import PayrollException  # Assessment, InServiceTraining,
 from web.models import ClientInterestSubmission, EmploymentApplicationModel
 
+from nhhc.utils.decryption import BatchDecryptionAdminMixin
+
 now = datetime.now()
 # Register your models here.
-all_models = [Contract, PayrollException, Announcements, ClientInterestSubmission, EmploymentApplicationModel, UserProfile, Compliance]
+all_models = [Contract, PayrollException, Announcements, UserProfile, Compliance]
 
 
 for model in all_models:
     admin.site.register(model)
 
 
-class EmployeeAdmin(admin.ModelAdmin):
+class SubmissionAdmin(BatchDecryptionAdminMixin, admin.ModelAdmin):
+    """
+    Admin interface of the submission models, whose change list shows the decrypted names in the submissions' `__str__`.
+    """
+
+    decrypt_fields = ("first_name", "last_name")
+
+
+admin.site.register(ClientInterestSubmission, SubmissionAdmin)
+admin.site.register(EmploymentApplicationModel, SubmissionAdmin)
+
+
+class EmployeeAdmin(BatchDecryptionAdminMixin, admin.ModelAdmin):
     """
     This class represents the admin interface for managing employee data.
 
     Attributes:
-    - search_fields (list): A list of fields that can be searched in the admin interface.
+    - search_fields (list): A list of plaintext fields that can be searched in the admin interface.
+    - blind_index_search_fields (list): Blind indexes matched exactly against the search term, since the encrypted columns cannot be searched directly.
     - list_display (list): A list of fields to display in the admin interface.
+    - decrypt_fields (tuple): The encrypted fields of `list_display`, decrypted for the whole page in one batch.
     - actions (list): A list of actions that can be performed on selected employees.
     - date_hierarchy (str): The field used for date-based drilldown in the admin interface.
     """
 
-    search_fields = ["username", "first_name", "last_name", "social_security", "phone"]
+    search_fields = ["username", "phone"]
+    blind_index_search_fields = ["first_name_bidx", "last_name_bidx", "social_security_bidx", "email_bidx"]
     list_display = ["first_name", "last_name", "username", "hire_date"]
+    decrypt_fields = ("first_name", "last_name")
     actions = []
     date_hierarchy = "hire_date"
 
+    def get_search_results(self, request, queryset, search_term):
+        # `queryset` already carries the change list's filters and date drilldown, so blind-index matches are drawn from it too.
+        base = queryset
+        search_results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            matches = Q()
+            for field_name in self.blind_index_search_fields:
+                matches |= Q(**{f"{field_name}__matches": search_term})
+            search_results = search_results | base.filter(matches)
+        return search_results, may_have_duplicates
+
 
 admin.site.register(Employee, EmployeeAdmin)
@@ -10,12 +10,12 @@ class ClientInquiriesSerializer(ModelSerializer):
 
     Attributes:
         model (EmploymentApplicationModel): The model class that this serializer is associated with.
-        fields (str): The fields to include in the serialized data. If set to "__all__", all fields will be included.
+        exclude (list): The fields left out of the serialized data. The wrapped envelope data key is never exposed.
     """
 
     class Meta:
         model = ClientInterestSubmission
-        fields = "__all__"
+        exclude = ["data_key"]
 
 
 class EmploymentApplicationSerializer(ModelSerializer):
@@ -26,9 +26,9 @@ class EmploymentApplicationSerializer(ModelSerializer):
 
     Attributes:
         model (EmploymentApplicationModel): The model class that this serializer is associated with.
-        fields (str): The fields to include in the serialized data. If set to "__all__", all fields will be included.
+        exclude (list): The fields left out of the serialized data. The wrapped envelope data key is never exposed.
     """
 
     class Meta:
         model = EmploymentApplicationModel
-        fields = "__all__"
+        exclude = ["data_key"]
@@ -0,0 +1,56 @@
+from typing import Any, Dict, List, Optional
+
+from celery import shared_task
+
+from nhhc.status import refresh_snapshot
+from nhhc.utils.cache_versions import prune_stale_keys
+from nhhc.utils.usernames import reconcile_counters
+from nhhc.utils.warmup import warm_caches
+
+
+@shared_task(ignore_result=True)
+def warm_caches_task(workers: Optional[int] = None, only: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Celery task that warms the page, review stats, announcement and employee display caches, e.g. queued by a deploy hook.
+
+    Args:
+        workers (Optional[int]): Caches warmed concurrently. Defaults to `settings.CACHE_WARMUP_WORKERS`.
+        only (Optional[List[str]]): Warm only these caches. Defaults to every cache.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Per cache, whether it warmed and the seconds it took.
+    """
+    return warm_caches(workers=workers, only=only)
+
+
+@shared_task(ignore_result=True)
+def prune_stale_cache_versions() -> Optional[int]:
+    """
+    Periodic Celery task that deletes cache entries of retired schema versions and builds (see `nhhc.utils.cache_versions`).
+
+    Returns:
+        Optional[int]: The number of keys deleted, or None when the cache is not backed by Redis.
+    """
+    return prune_stale_keys()
+
+
+@shared_task(ignore_result=True)
+def refresh_health_snapshot() -> bool:
+    """
+    Periodic Celery task that runs the health check probes and caches the snapshot served by `/status/` (see `nhhc.status`).
+
+    Returns:
+        bool: Whether every critical probe passed.
+    """
+    return refresh_snapshot()["healthy"]
+
+
+@shared_task(ignore_result=True)
+def reconcile_username_counters() -> int:
+    """
+    Periodic Celery task that raises the username counters past usernames created without the allocator (see `nhhc.utils.usernames`).
+
+    Returns:
+        int: The number of base names seen.
+    """
+    return reconcile_counters()
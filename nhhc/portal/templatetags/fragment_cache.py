@@ -0,0 +1,55 @@
+"""
+Module: nhhc.portal.templatetags.fragment_cache
+
+This module contains the `cachefragment` block tag, the template interface of `nhhc.utils.fragments`.
+
+Usage:
+    {% load fragment_cache %}
+    {% cachefragment "name" "app_label.Model" ... vary_on value ... %} ... {% endcachefragment %}
+
+The fragment is cached per viewer role and per data generation of the listed models; values after `vary_on` are
+resolved in the template context and added to the key.
+"""
+from django import template
+
+from nhhc.utils.fragments import cached_fragment
+
+register = template.Library()
+
+
+class CachedFragmentNode(template.Node):
+    def __init__(self, nodelist, name, dependencies, vary_on) -> None:
+        self.nodelist = nodelist
+        self.name = name
+        self.dependencies = dependencies
+        self.vary_on = vary_on
+
+    def render(self, context) -> str:
+        user = context.get("user") or getattr(context.get("request"), "user", None)
+        return cached_fragment(
+            self.name.resolve(context),
+            lambda: self.nodelist.render(context),
+            user,
+            [dependency.resolve(context) for dependency in self.dependencies],
+            [value.resolve(context) for value in self.vary_on],
+        )
+
+
+@register.tag(name="cachefragment")
+def do_cachefragment(parser, token) -> CachedFragmentNode:
+    """
+    Parses `{% cachefragment name [model ...] [vary_on value ...] %}` up to `{% endcachefragment %}`.
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' Requires a Fragment Name")
+    arguments = bits[2:]
+    split = arguments.index("vary_on") if "vary_on" in arguments else len(arguments)
+    nodelist = parser.parse(("endcachefragment",))
+    parser.delete_first_token()
+    return CachedFragmentNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        [parser.compile_filter(bit) for bit in arguments[:split]],
+        [parser.compile_filter(bit) for bit in arguments[split + 1 :]],
+    )
@@ -11,11 +11,14 @@ Functions:
 2. render_unreviewed_client_requests()
     - Description: Renders the number of unreviewed client requests.
     - Returns: A dictionary containing the count of unreviewed client requests.
+
+Both read the cached review stats in `nhhc.utils.stats` (the same result the list views render) instead of counting rows.
 """
 from typing import Dict
 
 from django import template
-from web.models import ClientInterestSubmission, EmploymentApplicationModel
+
+from nhhc.utils.stats import APPLICATION_STATS, CLIENT_REQUEST_STATS
 
 register = template.Library()
 
@@ -28,7 +31,7 @@ def render_unreviewed_employment_apps() -> Dict[str, int]:
     Returns:
     Dict[str, int]: A dictionary containing the count of unreviewed employment applications.
     """
-    employment_apps = EmploymentApplicationModel.objects.filter(reviewed=False).count()
+    employment_apps = APPLICATION_STATS.get()["unreviewed"]
     return {"app_count": int(employment_apps)}
 
 
@@ -40,5 +43,5 @@ def render_unreviewed_client_requests() -> Dict[str, int]:
     Returns:
     Dict[str, int]: A dictionary containing the count of unreviewed client requests.
     """
-    client_requests = ClientInterestSubmission.objects.filter(reviewed__in=[False, None]).count()
+    client_requests = CLIENT_REQUEST_STATS.get()["unreviewed"]
     return {"client_count": int(client_requests)}
@@ -0,0 +1,70 @@
+from django.contrib.admin.sites import site
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from employee.models import Employee
+from model_bakery import baker
+from portal.views import ClientInquiriesAPIListView, ClientInquiriesListView
+from rest_framework.test import APIRequestFactory, force_authenticate
+from web.models import ClientInterestSubmission
+
+from nhhc.utils.testing import LOCMEM_CACHES, register_encrypted_field_generators
+
+register_encrypted_field_generators()
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestBatchDecryptedListViews(TestCase):
+    def setUp(self):
+        cache.clear()
+        baker.make(ClientInterestSubmission, first_name="Jane", last_name="Doe", _quantity=4)
+
+    def test_page_names_are_decrypted_without_a_query_per_row(self):
+        view = ClientInquiriesListView()
+        view.setup(RequestFactory().get("/inquiries/"))
+        view.object_list = view.get_queryset()
+        context = view.get_context_data()
+        with self.assertNumQueries(0):
+            self.assertEqual([(submission.first_name, submission.last_name) for submission in context["submissions"]], [("Jane", "Doe")] * 4)
+
+    def _render_list(self):
+        view = ClientInquiriesListView()
+        view.setup(RequestFactory().get("/inquiries/"))
+        view.object_list = view.get_queryset()
+        return view.get_context_data()["submissions"]
+
+    def _submission_queries(self, queries):
+        return [query["sql"] for query in queries if ClientInterestSubmission._meta.db_table in query["sql"]]
+
+    def test_second_request_reads_the_page_from_cache(self):
+        self._render_list()
+        with CaptureQueriesContext(connection) as queries:
+            submissions = self._render_list()
+        self.assertEqual(self._submission_queries(queries), [])
+        self.assertEqual([submission.first_name for submission in submissions], ["Jane"] * 4)
+
+    def _request_api(self, user):
+        request = APIRequestFactory().get("/api/inquiries")
+        force_authenticate(request, user=user)
+        return ClientInquiriesAPIListView.as_view()(request)
+
+    def test_second_api_request_reads_the_rows_from_cache(self):
+        user = baker.make(Employee, username="staff")
+        self._request_api(user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self._request_api(user)
+        self.assertEqual(self._submission_queries(queries), [])
+        self.assertEqual([row["first_name"] for row in response.data], ["Jane"] * 4)
+
+
+class TestEmployeeAdminSearch(TestCase):
+    def test_blind_index_matches_keep_the_change_list_filters(self):
+        active = baker.make(Employee, username="active", email="jane.doe@example.com", is_active=True)
+        baker.make(Employee, username="inactive", email="john.roe@example.com", is_active=False)
+        admin = site._registry[Employee]
+        request = RequestFactory().get("/admin/employee/employee/")
+        results, _ = admin.get_search_results(request, Employee.objects.filter(is_active=False), "JANE.DOE@example.com")
+        self.assertEqual(list(results), [])
+        results, _ = admin.get_search_results(request, Employee.objects.filter(is_active=True), "JANE.DOE@example.com")
+        self.assertEqual(list(results), [active])
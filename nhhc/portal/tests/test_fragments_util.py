@@ -0,0 +1,55 @@
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from model_bakery import baker
+from web.models import ClientInterestSubmission
+
+from nhhc.utils.fragments import cached_fragment, role_of
+from nhhc.utils.testing import LOCMEM_CACHES, register_encrypted_field_generators
+
+register_encrypted_field_generators()
+
+
+class StubUser:
+    is_authenticated = True
+
+    def __init__(self, is_superuser=False, is_staff=False):
+        self.is_superuser = is_superuser
+        self.is_staff = is_staff
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestFragmentCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.renders = 0
+
+    def render(self):
+        self.renders += 1
+        return f"<p>{self.renders}</p>"
+
+    def test_role_of(self):
+        self.assertEqual(role_of(AnonymousUser()), "anonymous")
+        self.assertEqual(role_of(StubUser(is_superuser=True, is_staff=True)), "admin")
+        self.assertEqual(role_of(StubUser(is_staff=True)), "staff")
+        self.assertEqual(role_of(StubUser()), "employee")
+
+    def test_fragment_is_rendered_once_per_role(self):
+        admin, employee = StubUser(is_superuser=True), StubUser()
+        self.assertEqual(cached_fragment("stats", self.render, admin, [ClientInterestSubmission]), "<p>1</p>")
+        self.assertEqual(cached_fragment("stats", self.render, admin, [ClientInterestSubmission]), "<p>1</p>")
+        self.assertEqual(cached_fragment("stats", self.render, employee, [ClientInterestSubmission]), "<p>2</p>")
+
+    def test_saving_a_dependency_rerenders_the_fragment(self):
+        admin = StubUser(is_superuser=True)
+        cached_fragment("stats", self.render, admin, ["web.ClientInterestSubmission"])
+        with self.captureOnCommitCallbacks(execute=True):
+            baker.make(ClientInterestSubmission)
+        self.assertEqual(cached_fragment("stats", self.render, admin, ["web.ClientInterestSubmission"]), "<p>2</p>")
+
+    def test_template_tag_varies_on_extra_values(self):
+        template = Template('{% load fragment_cache %}{% cachefragment "nav" vary_on path %}{{ path }}{% endcachefragment %}')
+        user = StubUser()
+        self.assertEqual(template.render(Context({"user": user, "path": "/dashboard"})), "/dashboard")
+        self.assertEqual(template.render(Context({"user": user, "path": "/profile"})), "/profile")
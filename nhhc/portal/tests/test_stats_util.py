@@ -0,0 +1,41 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from model_bakery import baker
+from portal.templatetags.unreviewed_requests import render_unreviewed_client_requests
+from web.models import ClientInterestSubmission
+
+from nhhc.utils.stats import CLIENT_REQUEST_STATS, KnownCountPaginator
+from nhhc.utils.testing import LOCMEM_CACHES, register_encrypted_field_generators
+
+register_encrypted_field_generators()
+
+
+@override_settings(CACHES=LOCMEM_CACHES, STAMPEDE_BETA=0.0)
+class TestAggregateStats(TestCase):
+    def setUp(self):
+        cache.clear()
+        baker.make(ClientInterestSubmission, reviewed=False, _quantity=2)
+        baker.make(ClientInterestSubmission, reviewed=None)
+        baker.make(ClientInterestSubmission, reviewed=True)
+
+    def test_every_bucket_is_counted_in_one_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(CLIENT_REQUEST_STATS.compute(), {"total": 4, "reviewed": 1, "unreviewed": 3})
+
+    def test_stats_are_cached_until_the_generation_changes(self):
+        CLIENT_REQUEST_STATS.get()
+        with self.assertNumQueries(0):
+            self.assertEqual(CLIENT_REQUEST_STATS.get()["total"], 4)
+        with self.captureOnCommitCallbacks(execute=True):
+            ClientInterestSubmission.objects.filter(reviewed__isnull=True).update(reviewed=True)
+        self.assertEqual(CLIENT_REQUEST_STATS.get(), {"total": 4, "reviewed": 2, "unreviewed": 2})
+
+    def test_paginator_uses_the_known_count(self):
+        paginator = KnownCountPaginator(ClientInterestSubmission.objects.order_by("pk"), 3, count=CLIENT_REQUEST_STATS.get()["total"])
+        with self.assertNumQueries(0):
+            self.assertEqual(paginator.num_pages, 2)
+
+    def test_sidenav_count_reads_the_cached_stats(self):
+        CLIENT_REQUEST_STATS.get()
+        with self.assertNumQueries(0):
+            self.assertEqual(render_unreviewed_client_requests(), {"client_count": 3})
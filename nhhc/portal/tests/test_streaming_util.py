@@ -0,0 +1,70 @@
+import datetime
+import gzip
+import json
+
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+from web.models import ClientInterestSubmission
+
+from nhhc.utils.streaming import decrypted_rows, encode_rows, gzip_chunks, streaming_json_response
+from nhhc.utils.testing import register_encrypted_field_generators
+
+register_encrypted_field_generators()
+
+ROWS = [{"id": index, "first_name": f"Jane{index}", "date_submitted": datetime.date(2024, 1, index + 1)} for index in range(5)]
+
+
+@override_settings(EXPORT_STREAM_CHUNK_SIZE=2, EXPORT_STREAM_GZIP=True)
+class TestStreamingExports(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_json_array_is_emitted_in_chunks(self):
+        pieces = list(encode_rows(iter(ROWS)))
+        self.assertEqual(len(pieces), 5)  # "[", three chunks of at most two rows, "]"
+        self.assertEqual([row["id"] for row in json.loads(b"".join(pieces))], [0, 1, 2, 3, 4])
+
+    def test_empty_export_is_an_empty_array(self):
+        self.assertEqual(json.loads(b"".join(encode_rows([]))), [])
+
+    def test_ndjson_is_one_document_per_line(self):
+        lines = b"".join(encode_rows(iter(ROWS), ndjson=True)).decode("utf-8").splitlines()
+        self.assertEqual([json.loads(line)["first_name"] for line in lines], [f"Jane{index}" for index in range(5)])
+
+    def test_gzip_stream_round_trips(self):
+        self.assertEqual(gzip.decompress(b"".join(gzip_chunks(encode_rows(iter(ROWS))))), b"".join(encode_rows(iter(ROWS))))
+
+    def test_response_format_and_encoding_follow_the_request(self):
+        response = streaming_json_response(self.factory.get("/inquiries/all", {"format": "ndjson"}, HTTP_ACCEPT_ENCODING="gzip, deflate"), iter(ROWS))
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(len(gzip.decompress(b"".join(response.streaming_content)).splitlines()), 5)
+
+        response = streaming_json_response(self.factory.get("/inquiries/all"), iter(ROWS))
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(len(json.loads(b"".join(response.streaming_content))), 5)
+
+
+class TestDecryptedRows(TestCase):
+    def setUp(self):
+        self.submissions = [baker.make(ClientInterestSubmission, first_name=f"Jane{index}", last_name="Doe") for index in range(5)]
+
+    def test_rows_are_paged_by_primary_key_and_decrypted(self):
+        rows = list(decrypted_rows(ClientInterestSubmission.objects.all(), chunk_size=2))
+        self.assertEqual([row["id"] for row in rows], sorted(submission.pk for submission in self.submissions))
+        self.assertEqual([row["first_name"] for row in rows], [f"Jane{index}" for index in range(5)])
+
+    def test_keys_and_derived_columns_are_left_out(self):
+        row = next(decrypted_rows(ClientInterestSubmission.objects.all()))
+        self.assertFalse({"data_key", "first_name_sort", "last_name_sort"} & set(row))
+
+    def test_each_page_is_one_bounded_query(self):
+        table = ClientInterestSubmission._meta.db_table
+        with CaptureQueriesContext(connection) as queries:
+            list(decrypted_rows(ClientInterestSubmission.objects.all(), chunk_size=2))
+        pages = [query["sql"] for query in queries if table in query["sql"]]
+        self.assertEqual(len(pages), 3)
+        self.assertTrue(all("LIMIT 2" in sql for sql in pages))
@@ -18,10 +18,8 @@ Classes:
 import json
 from typing import Any, Dict
 
-from announcements.models import Announcements
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import ObjectDoesNotExist
-from django.core.serializers.json import DjangoJSONEncoder
 from django.forms.models import model_to_dict
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
@@ -38,13 +36,17 @@ from employee.models import Employee
 from formset.upload import FileUploadMixin
 from loguru import logger
 from portal.forms import PayrollExceptionForm
-from portal.serializers import ClientInquiriesSerializer
+from portal.serializers import ClientInquiriesSerializer, EmploymentApplicationSerializer
 from rest_framework import generics, mixins, permissions, status
 from rest_framework.response import Response
 from web.models import ClientInterestSubmission, EmploymentApplicationModel
 from formset.calendar import CalendarResponseMixin
+from nhhc.utils.decryption import BatchDecryptionMixin, for_request
+from nhhc.utils.feed import recent_announcements
 from nhhc.utils.helpers import NeverCacheMixin
-
+from nhhc.utils.managers import CachedListAPIMixin, CachedPageMixin
+from nhhc.utils.stats import APPLICATION_STATS, CLIENT_REQUEST_STATS, AggregateStatsMixin
+from nhhc.utils.streaming import decrypted_rows, streaming_json_response
 
 
 class Dashboard(CalendarResponseMixin, TemplateView):
@@ -52,13 +54,7 @@ class Dashboard(CalendarResponseMixin, TemplateView):
 
     def get_context_data(self, **kwargs) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
-        recent_annoucements = list(Announcements.objects.all().filter(status="A").order_by("-date_posted")[:5])
-        listed_amnnoucements = []
-        for announcement in list(recent_annoucements):
-            announcement = model_to_dict(announcement)
-            announcement["posted_by"] = Employee.objects.get(employee_id=announcement["posted_by"]).first_name
-            listed_amnnoucements.append(announcement)
-        context["recent_announcements"] = listed_amnnoucements
+        context["recent_announcements"] = recent_announcements()
         context["ExceptionForm"] = PayrollExceptionForm()
         return context
 
@@ -68,7 +64,7 @@ class ProfileDetailView(DetailView):
     template_name = "profile_main.html"
 
     def get_object(self, queryset=None):
-        queryset = Employee.objects.get(pk=self.request.user.employee_id)
+        queryset = Employee.objects.get_cached(self.request.user.employee_id)
         return queryset
 
     def get_context_data(self, **kwargs) -> dict[str, Any]:
@@ -78,22 +74,24 @@ class ProfileDetailView(DetailView):
         return context
 
 
-class ProfileFormView( UpdateView, FileUploadMixin):
+class ProfileFormView(UpdateView, FileUploadMixin):
     form_class = EmployeeForm
     model = Employee
     template_name = "profile_main.html"
 
     def get_object(self, queryset=None):
-        queryset = Employee.objects.get(pk=self.request.user.employee_id)
+        queryset = Employee.objects.get_cached(self.request.user.employee_id)
         return queryset
 
     def get_success_url(self):
         return reverse("profile")
-    
+
+
 class PayrollExceptionView(FormView):
     template_name = "exception.html"
     form_class = PayrollExceptionForm
-    
+
+
 class Profile(NeverCacheMixin, View):
     def get(self, request, *args, **kwargs):
         view = ProfileDetailView.as_view()
@@ -107,9 +105,9 @@ class Profile(NeverCacheMixin, View):
 # TODO: Implement REST endpoint with DRF
 
 
-class EmploymentApplicationModelAPIListView(mixins.DestroyModelMixin, generics.ListCreateAPIView):
+class EmploymentApplicationModelAPIListView(CachedListAPIMixin, mixins.DestroyModelMixin, generics.ListCreateAPIView):
     queryset = EmploymentApplicationModel.objects.all()
-    serializer_class = [EmploymentApplicationModel]
+    serializer_class = EmploymentApplicationSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = [
@@ -147,17 +145,15 @@ class EmploymentApplicationModelAPIListView(mixins.DestroyModelMixin, generics.L
 
 def all_client_inquiries(request: HttpRequest) -> HttpResponse:
     """
-    Retrieves all client inquiries and returns them as JSON.
+    Streams all client inquiries as a JSON array, or NDJSON with `?format=ndjson` (see `nhhc.utils.streaming`).
 
     Returns:
-    - HttpResponse: JSON response containing all client inquiries
+    - StreamingHttpResponse: JSON response containing all client inquiries
     """
-    inquiries = ClientInterestSubmission.objects.all().values()
-    inquiries_json = json.dumps(list(inquiries), cls=DjangoJSONEncoder)
-    return HttpResponse(content=inquiries_json, status=status.HTTP_200_OK)
+    return streaming_json_response(request, decrypted_rows(ClientInterestSubmission.objects.all(), for_request(request)), status=status.HTTP_200_OK)
 
 
-class ClientInquiriesAPIListView(generics.ListCreateAPIView):
+class ClientInquiriesAPIListView(CachedListAPIMixin, generics.ListCreateAPIView):
     queryset = ClientInterestSubmission.objects.all()
     serializer_class = ClientInquiriesSerializer
     permission_classes = [
@@ -167,9 +163,11 @@ class ClientInquiriesAPIListView(generics.ListCreateAPIView):
 
 
 # SECTION - Class-Based Views
-class ClientInquiriesListView( ListView):
+class ClientInquiriesListView(BatchDecryptionMixin, AggregateStatsMixin, CachedPageMixin, ListView):
     """
-    Renders a list of client inquiries.
+    Renders a list of client inquiries. The review counts and the paginator's total come from one cached aggregate (see `nhhc.utils.stats`),
+    the page's rows are read through the queryset cache (see `nhhc.utils.managers`) and the names on the page are decrypted in one batch
+    (see `nhhc.utils.decryption`).
     """
 
     template_name = "service-inquiries.html"
@@ -177,19 +175,20 @@ class ClientInquiriesListView( ListView):
     queryset = ClientInterestSubmission.objects.all().order_by("-date_submitted")
     context_object_name = "submissions"
     paginate_by = 25
+    stats = CLIENT_REQUEST_STATS
+    decrypt_fields = ("first_name", "last_name")
 
     def get_context_data(self, **kwargs) -> Dict[str, str]:
         context = super().get_context_data(**kwargs)
-        context["unresponsed"] = ClientInterestSubmission.objects.filter(reviewed=False).count()
+        counts = self.get_stats()
+        context["unresponsed"] = counts["unreviewed"]
         context["showSearch"] = True
-        context["reviewed"] = ClientInterestSubmission.objects.filter(
-            reviewed=True,
-        ).count()
-        context["all_submissions"] = ClientInterestSubmission.objects.all().count()
+        context["reviewed"] = counts["reviewed"]
+        context["all_submissions"] = counts["total"]
         return context
 
 
-class ClientInquiriesDetailView( DetailView):
+class ClientInquiriesDetailView(DetailView):
     """
     Renders details of a specific client inquiry.
     """
@@ -200,9 +199,11 @@ class ClientInquiriesDetailView( DetailView):
     pk_url_kwarg = "pk"
 
 
-class EmploymentApplicationListView( ListView):
+class EmploymentApplicationListView(BatchDecryptionMixin, AggregateStatsMixin, CachedPageMixin, ListView):
     """
-    Renders a list of submitted employment applications.
+    Renders a list of submitted employment applications. The review counts and the paginator's total come from one cached aggregate (see `nhhc.utils.stats`),
+    the page's rows are read through the queryset cache (see `nhhc.utils.managers`) and the names on the page are decrypted in one batch
+    (see `nhhc.utils.decryption`).
     """
 
     template_name = "submitted-applications.html"
@@ -210,18 +211,19 @@ class EmploymentApplicationListView( ListView):
     queryset = EmploymentApplicationModel.objects.all().order_by("-date_submitted")
     context_object_name = "submissions"
     paginate_by = 25
+    stats = APPLICATION_STATS
+    decrypt_fields = ("first_name", "last_name")
 
     def get_context_data(self, **kwargs) -> Dict[str, str]:
         context = super().get_context_data(**kwargs)
-        context["unresponsed"] = EmploymentApplicationModel.objects.filter(reviewed=False).count()
-        context["reviewed"] = EmploymentApplicationModel.objects.filter(
-            reviewed=True,
-        ).count()
-        context["all_submissions"] = EmploymentApplicationModel.objects.count()
+        counts = self.get_stats()
+        context["unresponsed"] = counts["unreviewed"]
+        context["reviewed"] = counts["reviewed"]
+        context["all_submissions"] = counts["total"]
         return context
 
 
-class EmploymentApplicationDetailView( DetailView):
+class EmploymentApplicationDetailView(DetailView):
     """
     Renders details of a specific employment application.
     """
@@ -236,16 +238,13 @@ class EmploymentApplicationDetailView( DetailView):
 @login_required(login_url="/login/")
 def all_applicants(request: HttpRequest) -> HttpResponse:
     """
-    Retrieves all employment applications and returns them as JSON.
+    Streams all employment applications as a JSON array, or NDJSON with `?format=ndjson` (see `nhhc.utils.streaming`).
 
     Returns:
-    - HttpResponse: JSON response containing all employment applications
+    - StreamingHttpResponse: JSON response containing all employment applications
     """
-    inquiries = EmploymentApplicationModel.objects.all().values()
-    for inquiry in inquiries:
-        inquiry["contact_number"] = str(inquiry["contact_number"])
-    applicant_json = json.dumps(list(inquiries), cls=DjangoJSONEncoder)
-    return HttpResponse(content=applicant_json, status=200)
+    applicants = ({**applicant, "contact_number": str(applicant["contact_number"])} for applicant in decrypted_rows(EmploymentApplicationModel.objects.all(), for_request(request)))
+    return streaming_json_response(request, applicants, status=200)
 
 
 # !SECTION - END OF CLASS-BASED VIEWS
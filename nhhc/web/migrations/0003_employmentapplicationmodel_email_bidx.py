@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-17 09:12
+
+import nhhc.utils.fields
+from django.db import migrations
+
+
+def populate_application_blind_indexes(apps, schema_editor):
+    nhhc.utils.fields.populate_blind_indexes(apps.get_model("web", "EmploymentApplicationModel"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("web", "0002_alter_employmentapplicationmodel_resume_cv"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="employmentapplicationmodel",
+            name="email_bidx",
+            field=nhhc.utils.fields.BlindIndexField(blank=True, db_index=True, editable=False, max_length=64, normalizer="email", null=True, source="email"),
+        ),
+        migrations.RunPython(populate_application_blind_indexes, migrations.RunPython.noop),
+    ]
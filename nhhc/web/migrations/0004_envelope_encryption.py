@@ -0,0 +1,101 @@
+# Generated by Django 5.0.6 on 2026-10-17 11:40
+
+import nhhc.utils.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Switches the encrypted columns to the envelope storage mode. The columns stay `bytea`, so no data is rewritten:
+    existing `sage_encrypt` ciphertext keeps loading and each row is re-sealed under its own data key when next saved.
+    """
+
+    dependencies = [
+        ("web", "0003_employmentapplicationmodel_email_bidx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="clientinterestsubmission",
+            name="data_key",
+            field=nhhc.utils.fields.EnvelopeKeyField(null=True),
+        ),
+        migrations.AlterField(
+            model_name="clientinterestsubmission",
+            name="first_name",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(max_length=10485760),
+        ),
+        migrations.AlterField(
+            model_name="clientinterestsubmission",
+            name="last_name",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(max_length=10485760),
+        ),
+        migrations.AlterField(
+            model_name="clientinterestsubmission",
+            name="email",
+            field=nhhc.utils.fields.EnvelopeEncryptedEmailField(max_length=254, null=True),
+        ),
+        migrations.AlterField(
+            model_name="clientinterestsubmission",
+            name="home_address1",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(max_length=800, null=True),
+        ),
+        migrations.AlterField(
+            model_name="clientinterestsubmission",
+            name="home_address2",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(blank=True, max_length=50, null=True),
+        ),
+        migrations.AlterField(
+            model_name="clientinterestsubmission",
+            name="city",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(blank=True, max_length=10485760, null=True),
+        ),
+        migrations.AlterField(
+            model_name="clientinterestsubmission",
+            name="insurance_carrier",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(max_length=10485760),
+        ),
+        migrations.AlterField(
+            model_name="clientinterestsubmission",
+            name="desired_service",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(
+                choices=[("I", "Intermittent Home Care"), ("NM", "Non-Medical Home Care"), ("MSW", "Medical Social Work"), ("OT", "Occupational Therapy"), ("PT", "Physical Therapy"), ("NA", "Other")],
+                max_length=10485760,
+            ),
+        ),
+        migrations.AddField(
+            model_name="employmentapplicationmodel",
+            name="data_key",
+            field=nhhc.utils.fields.EnvelopeKeyField(null=True),
+        ),
+        migrations.AlterField(
+            model_name="employmentapplicationmodel",
+            name="first_name",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(max_length=10485760),
+        ),
+        migrations.AlterField(
+            model_name="employmentapplicationmodel",
+            name="last_name",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(max_length=10485760),
+        ),
+        migrations.AlterField(
+            model_name="employmentapplicationmodel",
+            name="email",
+            field=nhhc.utils.fields.EnvelopeEncryptedEmailField(max_length=10485760),
+        ),
+        migrations.AlterField(
+            model_name="employmentapplicationmodel",
+            name="home_address1",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(max_length=10485760),
+        ),
+        migrations.AlterField(
+            model_name="employmentapplicationmodel",
+            name="home_address2",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(blank=True, max_length=10485760, null=True),
+        ),
+        migrations.AlterField(
+            model_name="employmentapplicationmodel",
+            name="city",
+            field=nhhc.utils.fields.EnvelopeEncryptedCharField(max_length=10485760),
+        ),
+    ]
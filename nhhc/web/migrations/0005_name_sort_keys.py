@@ -0,0 +1,55 @@
+# Generated by Django 5.0.6 on 2026-10-17 14:05
+
+import nhhc.utils.fields
+from django.db import migrations, models
+
+
+def populate_application_sort_keys(apps, schema_editor):
+    nhhc.utils.fields.populate_sort_keys(apps.get_model("web", "ClientInterestSubmission"))
+    nhhc.utils.fields.populate_sort_keys(apps.get_model("web", "EmploymentApplicationModel"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("web", "0004_envelope_encryption"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="clientinterestsubmission",
+            name="first_name_sort",
+            field=nhhc.utils.fields.SortKeyField(blank=True, editable=False, null=True, source="first_name"),
+        ),
+        migrations.AddField(
+            model_name="clientinterestsubmission",
+            name="last_name_sort",
+            field=nhhc.utils.fields.SortKeyField(blank=True, editable=False, null=True, source="last_name"),
+        ),
+        migrations.AddIndex(
+            model_name="clientinterestsubmission",
+            index=models.Index(fields=["last_name_sort", "first_name_sort"], name="interest_clients_sort_idx"),
+        ),
+        migrations.AlterModelOptions(
+            name="clientinterestsubmission",
+            options={"ordering": ["last_name_sort", "first_name_sort", "date_submitted"], "verbose_name": "Interested Client", "verbose_name_plural": "Interested Clients"},
+        ),
+        migrations.AddField(
+            model_name="employmentapplicationmodel",
+            name="first_name_sort",
+            field=nhhc.utils.fields.SortKeyField(blank=True, editable=False, null=True, source="first_name"),
+        ),
+        migrations.AddField(
+            model_name="employmentapplicationmodel",
+            name="last_name_sort",
+            field=nhhc.utils.fields.SortKeyField(blank=True, editable=False, null=True, source="last_name"),
+        ),
+        migrations.AddIndex(
+            model_name="employmentapplicationmodel",
+            index=models.Index(fields=["last_name_sort", "first_name_sort"], name="employment_interests_sort_idx"),
+        ),
+        migrations.AlterModelOptions(
+            name="employmentapplicationmodel",
+            options={"ordering": ["last_name_sort", "first_name_sort", "date_submitted"], "verbose_name": "Prospective Employee", "verbose_name_plural": "Prospective Employees"},
+        ),
+        migrations.RunPython(populate_application_sort_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.6 on 2026-10-17 21:10
+
+import nhhc.utils.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("web", "0005_name_sort_keys"),
+    ]
+
+    # Rows whose names have no letters held NULL sort keys; AlterField fills them with the default before adding NOT NULL.
+    operations = [
+        migrations.AlterField(
+            model_name="clientinterestsubmission",
+            name="first_name_sort",
+            field=nhhc.utils.fields.SortKeyField(blank=True, default=9223372036854775807, editable=False, source="first_name"),
+        ),
+        migrations.AlterField(
+            model_name="clientinterestsubmission",
+            name="last_name_sort",
+            field=nhhc.utils.fields.SortKeyField(blank=True, default=9223372036854775807, editable=False, source="last_name"),
+        ),
+        migrations.AlterField(
+            model_name="employmentapplicationmodel",
+            name="first_name_sort",
+            field=nhhc.utils.fields.SortKeyField(blank=True, default=9223372036854775807, editable=False, source="first_name"),
+        ),
+        migrations.AlterField(
+            model_name="employmentapplicationmodel",
+            name="last_name_sort",
+            field=nhhc.utils.fields.SortKeyField(blank=True, default=9223372036854775807, editable=False, source="last_name"),
+        ),
+    ]
@@ -32,8 +32,14 @@ from employee.models import Employee
 from localflavor.us.models import USStateField, USZipCodeField
 from loguru import logger
 from phonenumber_field.modelfields import PhoneNumberField
-from sage_encrypt.fields.asymmetric import EncryptedCharField, EncryptedEmailField
 
+from nhhc.utils.fields import (
+    BlindIndexField,
+    SortKeyField,
+    EnvelopeEncryptedCharField,
+    EnvelopeEncryptedEmailField,
+    EnvelopeKeyField,
+)
 from nhhc.utils.managers import CachedQuerySet
 from nhhc.utils.password_generator import RandomPasswordGenerator
 from nhhc.utils.upload import UploadHandler
@@ -46,7 +52,9 @@ class ClientInterestSubmission(models.Model, ExportModelOperationsMixin("client_
     Model representing client interest submissions.
 
     Attributes:
+        data_key (EnvelopeKeyField): The submission's wrapped data key. The personal fields are sealed under it.
         first_name (str): The first name of the client.
+        first_name_sort, last_name_sort (int): Keyed name buckets the default ordering is indexed on.
         last_name (str): The last name of the client.
         email (str): The email address of the client.
         contact_number (PhoneNumberField): The contact number of the client.
@@ -67,7 +75,7 @@ class ClientInterestSubmission(models.Model, ExportModelOperationsMixin("client_
 
     Meta:
         db_table (str): The database table name for the model.
-        ordering (list): The default ordering of records.
+        ordering (list): The default ordering of records, by name sort key. Finish with `sort_within_buckets`.
         verbose_name (str): The singular name for the model.
         verbose_name_plural (str): The plural name for the model.
     """
@@ -97,17 +105,20 @@ class ClientInterestSubmission(models.Model, ExportModelOperationsMixin("client_
 
     objects = CachedQuerySet.as_manager()
 
-    first_name = EncryptedCharField(max_length=10485760)
-    last_name = EncryptedCharField(max_length=10485760)
-    email = EncryptedEmailField(null=True)
+    data_key = EnvelopeKeyField()
+    first_name = EnvelopeEncryptedCharField(max_length=10485760)
+    first_name_sort = SortKeyField(source="first_name")
+    last_name = EnvelopeEncryptedCharField(max_length=10485760)
+    last_name_sort = SortKeyField(source="last_name")
+    email = EnvelopeEncryptedEmailField(null=True)
     contact_number = PhoneNumberField(region="US")
-    home_address1 = EncryptedCharField(max_length=800, null=True)
-    home_address2 = EncryptedCharField(max_length=50, null=True, blank=True)
-    city = EncryptedCharField(max_length=10485760, null=True, blank=True)
+    home_address1 = EnvelopeEncryptedCharField(max_length=800, null=True)
+    home_address2 = EnvelopeEncryptedCharField(max_length=50, null=True, blank=True)
+    city = EnvelopeEncryptedCharField(max_length=10485760, null=True, blank=True)
     zipcode = USZipCodeField(null=True, blank=True)
     state = USStateField(max_length=2, null=True, blank=True)
-    insurance_carrier = EncryptedCharField(max_length=10485760)
-    desired_service = EncryptedCharField(max_length=10485760, choices=SERVICES.choices)
+    insurance_carrier = EnvelopeEncryptedCharField(max_length=10485760)
+    desired_service = EnvelopeEncryptedCharField(max_length=10485760, choices=SERVICES.choices)
     date_submitted = CreationDateTimeField(auto_now_add=True)
     reviewed = models.BooleanField(null=True, blank=True, default=False, db_index=True)
     last_modified = ModificationDateTimeField()
@@ -136,7 +147,8 @@ class ClientInterestSubmission(models.Model, ExportModelOperationsMixin("client_
         """
 
         db_table = "interest_clients"
-        ordering = ["last_name", "first_name", "date_submitted"]
+        ordering = ["last_name_sort", "first_name_sort", "date_submitted"]
+        indexes = [models.Index(fields=["last_name_sort", "first_name_sort"], name="interest_clients_sort_idx")]
         verbose_name = "Interested Client"
         verbose_name_plural = "Interested Clients"
 
@@ -150,10 +162,13 @@ class EmploymentApplicationModel(models.Model, ExportModelOperationsMixin("appli
     Model representing an employment application.
 
     Attributes:
+        data_key (EnvelopeKeyField): The application's wrapped data key. The personal fields are sealed under it.
         first_name (str): The first name of the applicant.
+        first_name_sort, last_name_sort (int): Keyed name buckets the default ordering is indexed on.
         last_name (str): The last name of the applicant.
         contact_number (PhoneNumberField): The contact number of the applicant.
         email (EmailField): The email address of the applicant.
+        email_bidx (BlindIndexField): Keyed HMAC of the email address, for duplicate-applicant lookups.
         home_address1 (str): The first line of the applicant's home address.
         home_address2 (str, optional): The second line of the applicant's home address.
         city (str): The city of the applicant's address.
@@ -177,11 +192,12 @@ class EmploymentApplicationModel(models.Model, ExportModelOperationsMixin("appli
 
     Methods:
         hire_applicant(hired_by: Employee) -> Dict[str, str]: Hire a new employee.
+        duplicate_submissions() -> QuerySet: Other applications submitted with the same email.
         reject_applicant(rejected_by: Employee) -> None: Reject an applicant.
 
     Meta:
         db_table (str): The name of the database table.
-        ordering (list): The default ordering of records.
+        ordering (list): The default ordering of records, by name sort key. Finish with `sort_within_buckets`.
         verbose_name (str): The singular name for the model.
         verbose_name_plural (str): The plural name for the model.
     """
@@ -222,13 +238,17 @@ class EmploymentApplicationModel(models.Model, ExportModelOperationsMixin("appli
         NEW = "N", _("No Prior Experience")
 
     objects = CachedQuerySet.as_manager()
-    first_name = EncryptedCharField(max_length=10485760)
-    last_name = EncryptedCharField(max_length=10485760)
+    data_key = EnvelopeKeyField()
+    first_name = EnvelopeEncryptedCharField(max_length=10485760)
+    first_name_sort = SortKeyField(source="first_name")
+    last_name = EnvelopeEncryptedCharField(max_length=10485760)
+    last_name_sort = SortKeyField(source="last_name")
     contact_number = PhoneNumberField(region="US")
-    email = EncryptedEmailField(max_length=10485760)
-    home_address1 = EncryptedCharField(max_length=10485760)
-    home_address2 = EncryptedCharField(max_length=10485760, null=True, blank=True)
-    city = EncryptedCharField(
+    email = EnvelopeEncryptedEmailField(max_length=10485760)
+    email_bidx = BlindIndexField(source="email", normalizer="email")
+    home_address1 = EnvelopeEncryptedCharField(max_length=10485760)
+    home_address2 = EnvelopeEncryptedCharField(max_length=10485760, null=True, blank=True)
+    city = EnvelopeEncryptedCharField(
         max_length=10485760,
     )
     state = USStateField(max_length=10485760)
@@ -317,6 +337,15 @@ class EmploymentApplicationModel(models.Model, ExportModelOperationsMixin("appli
             "last_name": new_employee.last_name,
         }
 
+    def duplicate_submissions(self) -> models.QuerySet:
+        """
+        Returns the other applications submitted with the same email address, via the email blind index.
+
+        Returns:
+            QuerySet: The other EmploymentApplicationModel instances sharing this applicant's email.
+        """
+        return EmploymentApplicationModel.objects.filter(email_bidx__matches=self.email).exclude(pk=self.pk)
+
     def reject_applicant(self, rejected_by: Employee) -> None:
         """Rejects an applicant.
 
@@ -337,6 +366,7 @@ class EmploymentApplicationModel(models.Model, ExportModelOperationsMixin("appli
         """
 
         db_table = "employment_interests"
-        ordering = ["last_name", "first_name", "date_submitted"]
+        ordering = ["last_name_sort", "first_name_sort", "date_submitted"]
+        indexes = [models.Index(fields=["last_name_sort", "first_name_sort"], name="employment_interests_sort_idx")]
         verbose_name = "Prospective Employee"
         verbose_name_plural = "Prospective Employees"
@@ -0,0 +1,43 @@
+from django.test import SimpleTestCase, override_settings
+from prometheus_client import REGISTRY
+
+from nhhc.utils.cache_metrics import InstrumentedCache, key_family
+
+LOCMEM = "django.core.cache.backends.locmem.LocMemCache"
+
+
+@override_settings(CACHE_METRICS_PAYLOAD_SAMPLE_RATE=1.0)
+class TestInstrumentedCache(SimpleTestCase):
+    def setUp(self):
+        self.cache = InstrumentedCache("metrics-test", {"WRAPPED_BACKEND": LOCMEM, "ALIAS": "metrics-test"})
+        self.cache.clear()
+
+    def sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, {"cache": "metrics-test", **labels}) or 0
+
+    def test_key_families(self):
+        self.assertEqual(key_family("qs:web.clientinterestsubmission:3:ab12"), "queryset")
+        self.assertEqual(key_family("stats:web.employmentapplicationmodel:review:3"), "stats")
+        self.assertEqual(key_family("stampede.cache_page.GET.abc.def.en-us.UTC"), "page")
+        self.assertEqual(key_family("fragment:sidenav:admin:1.1:abc:lock"), "lock")
+        self.assertEqual(key_family("unclassified"), "other")
+
+    def test_hits_and_misses_are_counted_per_family(self):
+        hits, misses = self.sample("cache_lookups_total", family="stats", result="hit"), self.sample("cache_lookups_total", family="stats", result="miss")
+        self.assertIsNone(self.cache.get("stats:a:total"))
+        self.cache.set("stats:a:total", 3)
+        self.assertEqual(self.cache.get("stats:a:total"), 3)
+        self.assertEqual(self.cache.get_many(["stats:a:total", "stats:a:reviewed"]), {"stats:a:total": 3})
+        self.assertEqual(self.sample("cache_lookups_total", family="stats", result="hit") - hits, 2)
+        self.assertEqual(self.sample("cache_lookups_total", family="stats", result="miss") - misses, 2)
+
+    def test_latency_and_payload_are_recorded(self):
+        writes = self.sample("cache_payload_bytes_count", family="queryset")
+        self.cache.set("qs:model:1:digest", [1, 2, 3])
+        self.assertEqual(self.sample("cache_payload_bytes_count", family="queryset") - writes, 1)
+        self.assertGreater(self.sample("cache_operation_seconds_count", family="queryset", operation="set"), 0)
+
+    def test_other_attributes_are_delegated(self):
+        self.assertEqual(self.cache.make_key("key"), self.cache._cache.make_key("key"))
+        self.assertEqual(self.cache.get_or_set("object:a", 5), 5)
+        self.assertEqual(self.cache.incr("object:a"), 6)
@@ -0,0 +1,28 @@
+from django.test import SimpleTestCase, override_settings
+
+from nhhc.utils.cache_versions import _is_current, make_key
+
+SCHEMAS = {"page": 1, "queryset": 1, "stats": 1}
+
+
+@override_settings(CACHE_BUILD_ID="build-a", CACHE_BUILD_FAMILIES=("page",), CACHE_SCHEMA_VERSIONS=SCHEMAS)
+class TestCacheVersions(SimpleTestCase):
+    def test_keys_carry_their_family_schema(self):
+        self.assertEqual(make_key("stats:web.clientinterestsubmission:review:3", "NHHC-NATIVE", 1), "NHHC-NATIVE:stats.1:1:stats:web.clientinterestsubmission:review:3")
+        self.assertEqual(make_key("stampede.cache_page.GET.abc", "NHHC-NATIVE", 1), "NHHC-NATIVE:page.1-build-a:1:stampede.cache_page.GET.abc")
+
+    def test_a_new_build_only_retires_build_families(self):
+        page, stats = make_key("stampede.cache_page.GET.abc", "NHHC-NATIVE", 1), make_key("stats:a:review:1", "NHHC-NATIVE", 1)
+        with self.settings(CACHE_BUILD_ID="build-b"):
+            self.assertFalse(_is_current(page, "NHHC-NATIVE"))
+            self.assertTrue(_is_current(stats, "NHHC-NATIVE"))
+            self.assertEqual(make_key("stats:a:review:1", "NHHC-NATIVE", 1), stats)
+
+    def test_bumping_a_schema_retires_its_family(self):
+        queryset = make_key("qs:web.clientinterestsubmission:1:abc", "NHHC-NATIVE", 1)
+        with self.settings(CACHE_SCHEMA_VERSIONS={**SCHEMAS, "queryset": 2}):
+            self.assertFalse(_is_current(queryset, "NHHC-NATIVE"))
+        self.assertFalse(_is_current(":1:qs:web.clientinterestsubmission:1:abc", "NHHC-NATIVE"))
+
+    def test_keys_of_a_removed_family_are_retired(self):
+        self.assertFalse(_is_current("NHHC-NATIVE:counter.1:1:counter:web.clientinterestsubmission:total", "NHHC-NATIVE"))
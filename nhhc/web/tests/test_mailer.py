@@ -1,16 +1,11 @@
 from django.core import mail
 from django.test import TestCase
-from model_bakery import baker
 from web.forms import EmploymentApplicationForm
 
 from nhhc.utils.mailer import PostOffice
-from nhhc.utils.testing import (
-    generate_random_encrypted_char,
-    generate_random_encrypted_email,
-)
+from nhhc.utils.testing import register_encrypted_field_generators
 
-baker.generators.add("sage_encrypt.fields.asymmetric.EncryptedCharField", generate_random_encrypted_char)
-baker.generators.add("sage_encrypt.fields.asymmetric.EncryptedEmailField", generate_random_encrypted_email)
+register_encrypted_field_generators()
 
 
 class TestPostOffice(TestCase):
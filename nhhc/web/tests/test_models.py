@@ -20,8 +20,8 @@ dummy = Faker()
 baker.generators.add("phonenumber_field.modelfields.PhoneNumberField", generate_mock_PhoneNumberField)
 baker.generators.add("localflavor.us.models.USZipCodeField", generate_mock_ZipCodeField)
 
-baker.generators.add("sage_encrypt.fields.asymmetric.EncryptedCharField", generate_random_encrypted_char)
-baker.generators.add("sage_encrypt.fields.asymmetric.EncryptedEmailField", generate_random_encrypted_email)
+baker.generators.add("nhhc.utils.fields.EnvelopeEncryptedCharField", generate_random_encrypted_char)
+baker.generators.add("nhhc.utils.fields.EnvelopeEncryptedEmailField", generate_random_encrypted_email)
 
 
 class TestClientInterestSubmissions(TestCase):
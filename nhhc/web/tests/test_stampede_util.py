@@ -0,0 +1,60 @@
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.utils.cache import get_cache_key
+
+from nhhc.utils.stampede import LOCK_SUFFIX, cached_compute, stampede_cache_page
+from nhhc.utils.testing import LOCMEM_CACHES
+
+
+@override_settings(CACHES=LOCMEM_CACHES, STAMPEDE_BETA=0.0, STAMPEDE_STALE_TTL=60, STAMPEDE_LOCK_TIMEOUT=1)
+class TestStampedeProtection(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return self.calls
+
+    def test_value_is_computed_once_while_fresh(self):
+        self.assertEqual(cached_compute("key", self.compute, timeout=60), 1)
+        self.assertEqual(cached_compute("key", self.compute, timeout=60), 1)
+        self.assertEqual(self.calls, 1)
+
+    def test_stale_value_is_served_while_another_worker_recomputes(self):
+        cached_compute("key", self.compute, timeout=0)
+        cache.add(f"key{LOCK_SUFFIX}", 1, 10)
+        self.assertEqual(cached_compute("key", self.compute, timeout=60), 1)
+        self.assertEqual(self.calls, 1)
+
+    def test_expired_value_is_recomputed_by_the_lock_holder(self):
+        cached_compute("key", self.compute, timeout=0)
+        self.assertEqual(cached_compute("key", self.compute, timeout=60), 2)
+        self.assertIsNone(cache.get(f"key{LOCK_SUFFIX}"))
+
+    def test_pages_are_cached_but_not_uncacheable_responses(self):
+        view = stampede_cache_page(60)(lambda request: HttpResponse(str(self.compute())))
+        factory = RequestFactory()
+        self.assertEqual(view(factory.get("/about/")).content, b"1")
+        self.assertEqual(view(factory.get("/about/")).content, b"1")
+        failing = stampede_cache_page(60)(lambda request: HttpResponse(str(self.compute()), status=500))
+        failing(factory.get("/broken/"))
+        self.assertEqual(failing(factory.get("/broken/")).content, b"3")
+
+    def test_a_lock_taken_over_by_another_worker_is_not_released(self):
+        def compute():
+            # Our lock expired mid-computation and another worker took it.
+            cache.set(f"key{LOCK_SUFFIX}", "other-worker", 10)
+            return self.compute()
+
+        cached_compute("key", compute, timeout=60)
+        self.assertEqual(cache.get(f"key{LOCK_SUFFIX}"), "other-worker")
+
+    def test_page_key_outlives_the_page_timeout(self):
+        view = stampede_cache_page(0)(lambda request: HttpResponse(str(self.compute())))
+        request = RequestFactory().get("/about/")
+        view(request)
+        self.assertIsNotNone(get_cache_key(request, "stampede", "GET", cache=cache))
+        cache.add(f"{get_cache_key(request, 'stampede', 'GET', cache=cache)}{LOCK_SUFFIX}", "other-worker", 10)
+        self.assertEqual(view(RequestFactory().get("/about/")).content, b"1")
@@ -0,0 +1,58 @@
+import json
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from nhhc import status
+from nhhc.utils.testing import LOCMEM_CACHES
+
+
+def snapshot(healthy=True, age=0):
+    return {
+        "healthy": healthy,
+        "checked_at": time.time() - age,
+        "duration": 0.01,
+        "plugins": [{"identifier": "DatabaseBackend", "status": int(healthy), "pretty_status": "working" if healthy else "unavailable", "time_taken": 0.01, "critical": True}],
+    }
+
+
+@override_settings(CACHES=LOCMEM_CACHES, HEALTH_CHECK_MAX_AGE=60, HEALTH_CHECK_DEEP_TOKEN="probe-token")
+class TestCachedHealthCheck(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.view = status.CachedHealthCheckView.as_view()
+        self.factory = RequestFactory()
+
+    def test_fresh_snapshot_is_served_without_probing(self):
+        cache.set(status.HEALTH_SNAPSHOT_KEY, snapshot(age=5))
+        with mock.patch.object(status, "run_probes") as run_probes:
+            response = self.view(self.factory.get("/status/", HTTP_ACCEPT="application/json"))
+        run_probes.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Health-Source"], "cache")
+        self.assertEqual(json.loads(response.content)["DatabaseBackend"], "working")
+        self.assertGreaterEqual(json.loads(response.content)["freshness"]["age"], 5)
+
+    def test_expired_snapshot_is_refreshed(self):
+        cache.set(status.HEALTH_SNAPSHOT_KEY, snapshot(age=120))
+        with mock.patch.object(status, "run_probes", return_value=snapshot(healthy=False)) as run_probes:
+            response = self.view(self.factory.get("/status/", {"format": "json"}))
+        run_probes.assert_called_once()
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response["X-Health-Source"], "live")
+        self.assertFalse(cache.get(status.HEALTH_SNAPSHOT_KEY)["healthy"])
+
+    def test_bypass_parameter_runs_a_deep_check(self):
+        cache.set(status.HEALTH_SNAPSHOT_KEY, snapshot(age=5))
+        with mock.patch.object(status, "run_probes", return_value=snapshot()) as run_probes:
+            response = self.view(self.factory.get("/status/", {"format": "json", "deep": "1"}, HTTP_X_HEALTH_CHECK_TOKEN="probe-token"))
+        run_probes.assert_called_once()
+        self.assertEqual(response["X-Health-Source"], "live")
+
+    def test_deep_check_requires_the_token(self):
+        with mock.patch.object(status, "run_probes") as run_probes:
+            for headers in ({}, {"HTTP_X_HEALTH_CHECK_TOKEN": "guess"}):
+                self.assertEqual(self.view(self.factory.get("/status/", {"deep": "1"}, **headers)).status_code, 403)
+        run_probes.assert_not_called()
@@ -0,0 +1,50 @@
+from unittest import mock
+
+from compliance.models import Contract
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from model_bakery import baker
+from web.models import ClientInterestSubmission
+
+from nhhc.utils import warmup
+from nhhc.utils.testing import LOCMEM_CACHES, register_encrypted_field_generators
+
+register_encrypted_field_generators()
+
+
+class TestCacheWarmup(SimpleTestCase):
+    def test_cached_pages_and_sitemap_are_listed(self):
+        paths = warmup.cached_page_paths()
+        self.assertIn(reverse("homepage"), paths)
+        self.assertIn(reverse("about"), paths)
+        self.assertEqual(paths[-1], warmup.SITEMAP_PATH)
+        self.assertEqual(len(paths), len(set(paths)))
+
+    def test_every_warmer_is_timed_and_failures_are_reported(self):
+        def broken():
+            raise RuntimeError("redis unavailable")
+
+        with mock.patch.dict(warmup.WARMERS, {"stats": lambda: {"applications": {}}, "announcements": broken}, clear=True):
+            report = warmup.warm_caches(workers=2, only=["stats", "announcements"])
+        self.assertEqual(set(report), {"stats", "announcements"})
+        self.assertTrue(report["stats"]["ok"])
+        self.assertFalse(report["announcements"]["ok"])
+        self.assertEqual(report["announcements"]["error"], "redis unavailable")
+        self.assertIn("seconds", report["stats"])
+
+
+@override_settings(CACHES=LOCMEM_CACHES, QUERYSET_TTL=60)
+class TestQuerysetWarmer(TestCase):
+    def setUp(self):
+        cache.clear()
+        baker.make(ClientInterestSubmission, first_name="Jane", last_name="Doe", _quantity=2)
+        Contract.objects.create(code="A1", name="Alpha")
+
+    def test_warmed_querysets_are_read_without_a_query(self):
+        # Called in this thread, since the pool threads of warm_caches do not see the test's transaction.
+        report = warmup.WARMERS["querysets"]()
+        self.assertEqual(report["ClientInquiriesListView"], 2)
+        self.assertEqual(report["contracts"], 1)
+        with self.assertNumQueries(0):
+            Contract.objects.from_cache()